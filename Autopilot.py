@@ -0,0 +1,222 @@
+"""
+Автопилот вёсельных лодок: следование по ломаной из путевых точек методом pure pursuit.
+
+Лодка держит курс на точку маршрута, отстоящую на lookahead метров дальше проекции лодки на маршрут.
+Геометрия отрезков маршрута считается один раз при создании Route. Каждая лодка помнит свой текущий отрезок
+и на каждом шаге ищет проекцию среди нескольких следующих; если ближайшим оказался последний из них,
+поиск идёт дальше по отрезкам, пока проекция приближается. Так стоимость шага зависит от пройденного
+за шаг пути, а не от длины маршрута, и быстрая лодка на частых отрезках не отстаёт от своей проекции.
+Расчёт ведётся сразу для всех лодок автопилота массивами NumPy.
+"""
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+
+
+class Route:
+    """Маршрут - ломаная из не менее чем двух путевых точек (x, y) с заранее посчитанной геометрией отрезков"""
+
+    def __init__(self, waypoints: Sequence[Tuple[float, float]]):
+        points = np.asarray(waypoints, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2 or len(points) < 2:
+            raise ValueError("Маршрут задаётся списком не менее чем из двух точек (x, y)")
+        vectors = np.diff(points, axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        if np.any(lengths == 0):
+            raise ValueError("Соседние точки маршрута совпадают")
+        self.waypoints = points
+        self.starts = points[:-1]
+        self.units = vectors / lengths[:, None]
+        self.lengths = lengths
+        self.offsets = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])  # Расстояние по маршруту до начала отрезка
+        self.headings = np.degrees(np.arctan2(vectors[:, 0], vectors[:, 1])) % 360.0  # 0 - север
+        self.length = float(self.offsets[-1] + lengths[-1])
+
+    def __len__(self) -> int:
+        """Число отрезков"""
+        return len(self.lengths)
+
+    def nearest_segments(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Ближайший отрезок для каждой точки - полный перебор, нужен только при назначении маршрута"""
+        dx = x[:, None] - self.starts[:, 0]
+        dy = y[:, None] - self.starts[:, 1]
+        along = np.clip(dx * self.units[:, 0] + dy * self.units[:, 1], 0.0, self.lengths)
+        distance = (dx - along * self.units[:, 0]) ** 2 + (dy - along * self.units[:, 1]) ** 2
+        return np.argmin(distance, axis=1)
+
+
+class Autopilot:
+    """
+    Ведёт лодки флота (или список лодок - номер лодки равен индексу в списке) по назначенным маршрутам.
+    update вычисляет acceleration и rotation для всех ведомых лодок и применяет их одним вызовом.
+    cruise - ускорение на маршруте; у конца маршрута оно плавно снижается, а когда до конца по маршруту
+    остаётся не больше arrival_radius, лодка перестаёт грести и отпускается.
+    """
+
+    def __init__(self,
+                 boats: Union[BoatFleet, Sequence[RowingBoat]],
+                 lookahead: float = 20.0,
+                 cruise: float = 1.0,
+                 arrival_radius: float = 5.0,
+                 window: int = 4):
+        if lookahead <= 0 or arrival_radius < 0 or window < 1:
+            raise ValueError("Недопустимые параметры автопилота")
+        self._boats = boats
+        self._lookahead = lookahead
+        self._cruise = cruise
+        self._arrival_radius = arrival_radius
+        self._window = np.arange(window)
+        # Отрезки всех назначенных маршрутов, сложенные в общие таблицы
+        self._routes: Dict[int, Tuple[Route, int]] = {}  # id маршрута -> (маршрут, номер первого отрезка)
+        self._starts = np.empty((0, 2))
+        self._units = np.empty((0, 2))
+        self._lengths = np.empty(0)
+        self._offsets = np.empty(0)
+        # Ведомые лодки: номер, текущий отрезок, последний отрезок маршрута, длина маршрута
+        self._ids = np.empty(0, dtype=np.intp)
+        self._segments = np.empty(0, dtype=np.intp)
+        self._last_segments = np.empty(0, dtype=np.intp)
+        self._route_lengths = np.empty(0)
+
+    def __len__(self) -> int:
+        """Число ведомых лодок"""
+        return len(self._ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Номера ведомых лодок"""
+        return self._ids.copy()
+
+    def _register(self, route: Route) -> int:
+        """Добавляет отрезки маршрута в общие таблицы (один раз на маршрут) и возвращает номер первого"""
+        if id(route) not in self._routes:
+            first = len(self._lengths)
+            self._starts = np.concatenate([self._starts, route.starts])
+            self._units = np.concatenate([self._units, route.units])
+            self._lengths = np.concatenate([self._lengths, route.lengths])
+            self._offsets = np.concatenate([self._offsets, route.offsets])
+            self._routes[id(route)] = (route, first)
+        return self._routes[id(route)][1]
+
+    def assign(self, ids, route: Route) -> None:
+        """Назначает маршрут лодкам ids; лодки начинают с ближайшего к ним отрезка"""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.intp))
+        self.release(ids)
+        first = self._register(route)
+        x, y, _, _, _ = self._state(ids)
+        self._ids = np.concatenate([self._ids, ids])
+        self._segments = np.concatenate([self._segments, first + route.nearest_segments(x, y)])
+        self._last_segments = np.concatenate([self._last_segments, np.full(len(ids), first + len(route) - 1)])
+        self._route_lengths = np.concatenate([self._route_lengths, np.full(len(ids), route.length)])
+
+    def release(self, ids) -> None:
+        """Снимает лодки ids с автопилота, не меняя их управление"""
+        self._keep(~np.isin(self._ids, ids))
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self._ids = self._ids[mask]
+        self._segments = self._segments[mask]
+        self._last_segments = self._last_segments[mask]
+        self._route_lengths = self._route_lengths[mask]
+
+    def _state(self, ids: np.ndarray):
+        """x, y, скорость, направление и предельная скорость поворота лодок ids"""
+        boats = self._boats
+        if isinstance(boats, BoatFleet):
+            columns = boats._columns
+            return (boats.x[ids], boats.y[ids], boats.speed[ids], boats.direction[ids],
+                    columns["max_rotation"][:len(boats)][ids])
+        selected = [boats[index] for index in ids.tolist()]
+        positions = np.array([boat.position for boat in selected], dtype=np.float64).reshape(-1, 2)
+        return (positions[:, 0], positions[:, 1], np.array([boat.speed for boat in selected], dtype=np.float64),
+                np.array([boat.direction for boat in selected], dtype=np.float64),
+                np.array([boat._max_rotation for boat in selected], dtype=np.float64))
+
+    def _apply(self, ids: np.ndarray, acceleration: np.ndarray, rotation: np.ndarray) -> None:
+        if isinstance(self._boats, BoatFleet):
+            self._boats.set_controls(ids, acceleration, rotation)
+            return
+        for index, boat_acceleration, boat_rotation in zip(ids.tolist(), acceleration.tolist(), rotation.tolist()):
+            boat = self._boats[index]
+            boat.acceleration = boat_acceleration
+            boat.rotation = boat_rotation
+
+    def _project(self, segments: np.ndarray, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Проекции точек на отрезки segments: расстояние вдоль отрезка и квадрат расстояния до отрезка"""
+        starts = self._starts[segments]
+        units = self._units[segments]
+        dx = x - starts[..., 0]
+        dy = y - starts[..., 1]
+        along = np.clip(dx * units[..., 0] + dy * units[..., 1], 0.0, self._lengths[segments])
+        return along, (dx - along * units[..., 0]) ** 2 + (dy - along * units[..., 1]) ** 2
+
+    def update(self) -> np.ndarray:
+        """Вычисляет и применяет управление ведомых лодок. Возвращает номера лодок, прибывших на этом шаге"""
+        if not len(self._ids):
+            return self._ids.copy()
+        ids = self._ids
+        x, y, speed, direction, max_rotation = self._state(ids)
+
+        # Проекция на маршрут среди window отрезков, начиная с текущего
+        candidates = np.minimum(self._segments[:, None] + self._window, self._last_segments[:, None])
+        along, distance = self._project(candidates, x[:, None], y[:, None])
+        best = np.argmin(distance, axis=1)
+        rows = np.arange(len(ids))
+        segments = candidates[rows, best]
+        along = along[rows, best]
+        # Лодка ушла за окно: идём дальше по отрезкам, пока проекция на следующий ближе
+        ahead = np.flatnonzero((best == len(self._window) - 1) & (segments < self._last_segments))
+        if len(ahead):
+            distance = distance[ahead, best[ahead]]
+            while len(ahead):
+                following = segments[ahead] + 1
+                following_along, following_distance = self._project(following, x[ahead], y[ahead])
+                closer = following_distance < distance
+                ahead, following, distance = ahead[closer], following[closer], following_distance[closer]
+                segments[ahead] = following
+                along[ahead] = following_along[closer]
+                still = following < self._last_segments[ahead]
+                ahead, distance = ahead[still], distance[still]
+        self._segments = segments
+        progress = self._offsets[segments] + along
+        remaining = self._route_lengths - progress
+
+        # Точка преследования: на lookahead дальше по маршруту, но не дальше его конца
+        target = np.minimum(progress + self._lookahead, self._route_lengths)
+        # Отрезки маршрута идут в таблицах подряд: ищем отрезок точки, двигаясь вперёд от текущего
+        target_segments = self._segments.copy()
+        while True:
+            advance = (target_segments < self._last_segments) & \
+                      (target > self._offsets[target_segments] + self._lengths[target_segments])
+            if not advance.any():
+                break
+            target_segments += advance
+        along_target = np.minimum(target - self._offsets[target_segments], self._lengths[target_segments])
+        target_x = self._starts[target_segments, 0] + along_target * self._units[target_segments, 0]
+        target_y = self._starts[target_segments, 1] + along_target * self._units[target_segments, 1]
+
+        # Pure pursuit: кривизна 2*sin(alpha)/L, угловая скорость = скорость * кривизна
+        to_target_x = target_x - x
+        to_target_y = target_y - y
+        distance_to_target = np.maximum(np.hypot(to_target_x, to_target_y), 1e-9)
+        alpha = (np.degrees(np.arctan2(to_target_x, to_target_y)) - direction + 180.0) % 360.0 - 180.0
+        pace = np.maximum(np.abs(speed), 1.0)  # С места лодка тоже должна начать поворачивать
+        turn_rate = np.degrees(2.0 * pace * np.sin(np.radians(alpha)) / distance_to_target)
+
+        acceleration = self._cruise * np.clip(remaining / self._lookahead, 0.25, 1.0)
+        # При ускорении a и повороте r > 0 лодка поворачивает со скоростью max_rotation * a * r, см. RowingBoat
+        limit = max_rotation * np.abs(acceleration)
+        rotation = np.divide(turn_rate, limit, out=np.zeros(len(ids)), where=limit > 0)
+        rotation = np.where(np.abs(alpha) > 90.0, np.sign(alpha), np.clip(rotation, -1.0, 1.0))
+
+        arrived = remaining <= self._arrival_radius
+        acceleration[arrived] = 0.0
+        rotation[arrived] = 0.0
+        self._apply(ids, acceleration, rotation)
+        finished = ids[arrived]
+        if arrived.any():
+            self._keep(~arrived)
+        return finished
@@ -1,17 +1,158 @@
-from typing import Tuple
+from __future__ import annotations
+
+import math
+from collections import namedtuple
+from functools import lru_cache
 
 from Vehicle import Vehicle
 
+# typing нужен только для проверки типов: при выполнении аннотации не вычисляются, а импорт typing
+# занимал больше половины времени импорта RowingBoat (см. Test_ImportTime)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Optional, Sequence, Tuple
+
+
+def _check_number(name: str, value, allow_zero: bool = True) -> None:
+    """Проверяет, что параметр - неотрицательное число (или положительное, если allow_zero=False)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Параметр {name} должен быть числом, получено: {value!r}")
+    if value < 0 or (not allow_zero and value == 0):
+        raise ValueError(f"Недопустимое значение параметра {name}: {value!r}")
+
+
+# Сколько разных конфигураций лодок хранится в кэше коэффициентов
+COEFFICIENT_CACHE_SIZE = 1024
+
+
+class MotionCoefficients(namedtuple("MotionCoefficients", ("thrust", "drag", "turn"))):
+    """
+    Коэффициенты уравнения движения, общие для всех лодок с одинаковыми параметрами:
+    thrust - ускорение при полной тяге, м/с^2;
+    drag - сопротивление, делённое на массу: замедление равно drag * v * |v|, 1/м;
+    turn - угловая скорость на единицу команды поворота, град/с.
+    """
+
+    __slots__ = ()
+
+
+@lru_cache(maxsize=COEFFICIENT_CACHE_SIZE)
+def motion_coefficients(weight: float,
+                        max_speed: float,
+                        max_force: float,
+                        turn_factor: float,
+                        powered: bool) -> MotionCoefficients:
+    """
+    Возвращает коэффициенты для конфигурации лодки. Одинаковые конфигурации получают один и тот же объект.
+    powered=False означает, что лодка не может развить тягу и повернуть (например, без гребцов).
+    """
+    force_per_mass = max_force / weight
+    drag = force_per_mass / max_speed ** 2 if max_speed else 0.0
+    if not powered:
+        return MotionCoefficients(0.0, drag, 0.0)
+    return MotionCoefficients(force_per_mass, drag, turn_factor)
+
+
+def coefficient_cache_info():
+    """Статистика кэша коэффициентов: попадания, промахи, размер"""
+    return motion_coefficients.cache_info()
+
+
+def _log_cosh(z: float) -> float:
+    """ln(cosh(z)) без переполнения"""
+    z = abs(z)
+    return z + math.log1p(math.exp(-2.0 * z)) - math.log(2.0)
+
+
+def _log_sinh(z: float) -> float:
+    """ln(sinh(z)) без переполнения, z > 0"""
+    return z + math.log1p(-math.exp(-2.0 * z)) - math.log(2.0)
+
+
+def _solve_speed(speed: float,
+                 thrust: float,
+                 max_force: float,
+                 max_speed: float,
+                 weight: float,
+                 duration: float) -> Tuple[float, float]:
+    """
+    Решает m*dv/dt = thrust - max_force * v*|v| / max_speed^2 при постоянной тяге.
+    Возвращает (скорость через duration секунд, пройденный за это время путь со знаком).
+    """
+    if max_speed == 0:
+        return 0.0, 0.0
+    if max_force == 0:
+        return speed, speed * duration
+
+    # Задний ход сводим к движению вперёд сменой знака
+    sign = -1.0 if thrust < 0 or (thrust == 0 and speed < 0) else 1.0
+    thrust *= sign
+    v = speed * sign
+    drag = max_force / max_speed ** 2 / weight  # Коэффициент сопротивления, делённый на массу
+    distance = 0.0
+
+    if thrust == 0:
+        # Свободное торможение: v(t) = v0 / (1 + k*v0*t)
+        return sign * v / (1.0 + drag * v * duration), sign * math.log1p(drag * v * duration) / drag
+
+    terminal = math.sqrt(thrust / weight / drag)
+    rate = drag * terminal
+    if v < 0:
+        # Тяга против движения: v(t) = u*tan(phi + r*t) до остановки
+        phase = math.atan(v / terminal)
+        stop_time = -phase / rate
+        if duration <= stop_time:
+            end = phase + rate * duration
+            return sign * terminal * math.tan(end), sign * math.log(math.cos(phase) / math.cos(end)) / drag
+        distance = math.log(math.cos(phase)) / drag
+        duration -= stop_time
+        v = 0.0
+
+    if v < terminal:
+        # Разгон: v(t) = u*tanh(phi + r*t)
+        phase = math.atanh(v / terminal)
+        end = phase + rate * duration
+        v = terminal * math.tanh(end)
+        distance += (_log_cosh(end) - _log_cosh(phase)) / drag
+    elif v > terminal:
+        # Торможение до установившейся скорости: v(t) = u*coth(phi + r*t)
+        phase = math.atanh(terminal / v)
+        end = phase + rate * duration
+        v = terminal / math.tanh(end)
+        distance += (_log_sinh(end) - _log_sinh(phase)) / drag
+    else:
+        distance += v * duration
+    return sign * v, sign * distance
+
 
 class Boat(Vehicle):
     """Базовый класс для лодок"""
 
+    __slots__ = ("max_weight", "_weight", "_max_speed", "_max_rotation", "_acceleration", "_max_force",
+                 "_speed", "_rotation", "_direction", "_position", "_is_afloat", "_recorder",
+                 "_spatial_index", "_scheduler", "_coefficients", "_integrator", "_environment",
+                 "_heading_cache", "_velocity_cache", "_distance_cache", "_resistance_cache")
+
     def __init__(self,
                  max_weight: float,
                  weight: float,
                  max_speed: float,
                  max_rotation: float,
                  max_force: float):
+        _check_number("max_weight", max_weight, allow_zero=False)
+        _check_number("weight", weight, allow_zero=False)
+        _check_number("max_speed", max_speed)
+        _check_number("max_rotation", max_rotation)
+        _check_number("max_force", max_force)
+        self._init_unchecked(max_weight, weight, max_speed, max_rotation, max_force)
+
+    def _init_unchecked(self,
+                        max_weight: float,
+                        weight: float,
+                        max_speed: float,
+                        max_rotation: float,
+                        max_force: float) -> None:
+        """Заполняет лодку без проверки параметров: они уже проверены в __init__ или пакетной фабрике"""
         self.max_weight = max_weight # Максимальный вес лодки в кг
         self._weight = weight # Текущий вес лодки
         self._max_speed = max_speed # Максимальная скорость лодки
@@ -23,6 +164,39 @@ class Boat(Vehicle):
         self._direction = 0.0  # градусы (0 - север)
         self._position = (0.0, 0.0)  # x, y координаты
         self._is_afloat = True # На плаву ли лодка
+        self._reset_hooks()
+        self._update_coefficients()
+
+    def _update_coefficients(self) -> None:
+        """Берёт из кэша коэффициенты движения для текущих параметров лодки"""
+        self._coefficients = motion_coefficients(self._weight, self._max_speed, self._max_force, 1.0, True)
+
+    def _reset_hooks(self) -> None:
+        """Отключает все подключённые к лодке наблюдатели и расширения, сбрасывает кэши производных величин"""
+        self._recorder = None # Запись траектории, см. TrajectoryRecorder
+        self._spatial_index = None # Индекс соседей, см. SpatialIndex
+        self._scheduler = None # Планировщик, усыпляющий неподвижные лодки, см. SimulationScheduler
+        self._integrator = None # Интегратор вместо схемы Эйлера, см. Integrators
+        self._environment = None # Течение и ветер, сносящие лодку, см. Environment
+        # Кэши производных величин: (значения, от которых зависит величина, величина)
+        self._heading_cache = None
+        self._velocity_cache = None
+        self._distance_cache = None
+        self._resistance_cache = None
+
+    def _wake(self) -> None:
+        """Сообщает планировщику, что управление лодкой изменилось"""
+        if self._scheduler is not None:
+            self._scheduler.wake(self)
+
+    def is_at_rest(self) -> bool:
+        """Не изменит ли move состояние лодки: затонула или стоит без тяги и поворота"""
+        if not self._is_afloat:
+            return True
+        if self._weight > self.max_weight or self._environment is not None:
+            return False
+        return (self._speed == 0.0 and (self._get_thrust() == 0.0 or self._max_speed == 0)
+                and self._get_turn_rate() == 0.0)
 
     @property
     def position(self) -> Tuple[float, float]:
@@ -30,7 +204,10 @@ class Boat(Vehicle):
 
     @position.setter
     def position(self, position: Tuple[float, float]) -> None:
-        pass
+        x, y = position
+        self._position = (float(x), float(y))
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
 
     @property
     def speed(self) -> float:
@@ -38,7 +215,8 @@ class Boat(Vehicle):
 
     @speed.setter
     def speed(self, speed: float) -> None:
-        pass
+        self._speed = max(-self._max_speed, min(self._max_speed, float(speed)))
+        self._wake()
 
     @property
     def direction(self) -> float:
@@ -46,7 +224,52 @@ class Boat(Vehicle):
 
     @direction.setter
     def direction(self, direction: float) -> None:
-        pass
+        self._direction = float(direction) % 360.0
+
+    # Производные величины вычисляются при первом чтении и запоминаются вместе с состоянием, из которого получены.
+    # Пока move или сеттеры не изменили это состояние, повторное чтение возвращает запомненное значение.
+
+    @property
+    def heading(self) -> Tuple[float, float]:
+        """Единичный вектор курса (x, y); направление 0 - север, по оси y"""
+        direction = self._direction
+        cache = self._heading_cache
+        if cache is None or cache[0] != direction:
+            heading = math.radians(direction)
+            cache = self._heading_cache = (direction, (math.sin(heading), math.cos(heading)))
+        return cache[1]
+
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        """Вектор скорости (vx, vy), м/с"""
+        speed = self._speed
+        direction = self._direction
+        cache = self._velocity_cache
+        if cache is None or cache[0] != speed or cache[1] != direction:
+            x, y = self.heading
+            cache = self._velocity_cache = (speed, direction, (speed * x, speed * y))
+        return cache[2]
+
+    @property
+    def distance_from_origin(self) -> float:
+        """Расстояние по прямой от начала координат, м. Это не пройденный путь: петля возвращает его к нулю"""
+        position = self._position
+        cache = self._distance_cache
+        if cache is None or cache[0] != position:
+            cache = self._distance_cache = (position, math.hypot(*position))
+        return cache[1]
+
+    @property
+    def resistance(self) -> float:
+        """Сила сопротивления воды, Н. Направлена против движения, знак совпадает со знаком скорости"""
+        speed = self._speed
+        coefficients = self._coefficients
+        cache = self._resistance_cache
+        if cache is None or cache[0] != speed or cache[1] is not coefficients:
+            # Коэффициенты общие для одинаковых конфигураций, смена объекта означает смену веса или мощности
+            resistance = self._weight * coefficients.drag * speed * abs(speed)
+            cache = self._resistance_cache = (speed, coefficients, resistance)
+        return cache[2]
 
     @property
     def rotation(self) -> float:
@@ -54,19 +277,217 @@ class Boat(Vehicle):
 
     @rotation.setter
     def rotation(self, rotation: float) -> None:
-        pass
+        self._rotation = max(-self._max_rotation, min(self._max_rotation, float(rotation)))
+        self._wake()
+
+    @property
+    def integrator(self):
+        """Интегратор движения из модуля Integrators. None - явная схема Эйлера"""
+        return self._integrator
+
+    @integrator.setter
+    def integrator(self, integrator) -> None:
+        self._integrator = integrator
+
+    @property
+    def environment(self):
+        """
+        Течение и ветер из модуля Environment, сносящие лодку при движении. None - стоячая вода.
+        move берёт поле в текущий момент environment.time и не продвигает его; simulate - собственный цикл лодки
+        и продвигает время окружения после каждого шага. Лодки с общим окружением двигайте через move,
+        продвигая окружение один раз за шаг всех лодок.
+        """
+        return self._environment
+
+    @environment.setter
+    def environment(self, environment) -> None:
+        self._environment = environment
+        self._wake()
 
     def move(self, time_delta: float) -> None:
         """Базовая реализация движения лодки"""
-        pass
+        if self._is_afloat:
+            if self._weight > self.max_weight:
+                # Перегруженная лодка тонет и больше не двигается
+                self._is_afloat = False
+                self._speed = 0.0
+            elif self._integrator is not None:
+                start = self._position
+                self._integrator.step(self, time_delta)
+                if self._environment is not None:
+                    self._drift(start, time_delta)
+            else:
+                self._update_speed(time_delta)
+                self._update_direction(time_delta)
+                self._update_position(time_delta)
+
+        if self._recorder is not None:
+            self._recorder.record(self, time_delta)
+
+    def simulate(self,
+                 n_steps: int,
+                 time_delta: float,
+                 controls: Optional[Sequence[Tuple[float, float]]] = None,
+                 trajectory: bool = False,
+                 analytic: bool = False):
+        """
+        Выполняет n_steps вызовов move(time_delta) за один вызов.
+        controls - необязательный план управления: по паре (ускорение, поворот) на каждый шаг.
+        Возвращает конечное состояние (x, y, скорость, направление),
+        а при trajectory=True - список таких состояний после каждого шага.
+        При analytic=True и постоянном управлении без поворота скорость и пройденный путь
+        вычисляются по точному решению уравнения движения с квадратичным сопротивлением за O(1).
+        Это решение непрерывной модели, к которому move сходится при уменьшении time_delta.
+        Время подключённого окружения продвигается на time_delta после каждого шага.
+        """
+        if controls is not None and len(controls) < n_steps:
+            raise ValueError("План управления короче числа шагов")
+        if self._recorder is not None or self._integrator is not None or self._environment is not None:
+            # Каждый шаг должен пройти через move, чтобы попасть в запись, в выбранный интегратор и под снос
+            return self._simulate_by_moves(n_steps, time_delta, controls, trajectory)
+        if n_steps <= 0 or not self._is_afloat or self._weight > self.max_weight:
+            # Затонувшая или тонущая лодка не двигается, достаточно одного вызова move
+            if n_steps > 0:
+                self.move(time_delta)
+            return [self._snapshot()] * max(n_steps, 0) if trajectory else self._snapshot()
+        if analytic and controls is None and not trajectory and self._get_turn_rate() == 0.0:
+            self._fast_forward(n_steps * time_delta)
+            return self._snapshot()
+
+        coefficients = self._coefficients
+        drag = coefficients.drag
+        max_speed = self._max_speed
+        speed = self._speed
+        direction = self._direction
+        x, y = self._position
+        thrust = coefficients.thrust * self._get_effort()
+        turn = self._get_turn_rate() * time_delta
+        radians, sin, cos = math.radians, math.sin, math.cos
+        states: List[Tuple[float, float, float, float]] = []
+
+        for step in range(n_steps):
+            if controls is not None:
+                self._apply_controls(*controls[step])
+                thrust = coefficients.thrust * self._get_effort()
+                turn = self._get_turn_rate() * time_delta
+            speed += (thrust - drag * speed * abs(speed)) * time_delta
+            speed = max(-max_speed, min(max_speed, speed))
+            direction = (direction + turn) % 360.0
+            heading = radians(direction)
+            distance = speed * time_delta
+            x += distance * sin(heading)
+            y += distance * cos(heading)
+            if trajectory:
+                states.append((x, y, speed, direction))
+
+        self._speed = speed
+        self._direction = direction
+        self._position = (x, y)
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
+        return states if trajectory else self._snapshot()
+
+    def _simulate_by_moves(self,
+                           n_steps: int,
+                           time_delta: float,
+                           controls: Optional[Sequence[Tuple[float, float]]],
+                           trajectory: bool):
+        """simulate через обычные вызовы move, когда к лодке подключены наблюдатели"""
+        states = []
+        environment = self._environment
+        for step in range(n_steps):
+            if controls is not None:
+                self._apply_controls(*controls[step])
+            self.move(time_delta)
+            if environment is not None:
+                environment.advance(time_delta)
+            if trajectory:
+                states.append(self._snapshot())
+        return states if trajectory else self._snapshot()
+
+    def _snapshot(self) -> Tuple[float, float, float, float]:
+        """Текущее состояние в формате (x, y, скорость, направление)"""
+        x, y = self._position
+        return x, y, self._speed, self._direction
+
+    def _apply_controls(self, acceleration: float, rotation: float) -> None:
+        """Применяет управление одного шага плана simulate"""
+        self._acceleration = max(-1.0, min(1.0, float(acceleration)))
+        self.rotation = rotation
+
+    def _fast_forward(self, duration: float) -> None:
+        """Продвигает лодку без поворота на duration секунд по точному решению уравнения движения"""
+        speed, distance = _solve_speed(self._speed, self._get_thrust(), self._max_force,
+                                       self._max_speed, self._weight, duration)
+        heading = math.radians(self._direction)
+        x, y = self._position
+        self._speed = speed
+        self._position = (x + distance * math.sin(heading), y + distance * math.cos(heading))
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
+
+    def _get_effort(self) -> float:
+        """Возвращает долю полной тяги, от -1 до 1"""
+        return self._acceleration
+
+    def _get_turn_command(self) -> float:
+        """Возвращает команду поворота, которую коэффициент turn переводит в угловую скорость"""
+        return self._rotation
+
+    def _get_thrust(self) -> float:
+        """Возвращает текущую силу тяги, Н. Отрицательная - для заднего хода"""
+        return self._max_force * self._get_effort()
+
+    def _get_turn_rate(self) -> float:
+        """Возвращает текущую угловую скорость, град/с"""
+        return self._coefficients.turn * self._get_turn_command()
 
     def _get_current_resistance(self):
         """
         Возвращает текущее сопротивление движению.
         Квадратичная функция, равная 1 при предельной скорости, и 0 при нулевой скорости.
         """
-        pass
+        if self._max_speed == 0:
+            return 0.0
+        return (self._speed / self._max_speed) ** 2
+
+    def _set_kinematics(self, speed: float, direction: float, x: float, y: float) -> None:
+        """Записывает результат шага интегратора"""
+        self._speed = max(-self._max_speed, min(self._max_speed, speed))
+        self._direction = direction % 360.0
+        self._position = (x, y)
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
+
+    def _update_speed(self, time_delta: float) -> None:
+        """Обновить скорость на основе силы тяги и сопротивления воды"""
+        coefficients = self._coefficients
+        speed = self._speed
+        # То же, что (тяга - сопротивление * max_force) / вес, но с заранее посчитанными коэффициентами
+        speed += (coefficients.thrust * self._get_effort() - coefficients.drag * speed * abs(speed)) * time_delta
+        self._speed = max(-self._max_speed, min(self._max_speed, speed))
+
+    def _update_direction(self, time_delta: float) -> None:
+        """Обновить направление на основе текущей угловой скорости"""
+        self._direction = (self._direction + self._get_turn_rate() * time_delta) % 360.0
+
+    def _drift(self, start: Tuple[float, float], time_delta: float) -> None:
+        """Сносит лодку течением и ветром, взятыми в точке start"""
+        drift_x, drift_y = self._environment.drift_point(*start)
+        x, y = self._position
+        self._position = (x + drift_x * time_delta, y + drift_y * time_delta)
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
 
     def _update_position(self, time_delta: float) -> None:
-        """Обновить позицию на основе скорости и направления"""
-        pass
+        """Обновить позицию на основе скорости и направления, со сносом, если задано окружение"""
+        heading = math.radians(self._direction)
+        distance = self._speed * time_delta
+        x, y = self._position
+        if self._environment is not None:
+            drift_x, drift_y = self._environment.drift_point(x, y)
+            x += drift_x * time_delta
+            y += drift_y * time_delta
+        self._position = (x + distance * math.sin(heading), y + distance * math.cos(heading))
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
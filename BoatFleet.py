@@ -0,0 +1,313 @@
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from RowingBoat import RowingBoat, _validate_columns
+
+# Колонки флота: имя колонки, тип, соответствующий атрибут RowingBoat
+_COLUMNS = (
+    ("max_weight", np.float64, "max_weight"),
+    ("weight", np.float64, "_weight"),
+    ("max_speed", np.float64, "_max_speed"),
+    ("max_rotation", np.float64, "_max_rotation"),
+    ("max_force", np.float64, "_max_force"),
+    ("rowers_count", np.int64, "_rowers_count"),
+    ("max_rowing_frequency", np.float64, "_max_rowing_frequency"),
+    ("acceleration", np.float64, "_acceleration"),
+    ("rotation", np.float64, "_rotation"),
+    ("rowing_frequency", np.float64, "_rowing_frequency"),
+    ("left_rowing_rate", np.float64, "_left_rowing_rate"),
+    ("right_rowing_rate", np.float64, "_right_rowing_rate"),
+    ("speed", np.float64, "_speed"),
+    ("direction", np.float64, "_direction"),
+    ("x", np.float64, None),
+    ("y", np.float64, None),
+    ("is_afloat", np.bool_, "_is_afloat"),
+)
+
+
+class _ColumnView:
+    """Дескриптор флота: возвращает колонку, обрезанную по числу лодок"""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __get__(self, fleet, owner):
+        if fleet is None:
+            return self
+        return fleet._columns[self._name][:fleet._size]
+
+
+class BoatFleet:
+    """
+    Флот вёсельных лодок в виде набора массивов (по массиву на каждый атрибут).
+    Метод step продвигает весь флот одним векторизованным вызовом по той же модели, что и RowingBoat.move.
+    """
+
+    environment = None  # Течение и ветер, сносящие лодки флота, см. Environment
+
+    def __init__(self, capacity: int = 16):
+        self._size = 0
+        self._columns = self._allocate(max(1, capacity))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _allocate(capacity: int) -> dict:
+        """Создаёт пустые колонки заданной ёмкости"""
+        columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype, _ in _COLUMNS}
+        columns["is_afloat"][:] = True
+        return columns
+
+    def _reserve(self, size: int) -> None:
+        """Увеличивает ёмкость колонок так, чтобы поместилось size лодок"""
+        capacity = len(self._columns["speed"])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        columns = self._allocate(capacity)
+        for name, column in self._columns.items():
+            columns[name][:self._size] = column[:self._size]
+        self._columns = columns
+
+    @classmethod
+    def from_boats(cls, boats: Iterable[RowingBoat]) -> "BoatFleet":
+        """Создаёт флот из копий состояний переданных лодок"""
+        boats = list(boats)
+        fleet = cls(len(boats))
+        for boat in boats:
+            fleet.add(boat)
+        return fleet
+
+    @classmethod
+    def from_arrays(cls, max_weight, weight, number_of_rowers, max_rowing_frequency,
+                    max_speed, max_rotation, rower_force) -> "BoatFleet":
+        """
+        Создаёт флот из колонок параметров конструктора RowingBoat, не создавая объектов лодок.
+        Проверка - как у RowingBoat.from_arrays; строки флота совпадают с состоянием новых лодок.
+        """
+        columns = _validate_columns((max_weight, weight, number_of_rowers, max_rowing_frequency,
+                                     max_speed, max_rotation, rower_force))
+        (max_weight, weight, number_of_rowers, max_rowing_frequency,
+         max_speed, max_rotation, rower_force) = (np.asarray(column, dtype=np.float64) for column in columns)
+        size = len(weight)
+        fleet = cls(size)
+        rows = {name: column[:size] for name, column in fleet._columns.items()}
+        rows.update(max_weight=max_weight, weight=weight, max_speed=max_speed, max_rotation=max_rotation,
+                    max_force=rower_force * number_of_rowers, rowers_count=number_of_rowers,
+                    max_rowing_frequency=max_rowing_frequency)
+        fleet._append(rows)
+        return fleet
+
+    def add(self, boat: RowingBoat) -> int:
+        """Копирует состояние лодки в новую строку флота и возвращает её индекс"""
+        self._reserve(self._size + 1)
+        index = self._size
+        columns = self._columns
+        for name, _, attribute in _COLUMNS:
+            if attribute is not None:
+                columns[name][index] = getattr(boat, attribute)
+        columns["x"][index], columns["y"][index] = boat.position
+        self._size += 1
+        return index
+
+    def _take(self, indices) -> Dict[str, np.ndarray]:
+        """Копии строк флота с индексами indices, по колонкам"""
+        return {name: column[:self._size][indices] for name, column in self._columns.items()}
+
+    def _append(self, rows: Dict[str, np.ndarray]) -> None:
+        """Добавляет в конец флота строки в формате _take"""
+        count = len(rows["speed"])
+        self._reserve(self._size + count)
+        for name, column in self._columns.items():
+            column[self._size:self._size + count] = rows[name]
+        self._size += count
+
+    def _delete(self, indices) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Удаляет строки с индексами indices, перенося на их место строки из конца флота.
+        Возвращает (куда, откуда) перенесённых строк. Индексы лодок-представлений сбиваются.
+        """
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        size = int(keep.sum())
+        holes = np.flatnonzero(~keep[:size])
+        fillers = np.flatnonzero(keep[size:]) + size
+        for column in self._columns.values():
+            column[holes] = column[fillers]
+        self._size = size
+        return holes, fillers
+
+    def boat(self, index: int) -> "FleetBoat":
+        """Возвращает лёгкий объект RowingBoat, читающий и пишущий состояние прямо в строку флота"""
+        if not -self._size <= index < self._size:
+            raise IndexError(f"Лодки с индексом {index} нет во флоте")
+        return FleetBoat(self, index % self._size)
+
+    def set_controls(self, ids, acceleration=None, rotation=None) -> None:
+        """
+        Задаёт управление сразу многим лодкам - то же, что присвоить acceleration и rotation каждой лодке ids.
+        Значения ограничиваются диапазоном [-1, 1], интенсивности гребли пересчитываются по правилу
+        RowingBoat.rotation. Можно передать одно значение для всех лодок; None оставляет параметр прежним.
+        """
+        n = self._size
+        ids = np.asarray(ids, dtype=np.intp)
+        if ids.size and (ids.min() < -n or ids.max() >= n):
+            raise IndexError(f"Во флоте из {n} лодок нет лодок с такими индексами")
+        ids = ids % max(n, 1)  # Колонки длиннее флота, отрицательные индексы считаем от его конца
+        c = self._columns
+        if acceleration is not None:
+            c["acceleration"][ids] = np.clip(acceleration, -1.0, 1.0)
+            c["rowing_frequency"][ids] = c["max_rowing_frequency"][ids] * c["acceleration"][ids]
+        if rotation is not None:
+            c["rotation"][ids] = np.clip(rotation, -1.0, 1.0)
+
+        # Векторный вариант RowingBoat._update_rowing_rates
+        acceleration = c["acceleration"][ids]
+        rotation = c["rotation"][ids]
+        base = np.where(acceleration == 0.0, np.abs(rotation), acceleration)
+        opposite = base * (1.0 - 2.0 * np.abs(rotation))
+        c["left_rowing_rate"][ids] = np.where(rotation > 0, opposite, base)
+        c["right_rowing_rate"][ids] = np.where(rotation < 0, opposite, base)
+
+    def step(self, time_delta: float, mask=None) -> None:
+        """
+        Продвигает лодки флота на time_delta секунд. С логической маской длины флота продвигаются
+        только отмеченные лодки, и время шага пропорционально их числу
+        """
+        n = self._size
+        if mask is None:
+            _advance({name: column[:n] for name, column in self._columns.items()}, time_delta, self.environment)
+            return
+        indices = np.flatnonzero(mask)
+        rows = self._take(indices)
+        _advance(rows, time_delta, self.environment)
+        for name in _STATE_COLUMNS:
+            self._columns[name][indices] = rows[name]
+
+    speed = _ColumnView("speed")
+    direction = _ColumnView("direction")
+    x = _ColumnView("x")
+    y = _ColumnView("y")
+    acceleration = _ColumnView("acceleration")
+    rotation = _ColumnView("rotation")
+    left_rowing_rate = _ColumnView("left_rowing_rate")
+    right_rowing_rate = _ColumnView("right_rowing_rate")
+    weight = _ColumnView("weight")
+    is_afloat = _ColumnView("is_afloat")
+
+
+# Колонки, которые меняет шаг модели
+_STATE_COLUMNS = ("speed", "direction", "x", "y", "is_afloat")
+
+
+def _motion(c: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Тяга и сопротивление на единицу массы и скорость поворота - те же коэффициенты, что motion_coefficients"""
+    max_force = c["max_force"]
+    max_speed = c["max_speed"]
+    left = c["left_rowing_rate"]
+    right = c["right_rowing_rate"]
+    can_row = (max_force > 0) & (c["max_rowing_frequency"] > 0)
+    force_per_mass = max_force / c["weight"]
+    thrust = np.where(can_row, force_per_mass, 0.0) * ((left + right) / 2)
+    drag = np.divide(force_per_mass, max_speed ** 2, out=np.zeros(len(max_speed)), where=max_speed != 0)
+    turn_rate = np.where(can_row, c["max_rotation"] / 2, 0.0) * (right - left)
+    return thrust, drag, turn_rate
+
+
+def _sink(c: Dict[str, np.ndarray]) -> np.ndarray:
+    """Топит перегруженные лодки; возвращает маску лодок, которые продолжают движение"""
+    afloat = c["is_afloat"]
+    sinking = afloat & (c["weight"] > c["max_weight"])
+    c["speed"][sinking] = 0.0
+    afloat[sinking] = False
+    return afloat & ~sinking
+
+
+def _drift(c: Dict[str, np.ndarray], moving: np.ndarray, durations, environment) -> None:
+    """Сносит движущиеся лодки течением и ветром, взятыми в их текущих точках"""
+    drift_x, drift_y = environment.drift(c["x"], c["y"])
+    drift_x *= durations
+    drift_y *= durations
+    if not moving.all():
+        drift_x[~moving] = 0.0
+        drift_y[~moving] = 0.0
+    c["x"] += drift_x
+    c["y"] += drift_y
+
+
+def _advance(c: Dict[str, np.ndarray], time_delta: float, environment=None) -> None:
+    """Шаг модели RowingBoat.move для строк c, на месте"""
+    moving = _sink(c)
+    speed = c["speed"]
+    max_speed = c["max_speed"]
+    thrust, drag, turn_rate = _motion(c)
+
+    new_speed = np.clip(speed + (thrust - drag * speed * np.abs(speed)) * time_delta, -max_speed, max_speed)
+    np.copyto(speed, new_speed, where=moving)
+
+    direction = c["direction"]
+    np.copyto(direction, np.remainder(direction + turn_rate * time_delta, 360.0), where=moving)
+
+    if environment is not None:
+        _drift(c, moving, time_delta, environment)
+    heading = np.radians(direction)
+    distance = np.where(moving, speed * time_delta, 0.0)
+    c["x"] += distance * np.sin(heading)
+    c["y"] += distance * np.cos(heading)
+
+
+class _RowAttribute:
+    """Дескриптор FleetBoat: атрибут RowingBoat, хранящийся в колонке флота"""
+
+    def __init__(self, name: str, kind: type):
+        self._name = name
+        self._kind = kind
+
+    def __get__(self, boat, owner):
+        if boat is None:
+            return self
+        return self._kind(boat._fleet._columns[self._name][boat._index])
+
+    def __set__(self, boat, value) -> None:
+        boat._fleet._columns[self._name][boat._index] = value
+
+
+class _RowPosition:
+    """Дескриптор FleetBoat: позиция, хранящаяся в колонках x и y флота"""
+
+    def __get__(self, boat, owner) -> Tuple[float, float]:
+        if boat is None:
+            return self
+        columns = boat._fleet._columns
+        return float(columns["x"][boat._index]), float(columns["y"][boat._index])
+
+    def __set__(self, boat, value: Tuple[float, float]) -> None:
+        columns = boat._fleet._columns
+        columns["x"][boat._index], columns["y"][boat._index] = value
+
+
+class FleetBoat(RowingBoat):
+    """Вёсельная лодка - представление строки флота. Своего состояния не хранит"""
+
+    __slots__ = ("_fleet", "_index")
+
+    def __init__(self, fleet: BoatFleet, index: int):
+        self._fleet = fleet
+        self._index = index
+        self._reset_hooks()
+        self._update_coefficients()
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    _position = _RowPosition()
+
+
+_KINDS = {np.float64: float, np.int64: int, np.bool_: bool}
+for _name, _dtype, _attribute in _COLUMNS:
+    if _attribute is not None:
+        setattr(FleetBoat, _attribute, _RowAttribute(_name, _KINDS[_dtype]))
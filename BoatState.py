@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import struct
+from collections import namedtuple
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, List
+
+# Поля снимка. rowers_count - целое, is_afloat - логическое, остальные - вещественные
+_FIELDS = ("max_weight", "weight", "max_speed", "max_rotation", "max_force", "rowers_count",
+           "max_rowing_frequency", "acceleration", "rotation", "rowing_frequency", "left_rowing_rate",
+           "right_rowing_rate", "speed", "direction", "x", "y", "is_afloat")
+
+
+class BoatState(namedtuple("BoatState", _FIELDS)):
+    """Неизменяемый снимок состояния вёсельной лодки"""
+
+    __slots__ = ()
+
+    def pack(self) -> bytes:
+        """Упаковывает снимок в запись фиксированной длины"""
+        return _RECORD.pack(*self)
+
+    @classmethod
+    def unpack(cls, buffer: bytes) -> "BoatState":
+        """Восстанавливает снимок из записи, созданной pack"""
+        return cls._make(_RECORD.unpack(buffer))
+
+
+# Порядок полей совпадает с BoatState
+_RECORD = struct.Struct("<5dq10d?")
+
+RECORD_SIZE = _RECORD.size
+
+
+def pack_states(states: Iterable[BoatState]) -> bytes:
+    """Упаковывает последовательность снимков в один непрерывный буфер"""
+    return b"".join(_RECORD.pack(*state) for state in states)
+
+
+def unpack_states(buffer: bytes) -> List[BoatState]:
+    """Распаковывает буфер, созданный pack_states"""
+    return [BoatState._make(record) for record in _RECORD.iter_unpack(buffer)]
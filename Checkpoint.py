@@ -0,0 +1,120 @@
+"""
+Контрольные точки симуляции: состояние всех лодок флота и часы в компактном двоичном файле.
+
+Формат (little-endian): заголовок - сигнатура, версия формата, число лодок, номер шага, шаг симуляции в с;
+затем колонки BoatFleet в порядке _COLUMNS, каждая целиком, значения в типе колонки.
+Файл пишется во временный рядом с целевым и подменяет его атомарно, так что после сбоя
+на диске остаётся либо прежняя, либо новая контрольная точка, но не половина.
+"""
+import os
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from BoatFleet import BoatFleet, _COLUMNS
+from RowingBoat import RowingBoat
+
+_HEADER = struct.Struct("<4sIQQd")
+_MAGIC = b"BCKP"
+_VERSION = 1
+
+# Типы колонок на диске не зависят от платформы
+_DISK_DTYPES = {name: np.dtype(dtype).newbyteorder("<") for name, dtype, _ in _COLUMNS}
+
+
+class Checkpoint(NamedTuple):
+    """Восстановленная контрольная точка"""
+
+    fleet: BoatFleet
+    ticks: int
+    time_step: float  # с
+
+    def boats(self) -> List[RowingBoat]:
+        """Самостоятельные лодки с состоянием строк флота"""
+        return [RowingBoat.from_state(self.fleet.boat(index).get_state()) for index in range(len(self.fleet))]
+
+
+def _snapshot(source: Union[BoatFleet, Iterable[RowingBoat]]) -> Dict[str, np.ndarray]:
+    """Копии колонок флота, которые можно писать на диск, пока флот продолжает двигаться"""
+    fleet = source if isinstance(source, BoatFleet) else BoatFleet.from_boats(source)
+    size = len(fleet)
+    return {name: fleet._columns[name][:size].astype(_DISK_DTYPES[name]) for name, _, _ in _COLUMNS}
+
+
+def _write(path: str, columns: Dict[str, np.ndarray], ticks: int, time_step: float) -> None:
+    size = len(columns["speed"])
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, size, ticks, time_step))
+            for name, _, _ in _COLUMNS:
+                file.write(memoryview(columns[name]).cast("B"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def save_checkpoint(path: str, source: Union[BoatFleet, Iterable[RowingBoat]],
+                    ticks: int = 0, time_step: float = 0.0) -> None:
+    """Сохраняет флот (или последовательность лодок) и часы симуляции"""
+    _write(path, _snapshot(source), ticks, time_step)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Читает контрольную точку, созданную save_checkpoint или CheckpointWriter"""
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Файл {path!r} не является контрольной точкой")
+        magic, version, size, ticks, time_step = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"Файл {path!r} не является контрольной точкой")
+        if version != _VERSION:
+            raise ValueError(f"Неподдерживаемая версия контрольной точки: {version}")
+        fleet = BoatFleet(size)
+        for name, _, _ in _COLUMNS:
+            dtype = _DISK_DTYPES[name]
+            data = file.read(size * dtype.itemsize)
+            if len(data) != size * dtype.itemsize:
+                raise ValueError(f"Контрольная точка {path!r} обрезана")
+            fleet._columns[name][:size] = np.frombuffer(data, dtype)
+    fleet._size = size
+    return Checkpoint(fleet, ticks, time_step)
+
+
+class CheckpointWriter:
+    """
+    Пишет контрольные точки в фоновом потоке.
+    В вызывающем потоке выполняется только копирование колонок, поэтому цикл шагов почти не прерывается.
+    Если предыдущая точка ещё пишется, новая не создаётся: write возвращает задачу предыдущей.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: Optional[Future] = None
+        self.skipped = 0  # Точки, пропущенные из-за незавершённой записи
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, source: Union[BoatFleet, Iterable[RowingBoat]], ticks: int = 0, time_step: float = 0.0) -> Future:
+        """Запоминает текущее состояние и начинает запись; результат задачи - None или исключение записи"""
+        if self._pending is not None and not self._pending.done():
+            self.skipped += 1
+            return self._pending
+        self._pending = self._executor.submit(_write, self._path, _snapshot(source), ticks, time_step)
+        return self._pending
+
+    def close(self) -> None:
+        """Дожидается записи последней точки"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,284 @@
+"""
+Ансамбль Монте-Карло: один и тот же маршрут RowingBoat проходится многими лодками-участниками
+со случайными возмущениями, и по ансамблю накапливается распределение времени прибытия.
+
+Участники одной пачки движутся вместе как BoatFleet под управлением Autopilot. Случайные величины
+участника берутся из генератора со счётчиком: значение - хеш от (seed, номер участника, номер шага, поток),
+поэтому результат участника не зависит от того, в какой пачке и каком процессе он считался.
+Статистика накапливается блоками по BLOCK участников в порядке их номеров, так что итог совпадает
+до бита при любом размере пачек и числе процессов. Траектории не хранятся.
+"""
+import itertools
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Autopilot import Autopilot, Route
+from BoatFleet import BoatFleet
+from ParameterSweep import DEFAULTS
+
+# Участников в блоке статистики; размер пачки округляется до кратного
+BLOCK = 256
+
+# Потоки случайных чисел участника
+_FORCE, _CURRENT_X, _CURRENT_Y, _GUST = range(4)
+
+
+class Scenario(NamedTuple):
+    """Сценарий: маршрут из путевых точек и параметры лодки, которыми они отличаются от DEFAULTS"""
+
+    waypoints: Sequence[Tuple[float, float]]
+    config: Dict[str, float] = {}
+    cruise: float = 1.0  # Ускорение на маршруте, см. Autopilot
+    lookahead: float = 20.0  # м
+    arrival_radius: float = 5.0  # м
+    horizon: float = 3600.0  # с
+    time_delta: float = 1.0  # с
+
+
+class Disturbances(NamedTuple):
+    """Модель возмущений. Разброс задаётся стандартным отклонением нормального распределения"""
+
+    force_spread: float = 0.0  # Относительный разброс силы гребца, один раз на участника
+    gust_sigma: float = 0.0  # м/с^2, случайное ускорение вдоль курса на каждом шаге
+    current: Tuple[float, float] = (0.0, 0.0)  # м/с, среднее течение по x и y
+    current_spread: float = 0.0  # м/с, разброс течения по каждой оси, один раз на участника
+
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(z: np.ndarray) -> np.ndarray:
+    """Перемешивание SplitMix64"""
+    z = z + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+def _uniform(seed: int, members: np.ndarray, step: int, stream: int) -> np.ndarray:
+    """Равномерные числа в [0, 1), по одному на участника, зависящие только от своих аргументов"""
+    key = _mix(np.array([seed], dtype=np.uint64))
+    counter = _mix(_mix(members.astype(np.uint64) ^ key) ^ np.uint64(step))
+    return (_mix(counter ^ np.uint64(stream)) >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def _normal(seed: int, members: np.ndarray, step: int, stream: int) -> np.ndarray:
+    """Стандартные нормальные числа по Боксу - Мюллеру из двух равномерных"""
+    first = _uniform(seed, members, step, 2 * stream)
+    second = _uniform(seed, members, step, 2 * stream + 1)
+    return np.sqrt(-2.0 * np.log1p(-first)) * np.cos(2.0 * math.pi * second)
+
+
+class QuantileSketch:
+    """
+    Скетч квантилей с относительной точностью relative_accuracy (по схеме DDSketch): значения раскладываются
+    по корзинам с геометрически растущими границами. Память - число занятых корзин,
+    два скетча с одинаковой точностью сливаются сложением счётчиков.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Недопустимая относительная точность: {relative_accuracy!r}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+
+    def _fill(self, buckets: Dict[int, int], values: np.ndarray) -> None:
+        indices, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64), return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            buckets[index] = buckets.get(index, 0) + count
+
+    def add(self, values) -> None:
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if not np.isfinite(values).all():
+            raise ValueError("В скетч квантилей можно добавлять только конечные значения")
+        self._fill(self._positive, values[values > 0])
+        self._fill(self._negative, -values[values < 0])
+        self._zeros += int(np.count_nonzero(values == 0))
+        self.count += len(values)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Сливать можно только скетчи с одинаковой точностью")
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+
+    def _value(self, index: int) -> float:
+        """Представитель корзины: относительная ошибка для любого значения корзины не больше relative_accuracy"""
+        return 2.0 * self._gamma ** index / (self._gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Недопустимый уровень квантиля: {q!r}")
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self._positive))
+
+
+class RunningStatistics:
+    """Потоковые число значений, среднее, дисперсия (Уэлфорд, слияние по Чану), минимум, максимум и квантили"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def add(self, values) -> None:
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if not len(values):
+            return
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.add(values)
+
+    def merge(self, other: "RunningStatistics") -> None:
+        if other.count:
+            self._combine(other.count, other.mean, other._m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self) -> float:
+        """Несмещённая выборочная дисперсия"""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+
+class EnsembleSummary(NamedTuple):
+    members: int
+    arrived: int  # Участники, дошедшие до конца маршрута за горизонт сценария
+    arrival_time: RunningStatistics  # с, только по дошедшим
+
+
+def simulate_members(scenario: Scenario, disturbances: Disturbances, seed: int, members: np.ndarray) -> np.ndarray:
+    """Время прибытия каждого участника из members, с; inf - не дошёл за горизонт"""
+    members = np.asarray(members, dtype=np.int64)
+    size = len(members)
+    config = {**DEFAULTS, **scenario.config}
+    force = config["rower_force"] * np.maximum(1.0 + disturbances.force_spread * _normal(seed, members, 0, _FORCE), 0.0)
+    fleet = BoatFleet.from_arrays(*(np.full(size, config[name]) for name in
+                                    ("max_weight", "weight", "number_of_rowers", "max_rowing_frequency",
+                                     "max_speed", "max_rotation")), force)
+    current_x = disturbances.current[0] + disturbances.current_spread * _normal(seed, members, 0, _CURRENT_X)
+    current_y = disturbances.current[1] + disturbances.current_spread * _normal(seed, members, 0, _CURRENT_Y)
+
+    route = Route(scenario.waypoints)
+    fleet.x[:], fleet.y[:] = route.waypoints[0]
+    fleet.direction[:] = route.headings[0]
+    autopilot = Autopilot(fleet, scenario.lookahead, scenario.cruise, scenario.arrival_radius)
+    autopilot.assign(np.arange(size), route)
+
+    time_delta = scenario.time_delta
+    max_speed = fleet._columns["max_speed"][:size]
+    arrival = np.full(size, math.inf)
+    for step in range(max(1, round(scenario.horizon / time_delta)) + 1):
+        arrival[autopilot.update()] = step * time_delta
+        if not len(autopilot) or step * time_delta >= scenario.horizon:
+            break
+        fleet.step(time_delta)
+        if disturbances.gust_sigma:
+            gust = disturbances.gust_sigma * _normal(seed, members, step + 1, _GUST)
+            np.clip(fleet.speed + gust * time_delta, -max_speed, max_speed, out=fleet.speed)
+        fleet.x[:] += current_x * time_delta
+        fleet.y[:] += current_y * time_delta
+    return arrival
+
+
+def _chunk_arrivals(scenario: Scenario, disturbances: Disturbances, seed: int, start: int, stop: int) -> np.ndarray:
+    return simulate_members(scenario, disturbances, seed, np.arange(start, stop))
+
+
+def run_ensemble(scenario: Scenario,
+                 disturbances: Disturbances,
+                 members: int,
+                 seed: int = 0,
+                 workers: Optional[int] = 1,
+                 chunk_size: int = 4096,
+                 relative_accuracy: float = 0.01) -> EnsembleSummary:
+    """
+    Прогоняет members участников пачками по chunk_size (округляется до кратного BLOCK).
+    С workers > 1 (None - по числу ядер) пачки считаются в пуле процессов, не больше двух пачек на процесс.
+    """
+    chunk_size = max(BLOCK, -(-chunk_size // BLOCK) * BLOCK)
+    workers = workers or os.cpu_count() or 1
+    statistics = RunningStatistics(relative_accuracy)
+    arrived = 0
+
+    def accumulate(arrival: np.ndarray) -> None:
+        nonlocal arrived
+        for offset in range(0, len(arrival), BLOCK):
+            block = arrival[offset:offset + BLOCK]
+            finished = block[np.isfinite(block)]
+            arrived += len(finished)
+            statistics.add(finished)
+
+    chunks: Iterator[Tuple[int, int]] = ((start, min(start + chunk_size, members))
+                                         for start in range(0, members, chunk_size))
+    if workers == 1:
+        for start, stop in chunks:
+            accumulate(_chunk_arrivals(scenario, disturbances, seed, start, stop))
+        return EnsembleSummary(members, arrived, statistics)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * workers
+        pending = {}
+        ready: Dict[int, np.ndarray] = {}  # Готовые пачки, ждущие предыдущих
+        next_start = 0
+        while True:
+            for start, stop in itertools.islice(chunks, max_pending - len(pending)):
+                pending[executor.submit(_chunk_arrivals, scenario, disturbances, seed, start, stop)] = start
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ready[pending.pop(future)] = future.result()
+            while next_start in ready:
+                arrival = ready.pop(next_start)
+                accumulate(arrival)
+                next_start += len(arrival)
+    return EnsembleSummary(members, arrived, statistics)
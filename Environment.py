@@ -0,0 +1,211 @@
+"""
+Течение и ветер, сносящие лодки.
+
+VectorField - векторное поле (u, v) в м/с на регулярной сетке, постоянное или заданное на ряде моментов времени.
+Узел сетки (i, j) лежит в точке (origin_x + j * cell_size, origin_y + i * cell_size); между узлами поле
+интерполируется билинейно, за краем сетки продолжается значениями края. Большие сетки можно открыть
+из .npy без чтения в память (load).
+
+Для каждой ячейки сетки билинейная формула сводится к четырём коэффициентам на компоненту:
+f = a + b * fx + c * fy + d * fx * fy. Коэффициенты считаются плитками по TILE x TILE ячеек
+при первом обращении к плитке и дальше берутся одним чтением строки таблицы,
+так что память и время расходуются только на тронутые лодками участки сетки.
+"""
+import bisect
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Сторона плитки кэша коэффициентов, в ячейках
+TILE = 32
+
+
+class _CellCache:
+    """Коэффициенты билинейной интерполяции ячеек одного слоя сетки, заполняемые плитками по требованию"""
+
+    def __init__(self, grid: np.ndarray):
+        self._grid = grid
+        rows, columns = grid.shape[0] - 1, grid.shape[1] - 1
+        # Страницы памяти под незаполненные плитки не выделяются, пока в них ничего не записано
+        self._coefficients = np.empty((rows, columns, 8))
+        self._table = self._coefficients.reshape(-1, 8)  # По строке на ячейку
+        self._tiles_x = -(-columns // TILE)
+        self._filled = np.zeros((-(-rows // TILE), self._tiles_x), dtype=bool)
+
+    def _fill(self, tile: int) -> None:
+        tile_y, tile_x = divmod(tile, self._tiles_x)
+        rows = slice(tile_y * TILE, min((tile_y + 1) * TILE, self._coefficients.shape[0]))
+        columns = slice(tile_x * TILE, min((tile_x + 1) * TILE, self._coefficients.shape[1]))
+        grid = np.asarray(self._grid[rows.start:rows.stop + 1, columns.start:columns.stop + 1], dtype=np.float64)
+        corner, right, top, diagonal = grid[:-1, :-1], grid[:-1, 1:], grid[1:, :-1], grid[1:, 1:]
+        coefficients = self._coefficients[rows, columns]
+        coefficients[..., 0:2] = corner
+        coefficients[..., 2:4] = right - corner
+        coefficients[..., 4:6] = top - corner
+        coefficients[..., 6:8] = diagonal - right - top + corner
+        self._filled.flat[tile] = True
+
+    def rows(self, row: np.ndarray, column: np.ndarray) -> np.ndarray:
+        """Коэффициенты ячеек (row, column): массив (n, 8) - a, b, c, d попарно для u и v"""
+        tiles = (row // TILE) * self._tiles_x + column // TILE
+        missing = ~self._filled.ravel()[tiles]
+        if missing.any():
+            for tile in np.unique(tiles[missing]).tolist():
+                self._fill(tile)
+        return np.take(self._table, row * self._coefficients.shape[1] + column, axis=0)
+
+    def row(self, row: int, column: int) -> list:
+        if not self._filled[row // TILE, column // TILE]:
+            self._fill(row // TILE * self._tiles_x + column // TILE)
+        return self._coefficients[row, column].tolist()
+
+
+class VectorField:
+    """
+    Векторное поле на сетке. data - массив (ny, nx, 2) или, если заданы моменты times (по возрастанию, с),
+    массив (len(times), ny, nx, 2). Между моментами поле интерполируется линейно, вне их - берётся крайний слой.
+    """
+
+    def __init__(self,
+                 data,
+                 cell_size: float,
+                 origin: Tuple[float, float] = (0.0, 0.0),
+                 times: Optional[Sequence[float]] = None):
+        data = data if isinstance(data, np.ndarray) else np.asarray(data, dtype=np.float64)
+        layers = data[None] if times is None else data
+        if layers.ndim != 4 or layers.shape[1] < 2 or layers.shape[2] < 2 or layers.shape[3] != 2:
+            raise ValueError("Поле задаётся массивом (ny, nx, 2) или (число моментов, ny, nx, 2) с ny, nx >= 2")
+        if cell_size <= 0:
+            raise ValueError(f"Недопустимый размер ячейки: {cell_size!r}")
+        self._times = [0.0] if times is None else [float(time) for time in times]
+        if len(self._times) != len(layers) or any(b <= a for a, b in zip(self._times, self._times[1:])):
+            raise ValueError("Моменты времени должны возрастать, по одному на слой поля")
+        self._layers = layers
+        self._cell_size = float(cell_size)
+        self._origin = (float(origin[0]), float(origin[1]))
+        self._last_x = layers.shape[2] - 1  # Последний узел сетки по x
+        self._last_y = layers.shape[1] - 1
+        self._caches: Dict[int, _CellCache] = {}
+
+    @classmethod
+    def load(cls,
+             path: str,
+             cell_size: float,
+             origin: Tuple[float, float] = (0.0, 0.0),
+             times: Optional[Sequence[float]] = None) -> "VectorField":
+        """Открывает поле из файла .npy отображением в память: с диска читаются только тронутые плитки"""
+        return cls(np.load(path, mmap_mode="r"), cell_size, origin, times)
+
+    def _cache(self, layer: int) -> _CellCache:
+        cache = self._caches.get(layer)
+        if cache is None:
+            if len(self._caches) >= 4:
+                # Время обычно идёт вперёд: старые слои больше не понадобятся
+                del self._caches[min(self._caches)]
+            cache = self._caches[layer] = _CellCache(self._layers[layer])
+        return cache
+
+    def _layers_at(self, time: float) -> Tuple[int, int, float]:
+        """Соседние слои для момента time и вес второго из них"""
+        times = self._times
+        if time <= times[0]:
+            return 0, 0, 0.0
+        if time >= times[-1]:
+            last = len(times) - 1
+            return last, last, 0.0
+        second = bisect.bisect_right(times, time)
+        return second - 1, second, (time - times[second - 1]) / (times[second] - times[second - 1])
+
+    def sample(self, x, y, time: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Компоненты u (вдоль x) и v (вдоль y) поля в точках (x, y) в момент time"""
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        grid_x = np.clip((x - self._origin[0]) / self._cell_size, 0.0, self._last_x)
+        grid_y = np.clip((y - self._origin[1]) / self._cell_size, 0.0, self._last_y)
+        column = np.minimum(grid_x.astype(np.intp), self._last_x - 1)
+        row = np.minimum(grid_y.astype(np.intp), self._last_y - 1)
+        fraction_x = grid_x - column
+        fraction_y = grid_y - row
+
+        first, second, weight = self._layers_at(time)
+        u = v = None
+        for layer, layer_weight in ((first, 1.0 - weight), (second, weight)):
+            if layer_weight == 0.0:
+                continue
+            c = self._cache(layer).rows(row, column)
+            layer_u = c[:, 0] + fraction_x * (c[:, 2] + fraction_y * c[:, 6]) + fraction_y * c[:, 4]
+            layer_v = c[:, 1] + fraction_x * (c[:, 3] + fraction_y * c[:, 7]) + fraction_y * c[:, 5]
+            if u is None:
+                u, v = (layer_u, layer_v) if layer_weight == 1.0 else (layer_u * layer_weight, layer_v * layer_weight)
+            else:
+                u += layer_u * layer_weight
+                v += layer_v * layer_weight
+        return u, v
+
+    def sample_point(self, x: float, y: float, time: float = 0.0) -> Tuple[float, float]:
+        """То же, что sample, для одной точки - без массивов NumPy"""
+        grid_x = min(max((x - self._origin[0]) / self._cell_size, 0.0), self._last_x)
+        grid_y = min(max((y - self._origin[1]) / self._cell_size, 0.0), self._last_y)
+        column = min(int(grid_x), self._last_x - 1)
+        row = min(int(grid_y), self._last_y - 1)
+        fraction_x = grid_x - column
+        fraction_y = grid_y - row
+
+        first, second, weight = self._layers_at(time)
+        u = v = 0.0
+        for layer, layer_weight in ((first, 1.0 - weight), (second, weight)):
+            if layer_weight == 0.0:
+                continue
+            u_a, v_a, u_b, v_b, u_c, v_c, u_d, v_d = self._cache(layer).row(row, column)
+            u += layer_weight * (u_a + fraction_x * (u_b + fraction_y * u_d) + fraction_y * u_c)
+            v += layer_weight * (v_a + fraction_x * (v_b + fraction_y * v_d) + fraction_y * v_c)
+        return u, v
+
+
+class Environment:
+    """
+    Течение и ветер, общие для лодок и флотов. Лодку сносит со скоростью течения плюс windage от скорости ветра.
+    Время поля - атрибут time; цикл симуляции продвигает его сам (advance), один раз за шаг всех лодок.
+    Подключается через Boat.environment и BoatFleet.environment.
+    """
+
+    def __init__(self,
+                 current: Optional[VectorField] = None,
+                 wind: Optional[VectorField] = None,
+                 windage: float = 0.02,
+                 time: float = 0.0):
+        self.current = current
+        self.wind = wind
+        self.windage = windage
+        self.time = time
+
+    def advance(self, time_delta: float) -> None:
+        self.time += time_delta
+
+    def drift(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """Скорость сноса (по x, по y) в точках (x, y), м/с"""
+        if self.current is not None:
+            drift_x, drift_y = self.current.sample(x, y, self.time)
+        else:
+            size = len(np.atleast_1d(x))
+            drift_x, drift_y = np.zeros(size), np.zeros(size)
+        if self.wind is not None and self.windage:
+            u, v = self.wind.sample(x, y, self.time)
+            drift_x += self.windage * u
+            drift_y += self.windage * v
+        return drift_x, drift_y
+
+    def drift_point(self, x: float, y: float) -> Tuple[float, float]:
+        drift_x = drift_y = 0.0
+        if self.current is not None:
+            drift_x, drift_y = self.current.sample_point(x, y, self.time)
+        if self.wind is not None and self.windage:
+            u, v = self.wind.sample_point(x, y, self.time)
+            drift_x += self.windage * u
+            drift_y += self.windage * v
+        return drift_x, drift_y
+
+
+def uniform_field(u: float, v: float) -> VectorField:
+    """Одинаковое везде поле - например, постоянное течение"""
+    return VectorField(np.full((2, 2, 2), (u, v), dtype=np.float64), cell_size=1.0)
@@ -0,0 +1,103 @@
+"""
+Интеграторы движения лодки повышенного порядка.
+Скорость, направление и координаты интегрируются совместно, поэтому большие шаги не уводят лодку с дуги поворота.
+Как и в Boat.move, скорость ограничена max_speed: промежуточные стадии перемещают лодку с ограниченной скоростью.
+Подключаются через Boat.integrator; по умолчанию лодка использует явную схему Эйлера в Boat.move.
+"""
+import math
+from typing import Tuple
+
+from Boat import Boat
+
+State = Tuple[float, float, float, float]  # скорость, направление в градусах, x, y
+
+
+def _derivatives(state: State, thrust: float, drag: float, turn_rate: float, max_speed: float) -> State:
+    speed, direction, _, _ = state
+    speed = max(-max_speed, min(max_speed, speed))
+    heading = math.radians(direction)
+    return (thrust - drag * speed * abs(speed), turn_rate, speed * math.sin(heading), speed * math.cos(heading))
+
+
+def _combine(state: State, step: float, *terms: Tuple[float, State]) -> State:
+    """state + step * sum(вес * производная)"""
+    return tuple(value + step * sum(weight * derivative[index] for weight, derivative in terms)
+                 for index, value in enumerate(state))
+
+
+def _controls(boat: Boat) -> Tuple[float, float, float, float]:
+    coefficients = boat._coefficients
+    return coefficients.thrust * boat._get_effort(), coefficients.drag, boat._get_turn_rate(), boat._max_speed
+
+
+class RK4Integrator:
+    """Классический метод Рунге-Кутты четвёртого порядка с одним шагом на вызов move"""
+
+    def step(self, boat: Boat, time_delta: float) -> None:
+        controls = _controls(boat)
+        state = (boat._speed, boat._direction, *boat._position)
+        k1 = _derivatives(state, *controls)
+        k2 = _derivatives(_combine(state, time_delta / 2, (1.0, k1)), *controls)
+        k3 = _derivatives(_combine(state, time_delta / 2, (1.0, k2)), *controls)
+        k4 = _derivatives(_combine(state, time_delta, (1.0, k3)), *controls)
+        boat._set_kinematics(*_combine(state, time_delta / 6, (1.0, k1), (2.0, k2), (2.0, k3), (1.0, k4)))
+
+
+# Таблица Бутчера метода Дормана-Принса 5(4)
+_DP_NODES = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_FIFTH = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_FOURTH = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+
+
+class RK45Integrator:
+    """
+    Вложенный метод Дормана-Принса 5(4) с автоматическим выбором шага.
+    Вызов move(time_delta) разбивается на столько подшагов, сколько нужно, чтобы оценка локальной ошибки
+    скорости и координат не превышала tolerance. Размер последнего удачного подшага запоминается.
+    """
+
+    def __init__(self, tolerance: float = 1e-6, max_substeps: int = 10_000):
+        if tolerance <= 0:
+            raise ValueError(f"Недопустимая точность: {tolerance!r}")
+        self.tolerance = tolerance
+        self.max_substeps = max_substeps
+        self.substeps = 0  # Всего выполнено подшагов, включая отброшенные
+        self._step_size = None
+
+    def step(self, boat: Boat, time_delta: float) -> None:
+        controls = _controls(boat)
+        max_speed = controls[-1]
+        state = (boat._speed, boat._direction, *boat._position)
+        remaining = time_delta
+        step_size = min(self._step_size or time_delta, time_delta)
+        substeps = 0
+        while remaining > 0:
+            if substeps == self.max_substeps:
+                raise RuntimeError(f"Не удалось достичь точности {self.tolerance} за {self.max_substeps} подшагов")
+            substeps += 1
+            step_size = min(step_size, remaining)
+            stages = []
+            for weights in _DP_NODES:
+                stage_state = _combine(state, step_size, *zip(weights, stages))
+                stages.append(_derivatives(stage_state, *controls))
+            fifth = _combine(state, step_size, *zip(_DP_FIFTH, stages))
+            fourth = _combine(state, step_size, *zip(_DP_FOURTH, stages))
+            # Направление не входит в оценку: при постоянной угловой скорости оно интегрируется точно
+            error = max(abs(fifth[index] - fourth[index]) for index in (0, 2, 3))
+            if error <= self.tolerance:
+                speed, direction, x, y = fifth
+                state = (max(-max_speed, min(max_speed, speed)), direction, x, y)
+                remaining -= step_size
+            factor = 0.9 * (self.tolerance / error) ** 0.2 if error else 5.0
+            step_size *= min(5.0, max(0.2, factor))
+        self.substeps += substeps
+        self._step_size = step_size
+        boat._set_kinematics(*state)
@@ -0,0 +1,169 @@
+"""
+Уровни детализации симуляции флота.
+
+Лодки не дальше radius от какого-либо наблюдателя идут в полном режиме: каждый шаг по модели BoatFleet.step.
+Остальные идут в грубом режиме: раз в stride шагов за всё накопленное время, упрощённой моделью -
+скорость сразу принимает установившееся значение (тяга равна сопротивлению), курс меняется
+с постоянной скоростью поворота, лодка проходит хорду по среднему курсу интервала.
+Моменты грубых шагов разнесены по номерам лодок, так что на каждом шаге обновляется лишь 1/stride
+дальних лодок. Когда лодка переходит в полный режим, накопленное время сначала досчитывается
+грубой моделью, поэтому положение и курс не скачут, а время лодки совпадает со временем флота.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+from BoatFleet import BoatFleet, _STATE_COLUMNS, _drift, _motion, _sink
+
+FULL = 0
+COARSE = 1
+AUTO = -1  # Уровень по расстоянию до наблюдателей
+
+
+def _coarse_advance(fleet: BoatFleet, indices: np.ndarray, durations: np.ndarray) -> None:
+    """Грубый шаг лодок indices на durations секунд каждая"""
+    rows = fleet._take(indices)
+    moving = _sink(rows)
+    thrust, drag, turn_rate = _motion(rows)
+    max_speed = rows["max_speed"]
+    steady = np.sign(thrust) * np.sqrt(np.divide(np.abs(thrust), drag, out=np.zeros(len(drag)), where=drag > 0))
+    speed = np.clip(steady, -max_speed, max_speed)
+
+    direction = rows["direction"]
+    turn = turn_rate * durations
+    heading = np.radians(direction + turn / 2)
+    distance = np.where(moving, speed * durations, 0.0)
+    if fleet.environment is not None:
+        _drift(rows, moving, durations, fleet.environment)
+    np.copyto(rows["speed"], speed, where=moving)
+    np.copyto(direction, np.remainder(direction + turn, 360.0), where=moving)
+    rows["x"] += distance * np.sin(heading)
+    rows["y"] += distance * np.cos(heading)
+    for name in _STATE_COLUMNS:
+        fleet._columns[name][indices] = rows[name]
+
+
+class LevelOfDetail:
+    """
+    Продвигает флот с уровнями детализации по наблюдателям (точкам на воде) или заданным явно.
+    Лодка уходит в грубый режим, когда отдаляется от всех наблюдателей дальше radius * (1 + hysteresis),
+    и возвращается в полный, когда подходит к одному из них ближе radius.
+    Пока лодка в грубом режиме, её состояние отстаёт от времени флота не больше чем на stride шагов (см. lag);
+    управление, заданное в это время, действует на весь ещё не досчитанный интервал.
+    """
+
+    def __init__(self, fleet: BoatFleet, radius: float = 500.0, stride: int = 10, hysteresis: float = 0.1):
+        if radius <= 0 or stride < 1 or hysteresis < 0:
+            raise ValueError("Недопустимые параметры уровней детализации")
+        self._fleet = fleet
+        self._radius = radius
+        self._stride = stride
+        self._hysteresis = hysteresis
+        self._observers: Dict[int, Tuple[float, float]] = {}
+        self._next_observer = 0
+        self._ticks = 0
+        self._time = 0.0
+        self._tiers = np.empty(0, dtype=np.int8)
+        self._priority = np.empty(0, dtype=np.int8)
+        self._pinned = False
+        self._updated_at = np.empty(0)  # Время флота, до которого досчитана каждая лодка грубого режима
+        self._resize()
+
+    @property
+    def tiers(self) -> np.ndarray:
+        """Текущий уровень каждой лодки флота: FULL или COARSE"""
+        self._resize()
+        return self._tiers.copy()
+
+    @property
+    def lag(self) -> np.ndarray:
+        """На сколько секунд состояние каждой лодки отстаёт от времени флота"""
+        self._resize()
+        return np.where(self._tiers == COARSE, self._time - self._updated_at, 0.0)
+
+    def _resize(self) -> None:
+        """Подгоняет свои массивы под число лодок флота; новые лодки начинают в полном режиме"""
+        size = len(self._fleet)
+        old = len(self._tiers)
+        if size == old:
+            return
+        self._tiers = np.resize(self._tiers, size)
+        self._priority = np.resize(self._priority, size)
+        self._updated_at = np.resize(self._updated_at, size)
+        self._tiers[old:] = FULL
+        self._priority[old:] = AUTO
+
+    def add_observer(self, position: Tuple[float, float]) -> int:
+        """Добавляет наблюдателя и возвращает его номер"""
+        observer = self._next_observer
+        self._next_observer += 1
+        self._observers[observer] = position
+        return observer
+
+    def move_observer(self, observer: int, position: Tuple[float, float]) -> None:
+        if observer not in self._observers:
+            raise KeyError(f"Наблюдателя {observer} нет")
+        self._observers[observer] = position
+
+    def remove_observer(self, observer: int) -> None:
+        del self._observers[observer]
+
+    def set_priority(self, ids, tier: int = AUTO) -> None:
+        """Закрепляет за лодками ids уровень FULL или COARSE; AUTO возвращает выбор по наблюдателям"""
+        if tier not in (AUTO, FULL, COARSE):
+            raise ValueError(f"Недопустимый уровень детализации: {tier!r}")
+        self._resize()
+        self._priority[np.asarray(ids, dtype=np.intp)] = tier
+        self._pinned = bool((self._priority != AUTO).any())
+
+    def _target_tiers(self) -> np.ndarray:
+        """Уровни по расстоянию до ближайшего наблюдателя с учётом гистерезиса и закреплённых уровней"""
+        fleet = self._fleet
+        if self._observers:
+            x, y = fleet.x, fleet.y
+            nearest = np.full(len(fleet), np.inf)
+            for observer_x, observer_y in self._observers.values():
+                np.minimum(nearest, (x - observer_x) ** 2 + (y - observer_y) ** 2, out=nearest)
+            tiers = np.where(nearest < self._radius ** 2, FULL,
+                             np.where(nearest > (self._radius * (1.0 + self._hysteresis)) ** 2, COARSE, self._tiers))
+        else:
+            tiers = np.full(len(fleet), COARSE)
+        if self._pinned:
+            tiers = np.where(self._priority != AUTO, self._priority, tiers)
+        return tiers.astype(np.int8, copy=False)
+
+    def _catch_up(self, indices: np.ndarray) -> None:
+        """Досчитывает лодки indices грубой моделью до текущего времени флота"""
+        durations = self._time - self._updated_at[indices]
+        behind = durations > 0
+        if behind.any():
+            _coarse_advance(self._fleet, indices[behind], durations[behind])
+        self._updated_at[indices] = self._time
+
+    def sync(self) -> None:
+        """Досчитывает отставание всех лодок грубого режима, например перед сохранением флота"""
+        self._resize()
+        self._catch_up(np.flatnonzero(self._tiers == COARSE))
+
+    def step(self, time_delta: float) -> None:
+        """Продвигает флот на time_delta секунд"""
+        self._resize()
+        tiers = self._target_tiers()
+        changed = np.flatnonzero(tiers != self._tiers)
+        if len(changed):
+            upgraded = changed[tiers[changed] == FULL]
+            self._catch_up(upgraded)
+            self._updated_at[changed[tiers[changed] == COARSE]] = self._time
+        self._tiers = tiers
+
+        full = tiers == FULL
+        if full.all():
+            self._fleet.step(time_delta)
+        elif full.any():
+            self._fleet.step(time_delta, full)
+        self._time += time_delta
+
+        # Лодка i досчитывается на шагах, где (i + номер шага) делится на stride
+        candidates = np.arange((-self._ticks) % self._stride, len(tiers), self._stride)
+        self._catch_up(candidates[tiers[candidates] == COARSE])
+        self._ticks += 1
@@ -0,0 +1,152 @@
+"""
+Профилировщик движения лодок: время по фазам move, число вызовов, число шагов каждой лодки.
+Пока профилировщик не включён, методы лодок не изменены и никаких накладных расходов нет:
+на время работы контекстного менеджера методы классов подменяются замеряющими обёртками.
+
+Запуск сценария из командной строки: python MoveProfiler.py --help
+"""
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from Boat import Boat
+from RowingBoat import RowingBoat
+
+# Замеряемые методы и свойства (для свойств замеряется сеттер)
+_TARGETS = (
+    (Boat, "move"),
+    (Boat, "simulate"),
+    (Boat, "_update_speed"),
+    (Boat, "_update_direction"),
+    (Boat, "_update_position"),
+    (RowingBoat, "move"),
+    (RowingBoat, "_update_rowing_rates"),
+    (RowingBoat, "rotation"),
+    (RowingBoat, "acceleration"),
+    (RowingBoat, "rowing_rate"),
+)
+
+
+class PhaseStats(NamedTuple):
+    calls: int
+    total_time: float  # с, включая вложенные фазы
+    self_time: float  # с, без вложенных фаз
+
+
+class MoveProfiler:
+    """Контекстный менеджер, замеряющий фазы движения всех лодок внутри блока with"""
+
+    def __init__(self):
+        self._originals = []
+        self._stack: List[list] = []  # [имя фазы, время начала, время вложенных фаз]
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._total: Dict[str, float] = defaultdict(float)
+        self._self: Dict[str, float] = defaultdict(float)
+        self._stacks: Dict[str, float] = defaultdict(float)
+        self._boat_steps: Dict[Boat, int] = defaultdict(int)
+
+    def __enter__(self) -> "MoveProfiler":
+        for cls, name in _TARGETS:
+            original = cls.__dict__[name]
+            self._originals.append((cls, name, original))
+            label = f"{cls.__name__}.{name}"
+            if isinstance(original, property):
+                wrapped = property(original.fget, self._wrap(label + ".setter", original.fset),
+                                   original.fdel, original.__doc__)
+            elif name == "move":
+                wrapped = self._wrap(label, original, count_steps=True)
+            else:
+                wrapped = self._wrap(label, original)
+            setattr(cls, name, wrapped)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    def _wrap(self, label: str, function, count_steps: bool = False):
+        stack = self._stack
+        perf_counter = time.perf_counter
+
+        def measured(boat, *args, **kwargs):
+            if count_steps and not (stack and stack[-1][0].endswith(".move")):
+                # super().move() у подкласса - тот же шаг
+                self._boat_steps[boat] += 1
+            frame = [label, perf_counter(), 0.0]
+            stack.append(frame)
+            try:
+                return function(boat, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - frame[1]
+                path = ";".join(entry[0] for entry in stack)
+                stack.pop()
+                if stack:
+                    stack[-1][2] += elapsed
+                self._calls[label] += 1
+                self._total[label] += elapsed
+                self._self[label] += elapsed - frame[2]
+                self._stacks[path] += elapsed - frame[2]
+
+        measured.__name__ = function.__name__
+        measured.__doc__ = function.__doc__
+        return measured
+
+    @property
+    def phases(self) -> Dict[str, PhaseStats]:
+        """Статистика по фазам"""
+        return {label: PhaseStats(self._calls[label], self._total[label], self._self[label]) for label in self._calls}
+
+    @property
+    def boat_steps(self) -> Dict[Boat, int]:
+        """Число вызовов move у каждой лодки"""
+        return dict(self._boat_steps)
+
+    def report(self) -> str:
+        """Таблица фаз, отсортированная по собственному времени"""
+        lines = [f"{'фаза':<40} {'вызовов':>10} {'всего, мс':>11} {'своё, мс':>11} {'своё, %':>8}"]
+        overall = sum(self._self.values()) or 1.0
+        for label, stats in sorted(self.phases.items(), key=lambda item: -item[1].self_time):
+            lines.append(f"{label:<40} {stats.calls:>10} {stats.total_time * 1e3:>11.2f} "
+                         f"{stats.self_time * 1e3:>11.2f} {stats.self_time / overall * 100:>8.1f}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Стеки в свёрнутом формате flamegraph.pl: 'фаза;вложенная фаза собственное_время_в_мкс'"""
+        return "\n".join(f"{path} {round(seconds * 1e6)}" for path, seconds in sorted(self._stacks.items()))
+
+
+def run_scenario(boats: int, steps: int, time_delta: float, seed: int = 0) -> MoveProfiler:
+    """Двигает boats лодок steps шагов, время от времени меняя управление, и возвращает профиль"""
+    rng = random.Random(seed)
+    fleet = [RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(boats)]
+    with MoveProfiler() as profiler:
+        for step in range(steps):
+            for boat in fleet:
+                if rng.random() < 0.1:
+                    boat.acceleration = rng.uniform(-1, 1)
+                    boat.rotation = rng.uniform(-1, 1)
+                boat.move(time_delta)
+    return profiler
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Профиль фаз движения вёсельных лодок")
+    parser.add_argument("--boats", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--dt", type=float, default=0.1)
+    parser.add_argument("--collapsed", help="файл для стеков в формате flamegraph.pl")
+    args = parser.parse_args(argv)
+
+    profiler = run_scenario(args.boats, args.steps, args.dt)
+    print(profiler.report())
+    if args.collapsed:
+        with open(args.collapsed, "w") as file:
+            file.write(profiler.collapsed() + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,182 @@
+"""
+Перебор параметров RowingBoat с параллельной симуляцией в пуле процессов.
+Запуск из командной строки: python ParameterSweep.py --help
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from RowingBoat import RowingBoat
+
+# Параметры стандартной лодки, которые не задаются перебором
+DEFAULTS = {
+    "max_weight": 500.0,
+    "weight": 300.0,
+    "number_of_rowers": 4,
+    "max_rowing_frequency": 2.0,
+    "max_speed": 10.0,
+    "max_rotation": 90.0,
+    "rower_force": 150.0,
+}
+
+# Доля предельной скорости, по достижении которой скорость считается максимальной
+MAX_SPEED_FRACTION = 0.99
+
+
+class SweepResult(NamedTuple):
+    """Результат симуляции одной конфигурации"""
+
+    config: Dict[str, float]
+    time_to_max_speed: float  # с, inf если лодка не разогналась за горизонт симуляции
+    distance: float  # м за горизонт симуляции при полной гребле прямо
+    turning_radius: float  # м при полной гребле с поворотом, inf если лодка не поворачивает
+    error: Optional[str] = None  # Причина, по которой конфигурацию не удалось создать
+
+
+def grid(**values: Sequence[float]) -> Iterator[Dict[str, float]]:
+    """Все сочетания перечисленных значений параметров"""
+    names = list(values)
+    for combination in itertools.product(*(values[name] for name in names)):
+        yield dict(zip(names, combination))
+
+
+def random_samples(count: int, seed: int = 0, **ranges: Tuple[float, float]) -> Iterator[Dict[str, float]]:
+    """count случайных конфигураций, параметры равномерно распределены в заданных диапазонах"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {name: _cast(name, rng.uniform(low, high)) for name, (low, high) in ranges.items()}
+
+
+def latin_hypercube(count: int, seed: int = 0, **ranges: Tuple[float, float]) -> Iterator[Dict[str, float]]:
+    """
+    count конфигураций латинского гиперкуба: диапазон каждого параметра делится на count равных полос,
+    и в каждую полосу попадает ровно одна конфигурация
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name, (low, high) in ranges.items():
+        strata = list(range(count))
+        rng.shuffle(strata)
+        columns[name] = [low + (high - low) * (stratum + rng.random()) / count for stratum in strata]
+    for index in range(count):
+        yield {name: _cast(name, column[index]) for name, column in columns.items()}
+
+
+def _cast(name: str, value: float):
+    """Число гребцов - целое, остальные параметры - вещественные"""
+    return round(value) if name == "number_of_rowers" else value
+
+
+def evaluate(config: Dict[str, float],
+             horizon: float = 600.0,
+             time_delta: float = 1.0,
+             rotation: float = 0.5) -> SweepResult:
+    """Симулирует одну конфигурацию на горизонте horizon секунд"""
+    try:
+        straight = RowingBoat(**{**DEFAULTS, **config})
+        turning = RowingBoat(**{**DEFAULTS, **config})
+    except ValueError as error:
+        return SweepResult(config, math.inf, 0.0, math.inf, str(error))
+
+    n_steps = max(1, round(horizon / time_delta))
+    straight.acceleration = 1.0
+    trajectory = straight.simulate(n_steps, time_delta, trajectory=True)
+    target = MAX_SPEED_FRACTION * straight._max_speed
+    reached = (step for step, (_, _, speed, _) in enumerate(trajectory) if speed >= target and speed > 0)
+    time_to_max_speed = (next(reached, math.inf) + 1) * time_delta
+    x, y = straight.position
+
+    turning.acceleration = 1.0
+    turning.rotation = rotation
+    turning.simulate(n_steps, time_delta)
+    turn_rate = math.radians(abs(turning._get_turn_rate()))
+    turning_radius = abs(turning.speed) / turn_rate if turn_rate and turning.speed else math.inf
+
+    return SweepResult(config, time_to_max_speed, math.hypot(x, y), turning_radius)
+
+
+def _evaluate_chunk(configs: List[Dict[str, float]], horizon: float, time_delta: float,
+                    rotation: float) -> List[SweepResult]:
+    """Симулирует пачку конфигураций в процессе-исполнителе"""
+    return [evaluate(config, horizon, time_delta, rotation) for config in configs]
+
+
+def run_sweep(configs: Iterable[Dict[str, float]],
+              horizon: float = 600.0,
+              time_delta: float = 1.0,
+              rotation: float = 0.5,
+              workers: Optional[int] = None,
+              chunk_size: int = 64) -> Iterator[SweepResult]:
+    """
+    Распределяет конфигурации пачками по chunk_size между процессами и отдаёт результаты по мере готовности.
+    Порядок результатов не гарантируется. Одновременно в работе не больше двух пачек на процесс,
+    поэтому перебор может быть сколь угодно длинным генератором.
+    """
+    configs = iter(configs)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * workers
+        pending = set()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(configs, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(_evaluate_chunk, chunk, horizon, time_delta, rotation))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _parse_values(text: str) -> Tuple[str, List[float]]:
+    name, _, values = text.partition("=")
+    return name, [_cast(name, float(value)) for value in values.split(",")]
+
+
+def _parse_range(text: str) -> Tuple[str, Tuple[float, float]]:
+    name, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    return name, (float(low), float(high))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Перебор параметров вёсельной лодки")
+    parser.add_argument("--grid", action="append", default=[], type=_parse_values, metavar="NAME=V1,V2,...",
+                        help="значения параметра для перебора по сетке")
+    parser.add_argument("--range", action="append", default=[], type=_parse_range, metavar="NAME=LOW:HIGH",
+                        help="диапазон параметра для случайной выборки")
+    parser.add_argument("--sampler", choices=("random", "lhs"), default="lhs")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--horizon", type=float, default=600.0)
+    parser.add_argument("--dt", type=float, default=1.0)
+    parser.add_argument("--rotation", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        configs = grid(**dict(args.grid))
+    else:
+        sampler = latin_hypercube if args.sampler == "lhs" else random_samples
+        configs = sampler(args.samples, args.seed, **dict(args.range))
+
+    names = sorted({name for name, _ in args.grid} | {name for name, _ in args.range})
+    writer = csv.writer(sys.stdout)
+    writer.writerow(names + ["time_to_max_speed", "distance", "turning_radius", "error"])
+    for result in run_sweep(configs, args.horizon, args.dt, args.rotation, args.workers, args.chunk_size):
+        writer.writerow([result.config[name] for name in names] +
+                        [result.time_to_max_speed, result.distance, result.turning_radius, result.error or ""])
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
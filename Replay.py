@@ -0,0 +1,167 @@
+"""
+Повтор записанных журналов управления на новой версии модели.
+
+Журнал - двоичный файл: заголовок (сигнатура, версия формата, шаг симуляции в с) и записи
+(номер шага, номер лодки, acceleration, rotation), упорядоченные по номеру шага. Управление с номером t
+применяется перед шагом t. Журнал читается потоком, так что память не зависит от его длины,
+а шаги выполняются подряд, без привязки к реальному времени.
+"""
+import struct
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+
+_HEADER = struct.Struct("<4sId")
+_MAGIC = b"BCTL"
+_VERSION = 1
+_RECORD = struct.Struct("<QIdd")
+
+# Поля состояния, которые сравниваются с эталонной траекторией (см. TrajectoryRecorder.RECORD_DTYPE)
+COMPARED_FIELDS = ("x", "y", "speed", "direction")
+
+Target = Union[RowingBoat, Sequence[RowingBoat], BoatFleet]
+
+
+class ControlRecord(NamedTuple):
+    tick: int
+    boat: int
+    acceleration: float
+    rotation: float
+
+
+class Divergence(NamedTuple):
+    """Первое расхождение повтора с эталоном"""
+
+    tick: int
+    boat: int
+    field: str
+    expected: float
+    actual: float
+
+
+class ControlLogWriter:
+    """Пишет журнал управления. Записи должны идти по неубыванию номера шага"""
+
+    def __init__(self, path: str, time_step: float):
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, time_step))
+
+    def __enter__(self) -> "ControlLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, tick: int, boat: int, acceleration: float, rotation: float) -> None:
+        self._file.write(_RECORD.pack(tick, boat, acceleration, rotation))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ControlLog:
+    """Журнал управления на диске. Каждый проход по журналу заново читает файл пачками по chunk_size записей"""
+
+    def __init__(self, path: str, chunk_size: int = 4096):
+        self._path = path
+        self._chunk_size = chunk_size
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Файл {path} не является журналом управления")
+        magic, version, self.time_step = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Файл {path} не является журналом управления поддерживаемой версии")
+
+    def __iter__(self) -> Iterator[ControlRecord]:
+        with open(self._path, "rb") as file:
+            file.seek(_HEADER.size)
+            while True:
+                chunk = file.read(self._chunk_size * _RECORD.size)
+                if not chunk:
+                    return
+                if len(chunk) % _RECORD.size:
+                    raise ValueError(f"Журнал управления {self._path} обрезан")
+                for record in _RECORD.iter_unpack(chunk):
+                    yield ControlRecord._make(record)
+
+
+def _driver(target: Target) -> Tuple[Callable[[List[int], List[float], List[float]], None], Callable[[float], None]]:
+    """Функции применения управления и шага для лодки, списка лодок или флота"""
+    if isinstance(target, BoatFleet):
+        return target.set_controls, target.step
+    boats = [target] if isinstance(target, RowingBoat) else list(target)
+
+    def apply(ids, accelerations, rotations):
+        for boat_id, acceleration, rotation in zip(ids, accelerations, rotations):
+            boat = boats[boat_id]
+            boat.acceleration = acceleration
+            boat.rotation = rotation
+
+    def step(time_delta):
+        for boat in boats:
+            boat.move(time_delta)
+
+    return apply, step
+
+
+def _state(target: Target, field: str) -> np.ndarray:
+    if isinstance(target, BoatFleet):
+        return getattr(target, field)
+    boats = [target] if isinstance(target, RowingBoat) else target
+    if field in ("x", "y"):
+        axis = 0 if field == "x" else 1
+        return np.array([boat.position[axis] for boat in boats])
+    return np.array([getattr(boat, field) for boat in boats])
+
+
+def replay(target: Target, controls: Iterable[ControlRecord], time_step: float,
+           ticks: Optional[int] = None) -> Iterator[int]:
+    """
+    Продвигает лодку, список лодок (номер лодки - индекс в списке) или флот по журналу управления.
+    После каждого шага отдаёт его номер, так что вызывающий может проверить состояние или остановиться.
+    Без ticks шаги идут, пока в журнале есть управление; с ticks выполняется ровно ticks шагов.
+    """
+    apply, step = _driver(target)
+    records = iter(controls)
+    pending = next(records, None)
+    tick = 0
+    while (pending is not None) if ticks is None else (tick < ticks):
+        ids, accelerations, rotations = [], [], []
+        while pending is not None and pending.tick <= tick:
+            if pending.tick < tick:
+                raise ValueError(f"Журнал управления не упорядочен: запись шага {pending.tick} после шага {tick}")
+            ids.append(pending.boat)
+            accelerations.append(pending.acceleration)
+            rotations.append(pending.rotation)
+            pending = next(records, None)
+        if ids:
+            apply(ids, accelerations, rotations)
+        step(time_step)
+        yield tick
+        tick += 1
+
+
+def find_divergence(target: Target, controls: Iterable[ControlRecord], time_step: float,
+                    references: Sequence[np.ndarray], tolerance: float) -> Optional[Divergence]:
+    """
+    Повторяет журнал и сравнивает состояние после каждого шага с эталонными траекториями
+    (по одной на лодку, например из read_trajectory). Останавливается на первом расхождении больше tolerance
+    и возвращает его; None - повтор совпал с эталоном на всей его длине.
+    """
+    length = min((len(reference) for reference in references), default=0)
+    for tick in replay(target, controls, time_step, ticks=length):
+        for field in COMPARED_FIELDS:
+            expected = np.array([reference[field][tick] for reference in references])
+            actual = _state(target, field)
+            error = np.abs(actual - expected)
+            if field == "direction":
+                error = np.minimum(error, 360.0 - error)
+            diverged = np.flatnonzero(~(error <= tolerance))
+            if diverged.size:
+                boat = int(diverged[0])
+                return Divergence(tick, boat, field, float(expected[boat]), float(actual[boat]))
+    return None
@@ -1,11 +1,92 @@
-from typing import Tuple
+from __future__ import annotations
 
-from Boat import Boat
+from collections.abc import Mapping
+
+from Boat import Boat, _check_number, motion_coefficients
+from BoatState import BoatState
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, List, Sequence, Tuple, Union
+
+# Параметры конструктора RowingBoat по порядку: имя, допустим ли ноль, должно ли значение быть целым
+_PARAMETERS = (
+    ("max_weight", False, False),
+    ("weight", False, False),
+    ("number_of_rowers", True, True),
+    ("max_rowing_frequency", True, False),
+    ("max_speed", True, False),
+    ("max_rotation", True, False),
+    ("rower_force", True, False),
+)
+
+# Сколько ошибок перечисляется в тексте InvalidBoatParameters
+_MAX_REPORTED_ERRORS = 20
+
+
+def _clamp(value: float) -> float:
+    """Ограничивает значение диапазоном [-1, 1]"""
+    return max(-1.0, min(1.0, value))
+
+
+class InvalidBoatParameters(ValueError):
+    """Ошибка пакетного создания лодок. errors - все недопустимые значения: (номер строки, параметр, значение)"""
+
+    def __init__(self, errors: List[Tuple[int, str, object]]):
+        self.errors = errors
+        lines = [f"строка {row}: {name} = {value!r}" for row, name, value in errors[:_MAX_REPORTED_ERRORS]]
+        if len(errors) > _MAX_REPORTED_ERRORS:
+            lines.append(f"... и ещё {len(errors) - _MAX_REPORTED_ERRORS}")
+        rows = len({row for row, _, _ in errors})
+        super().__init__(f"Недопустимые параметры у лодок ({rows}):\n" + "\n".join(lines))
+
+
+def _is_valid(value, allow_zero: bool, integer: bool) -> bool:
+    """Те же правила, что у проверок в конструкторе, но без исключения"""
+    if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+        return False
+    return not (value < 0 or (not allow_zero and value == 0))
+
+
+def _column_errors(column, allow_zero: bool, integer: bool) -> List[Tuple[int, object]]:
+    """Недопустимые значения колонки: (номер строки, значение)"""
+    kind = getattr(getattr(column, "dtype", None), "kind", None)
+    if kind in ("i", "u") or (kind == "f" and not integer):
+        # Числовой массив NumPy проверяется целиком, без обхода элементов
+        invalid = column < 0 if allow_zero else column <= 0
+        return [(row, column[row].item()) for row in invalid.nonzero()[0].tolist()]
+    # Обычный случай - все значения допустимы - проверяется встроенными функциями, без обхода в Python
+    types = set(map(type, column))
+    if types and types <= ({int} if integer else {int, float}):
+        smallest = min(column)
+        if smallest > 0 or (allow_zero and smallest == 0):
+            return []
+    return [(row, value) for row, value in enumerate(column) if not _is_valid(value, allow_zero, integer)]
+
+
+def _validate_columns(columns: Sequence) -> List[list]:
+    """
+    Проверяет колонки параметров в порядке _PARAMETERS и возвращает их в виде списков.
+    Ошибки всех строк собираются в одно исключение InvalidBoatParameters.
+    """
+    lengths = {len(column) for column in columns}
+    if len(lengths) > 1:
+        raise ValueError(f"Колонки параметров разной длины: {sorted(lengths)}")
+    errors = []
+    for (name, allow_zero, integer), column in zip(_PARAMETERS, columns):
+        errors.extend((row, name, value) for row, value in _column_errors(column, allow_zero, integer))
+    if errors:
+        errors.sort(key=lambda error: error[0])
+        raise InvalidBoatParameters(errors)
+    return [column.tolist() if hasattr(column, "tolist") else list(column) for column in columns]
 
 
 class RowingBoat(Boat):
     """Класс вёсельной лодки"""
 
+    __slots__ = ("_rowers_count", "_max_rowing_frequency", "_rowing_frequency",
+                 "_left_rowing_rate", "_right_rowing_rate")
+
     def __init__(self,
                  max_weight: float, # кг
                  weight: float, # кг
@@ -14,13 +95,58 @@ class RowingBoat(Boat):
                  max_speed: float, # Предельная скорость лодки
                  max_rotation: float, # Предельные обороты в секунду вокруг своей оси
                  rower_force: float): # Сила одного гребца
-        super().__init__(max_weight, weight, max_speed, max_rotation, rower_force * number_of_rowers)
+        if isinstance(number_of_rowers, bool) or not isinstance(number_of_rowers, int):
+            raise ValueError(f"Параметр number_of_rowers должен быть целым числом, получено: {number_of_rowers!r}")
+        _check_number("number_of_rowers", number_of_rowers)
+        _check_number("max_rowing_frequency", max_rowing_frequency)
+        _check_number("rower_force", rower_force)
+        _check_number("max_weight", max_weight, allow_zero=False)
+        _check_number("weight", weight, allow_zero=False)
+        _check_number("max_speed", max_speed)
+        _check_number("max_rotation", max_rotation)
+        self._init_unchecked(max_weight, weight, number_of_rowers, max_rowing_frequency,
+                             max_speed, max_rotation, rower_force)
+
+    def _init_unchecked(self, max_weight, weight, number_of_rowers, max_rowing_frequency,
+                        max_speed, max_rotation, rower_force) -> None:
+        # Нужны Boat._init_unchecked для расчёта коэффициентов движения
         self._rowers_count = number_of_rowers
         self._max_rowing_frequency = max_rowing_frequency
+        super()._init_unchecked(max_weight, weight, max_speed, max_rotation, rower_force * number_of_rowers)
         self._rowing_frequency = max_rowing_frequency * self._acceleration
         self._left_rowing_rate = 0.0
         self._right_rowing_rate = 0.0
 
+    @classmethod
+    def from_arrays(cls, max_weight, weight, number_of_rowers, max_rowing_frequency,
+                    max_speed, max_rotation, rower_force) -> List[RowingBoat]:
+        """
+        Создаёт лодки из колонок параметров (списков или массивов NumPy одинаковой длины), по лодке на строку.
+        Колонки проверяются целиком; если есть недопустимые значения, InvalidBoatParameters перечисляет все.
+        """
+        columns = _validate_columns((max_weight, weight, number_of_rowers, max_rowing_frequency,
+                                     max_speed, max_rotation, rower_force))
+        boats = []
+        for parameters in zip(*columns):
+            boat = cls.__new__(cls)
+            boat._init_unchecked(*parameters)
+            boats.append(boat)
+        return boats
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[Mapping, Sequence]]) -> List[RowingBoat]:
+        """
+        Создаёт лодки из записей: словарей с именами параметров конструктора
+        или последовательностей значений в порядке его аргументов. Проверка - как у from_arrays.
+        """
+        names = [name for name, _, _ in _PARAMETERS]
+        rows = [[record[name] for name in names] if isinstance(record, Mapping) else list(record)
+                for record in records]
+        for index, row in enumerate(rows):
+            if len(row) != len(names):
+                raise ValueError(f"В записи {index} {len(row)} значений вместо {len(names)}")
+        return cls.from_arrays(*(zip(*rows) if rows else [()] * len(names)))
+
     @property
     def rowing_rate(self) -> Tuple[float, float]:
         """Возвращает кортеж в формате: (интенсивность гребли слева, интенсивность гребли справа)"""
@@ -29,7 +155,13 @@ class RowingBoat(Boat):
     @rowing_rate.setter
     def rowing_rate(self, value: Tuple[float, float]) -> None:
         """Устанавливает новые интенсивности гребли слева и справа"""
-        pass
+        left, right = value
+        self._left_rowing_rate = _clamp(float(left))
+        self._right_rowing_rate = _clamp(float(right))
+        self._acceleration = (self._left_rowing_rate + self._right_rowing_rate) / 2
+        self._rotation = (self._right_rowing_rate - self._left_rowing_rate) / 2
+        self._rowing_frequency = self._max_rowing_frequency * self._acceleration
+        self._wake()
 
     @property
     def rotation(self) -> float:
@@ -44,7 +176,9 @@ class RowingBoat(Boat):
         При значениях по модулю от (0 до 0.5] гребцы с противоположной стороны постепенно прекращают грести
         При значениях по модулю от (0.5 до 1] гребцы с противоположной стороны начинают грести в обратную сторону
         """
-        pass
+        self._rotation = _clamp(float(new_rotation))
+        self._update_rowing_rates()
+        self._wake()
 
     @property
     def acceleration(self) -> float:
@@ -59,10 +193,81 @@ class RowingBoat(Boat):
         0 для прекращения гребли
         (0, 1] для движения вперед
         """
-        pass
+        self._acceleration = _clamp(float(new_acceleration))
+        self._rowing_frequency = self._max_rowing_frequency * self._acceleration
+        self._update_rowing_rates()
+        self._wake()
 
     def move(self, time_delta: float) -> None:
         """Обновить движение лодки на основе текущих мощности и вращения"""
 
         # Вызываем базовую реализацию для обновления позиции
         super().move(time_delta)
+
+    def get_state(self) -> BoatState:
+        """Возвращает неизменяемый снимок текущего состояния лодки"""
+        x, y = self._position
+        return BoatState(self.max_weight, self._weight, self._max_speed, self._max_rotation, self._max_force,
+                         self._rowers_count, self._max_rowing_frequency, self._acceleration, self._rotation,
+                         self._rowing_frequency, self._left_rowing_rate, self._right_rowing_rate,
+                         self._speed, self._direction, x, y, self._is_afloat)
+
+    def set_state(self, state: BoatState) -> None:
+        """Восстанавливает состояние лодки из снимка"""
+        (self.max_weight, self._weight, self._max_speed, self._max_rotation, self._max_force,
+         self._rowers_count, self._max_rowing_frequency, self._acceleration, self._rotation,
+         self._rowing_frequency, self._left_rowing_rate, self._right_rowing_rate,
+         self._speed, self._direction, x, y, self._is_afloat) = state
+        self._position = (x, y)
+        self._update_coefficients()
+        if self._spatial_index is not None:
+            self._spatial_index.update(self, self._position)
+        self._wake()
+
+    @classmethod
+    def from_state(cls, state: BoatState) -> "RowingBoat":
+        """Создаёт лодку из снимка без повторной проверки параметров"""
+        boat = cls.__new__(cls)
+        boat._reset_hooks()
+        boat.set_state(state)
+        return boat
+
+    def _apply_controls(self, acceleration: float, rotation: float) -> None:
+        self.acceleration = acceleration
+        self.rotation = rotation
+
+    def _update_rowing_rates(self) -> None:
+        """
+        Пересчитывает интенсивности гребли слева и справа из ускорения и поворота.
+        При нулевом ускорении лодка разворачивается на месте: гребцы гребут с интенсивностью поворота.
+        """
+        base = self._acceleration
+        rotation = self._rotation
+        if base == 0.0:
+            base = abs(rotation)
+        opposite = base * (1.0 - 2.0 * abs(rotation))
+        if rotation > 0:
+            self._left_rowing_rate, self._right_rowing_rate = opposite, base
+        elif rotation < 0:
+            self._left_rowing_rate, self._right_rowing_rate = base, opposite
+        else:
+            self._left_rowing_rate = self._right_rowing_rate = base
+
+    def _can_row(self) -> bool:
+        """Могут ли гребцы вообще развивать усилие"""
+        return self._max_force > 0 and self._max_rowing_frequency > 0
+
+    def _update_coefficients(self) -> None:
+        self._coefficients = motion_coefficients(self._weight, self._max_speed, self._max_force,
+                                                 self._max_rotation / 2, self._can_row())
+
+    def _get_effort(self) -> float:
+        return (self._left_rowing_rate + self._right_rowing_rate) / 2
+
+    def _get_turn_command(self) -> float:
+        return self._right_rowing_rate - self._left_rowing_rate
+
+    def _get_thrust(self) -> float:
+        if not self._can_row():
+            return 0.0
+        return self._max_force * self._get_effort()
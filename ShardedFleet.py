@@ -0,0 +1,294 @@
+"""
+Флот, разделённый на полосы по оси x между процессами-исполнителями.
+
+Каждый исполнитель хранит свою полосу как BoatFleet и продвигает её сам; координатор шагает всеми полосами
+одновременно, после шага пересылает лодки, пересёкшие границы полос, их новым владельцам
+и для поиска соседей собирает с исполнителей только лодки у краёв полос.
+
+Исполнители подключаются к координатору через multiprocessing.connection, поэтому могут работать на других машинах:
+    python ShardedFleet.py HOST:PORT --authkey KEY
+Лодка однозначно обозначается своим номером во флоте, переданном координатору.
+"""
+import argparse
+import os
+import socket
+import sys
+from multiprocessing import Process
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+
+Rows = Dict[str, np.ndarray]  # Строки флота по колонкам, как у BoatFleet._take, плюс колонка "id"
+
+
+class _Shard:
+    """Полоса [lower, upper) по оси x на стороне исполнителя"""
+
+    def __init__(self):
+        self.fleet = BoatFleet()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.lower = -np.inf
+        self.upper = np.inf
+        self.ghosts = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+    def load(self, rows: Rows, lower: float, upper: float) -> None:
+        self.fleet = BoatFleet(len(rows["id"]))
+        self.ids = np.empty(0, dtype=np.int64)
+        self.lower, self.upper = lower, upper
+        self.immigrate(rows)
+
+    def immigrate(self, rows: Rows) -> None:
+        self.ids = np.concatenate([self.ids, rows.pop("id")])
+        self.fleet._append(rows)
+
+    def step(self, time_delta: float) -> Rows:
+        """Шаг полосы; возвращает и удаляет лодки, покинувшие полосу"""
+        self.fleet.step(time_delta)
+        x = self.fleet.x
+        leaving = np.flatnonzero((x < self.lower) | (x >= self.upper))
+        emigrants = self.fleet._take(leaving)
+        emigrants["id"] = self.ids[leaving]
+        if len(leaving):
+            holes, fillers = self.fleet._delete(leaving)
+            self.ids[holes] = self.ids[fillers]
+            self.ids = self.ids[:len(self.fleet)]
+        return emigrants
+
+    def set_controls(self, ids: np.ndarray, acceleration, rotation) -> None:
+        """Управление для лодок с номерами ids; лодки других полос пропускаются"""
+        owned = np.isin(ids, self.ids)
+        if not owned.any():
+            return
+        order = np.argsort(self.ids)
+        rows = order[np.searchsorted(self.ids, ids[owned], sorter=order)]
+        if acceleration is not None and np.ndim(acceleration):
+            acceleration = acceleration[owned]
+        if rotation is not None and np.ndim(rotation):
+            rotation = rotation[owned]
+        self.fleet.set_controls(rows, acceleration, rotation)
+
+    def boundary(self, width: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Лодки ближе width к краям полосы: (номера, x, y)"""
+        x = self.fleet.x
+        near = (x < self.lower + width) | (x >= self.upper - width)
+        return self.ids[near], x[near], self.fleet.y[near]
+
+    def query_radius(self, center: Tuple[float, float], radius: float) -> np.ndarray:
+        ghost_ids, ghost_x, ghost_y = self.ghosts
+        ids = np.concatenate([self.ids, ghost_ids])
+        x = np.concatenate([self.fleet.x, ghost_x]) - center[0]
+        y = np.concatenate([self.fleet.y, ghost_y]) - center[1]
+        return ids[x * x + y * y <= radius * radius]
+
+    def collect(self) -> Rows:
+        rows = self.fleet._take(slice(None))
+        rows["id"] = self.ids.copy()
+        return rows
+
+
+def _serve(connection: Connection) -> None:
+    """Цикл исполнителя: выполняет команды координатора, пока тот не пришлёт close"""
+    shard = _Shard()
+    while True:
+        command, *args = connection.recv()
+        if command == "close":
+            break
+        elif command == "load":
+            shard.load(*args)
+        elif command == "immigrate":
+            shard.immigrate(*args)
+        elif command == "step":
+            connection.send(shard.step(*args))
+        elif command == "set_controls":
+            shard.set_controls(*args)
+        elif command == "boundary":
+            connection.send(shard.boundary(*args))
+        elif command == "ghosts":
+            shard.ghosts = args[0]
+        elif command == "query_radius":
+            connection.send(shard.query_radius(*args))
+        elif command == "collect":
+            connection.send(shard.collect())
+        elif command == "size":
+            connection.send(len(shard.fleet))
+    connection.close()
+
+
+def _disable_nagle(connection: Connection) -> None:
+    """
+    Отключает алгоритм Нейгла: команды без ответа, идущие подряд (например, immigrate и step),
+    иначе задерживаются до подтверждения предыдущей - на десятки миллисекунд.
+    """
+    with socket.socket(fileno=os.dup(connection.fileno())) as sock:
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes) -> None:
+    """Подключается к координатору по address и обслуживает одну полосу"""
+    with Client(address, authkey=authkey) as connection:
+        _disable_nagle(connection)
+        _serve(connection)
+
+
+def _concatenate(parts: Sequence[Rows]) -> Rows:
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _select(rows: Rows, mask: np.ndarray) -> Rows:
+    return {name: column[mask] for name, column in rows.items()}
+
+
+class ShardedFleet:
+    """
+    Координатор флота, разделённого на workers полос по оси x.
+    Границы полос - квантили начальных координат x, если не заданы явно списком из workers - 1 возрастающих значений.
+    По умолчанию исполнители запускаются локальными процессами; с spawn=False координатор ждёт workers
+    подключений на address (см. run_worker и запуск модуля из командной строки).
+    Поиск соседей с радиусом не больше ghost_width учитывает лодки соседних полос.
+    """
+
+    def __init__(self,
+                 boats: Union[BoatFleet, Iterable[RowingBoat]],
+                 workers: int = 2,
+                 bounds: Optional[Sequence[float]] = None,
+                 ghost_width: float = 50.0,
+                 address: Tuple[str, int] = ("127.0.0.1", 0),
+                 authkey: Optional[bytes] = None,
+                 spawn: bool = True):
+        if workers < 1:
+            raise ValueError(f"Недопустимое число исполнителей: {workers!r}")
+        fleet = boats if isinstance(boats, BoatFleet) else BoatFleet.from_boats(boats)
+        rows = fleet._take(slice(None))
+        rows["id"] = np.arange(len(fleet), dtype=np.int64)
+        if bounds is None:
+            bounds = np.quantile(rows["x"], np.arange(1, workers) / workers) if len(fleet) else np.zeros(workers - 1)
+        if len(bounds) != workers - 1 or np.any(np.diff(bounds) < 0):
+            raise ValueError("Границы полос должны быть возрастающим списком из workers - 1 значений")
+        self._bounds = np.asarray(bounds, dtype=np.float64)
+        self._size = len(fleet)
+        self._ghost_width = ghost_width
+        self._ghosts_valid = False
+
+        authkey = authkey if authkey is not None else os.urandom(16)
+        self._processes: List[Process] = []
+        with Listener(address, backlog=workers, authkey=authkey) as listener:
+            if spawn:
+                for _ in range(workers):
+                    process = Process(target=run_worker, args=(listener.address, authkey), daemon=True)
+                    process.start()
+                    self._processes.append(process)
+            self._connections = [listener.accept() for _ in range(workers)]
+        for connection in self._connections:
+            _disable_nagle(connection)
+
+        edges = np.concatenate([[-np.inf], self._bounds, [np.inf]])
+        owners = self._owners(rows["x"])
+        for shard, connection in enumerate(self._connections):
+            connection.send(("load", _select(rows, owners == shard), edges[shard], edges[shard + 1]))
+
+    def __enter__(self) -> "ShardedFleet":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _owners(self, x: np.ndarray) -> np.ndarray:
+        """Номер полосы для каждой координаты x"""
+        return np.searchsorted(self._bounds, x, side="right")
+
+    def shard_sizes(self) -> List[int]:
+        """Число лодок в каждой полосе"""
+        for connection in self._connections:
+            connection.send(("size",))
+        return [connection.recv() for connection in self._connections]
+
+    def step(self, time_delta: float) -> None:
+        """Продвигает все полосы на time_delta и переселяет лодки, пересёкшие границы"""
+        for connection in self._connections:
+            connection.send(("step", time_delta))
+        emigrants = [connection.recv() for connection in self._connections]
+        moving = [rows for rows in emigrants if len(rows["id"])]
+        if moving:
+            rows = _concatenate(moving)
+            owners = self._owners(rows["x"])
+            for shard in np.unique(owners):
+                self._connections[shard].send(("immigrate", _select(rows, owners == shard)))
+        self._ghosts_valid = False
+
+    def set_controls(self, ids, acceleration=None, rotation=None) -> None:
+        """То же, что BoatFleet.set_controls, для лодок с номерами ids"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size and (ids.min() < 0 or ids.max() >= self._size):
+            raise IndexError(f"В разделённом флоте из {self._size} лодок нет лодок с такими номерами")
+        acceleration = None if acceleration is None else np.asarray(acceleration, dtype=np.float64)
+        rotation = None if rotation is None else np.asarray(rotation, dtype=np.float64)
+        for connection in self._connections:
+            connection.send(("set_controls", ids, acceleration, rotation))
+
+    def _exchange_ghosts(self) -> None:
+        """Раздаёт каждой полосе лодки соседних полос, лежащие не дальше ghost_width от её краёв"""
+        width = self._ghost_width
+        for connection in self._connections:
+            connection.send(("boundary", width))
+        parts = [connection.recv() for connection in self._connections]
+        ids, x, y = (np.concatenate(column) for column in zip(*parts))
+        edges = np.concatenate([[-np.inf], self._bounds, [np.inf]])
+        owners = self._owners(x)
+        for shard, connection in enumerate(self._connections):
+            near = (owners != shard) & (x >= edges[shard] - width) & (x < edges[shard + 1] + width)
+            connection.send(("ghosts", (ids[near], x[near], y[near])))
+        self._ghosts_valid = True
+
+    def query_radius(self, center: Tuple[float, float], radius: float) -> np.ndarray:
+        """Номера лодок не дальше radius от center, по возрастанию"""
+        if radius > self._ghost_width:
+            raise ValueError(f"Радиус поиска {radius!r} больше ширины обмена у границ {self._ghost_width!r}")
+        if not self._ghosts_valid:
+            self._exchange_ghosts()
+        connection = self._connections[int(self._owners(np.array([center[0]]))[0])]
+        connection.send(("query_radius", center, radius))
+        return np.sort(connection.recv())
+
+    def gather(self) -> BoatFleet:
+        """Собирает все полосы в один флот; строки упорядочены по номерам лодок"""
+        for connection in self._connections:
+            connection.send(("collect",))
+        rows = _concatenate([connection.recv() for connection in self._connections])
+        order = np.argsort(rows.pop("id"))
+        fleet = BoatFleet(len(order))
+        fleet._append(_select(rows, order))
+        return fleet
+
+    def close(self) -> None:
+        """Останавливает исполнителей"""
+        for connection in self._connections:
+            try:
+                connection.send(("close",))
+            except OSError:
+                pass
+            connection.close()
+        self._connections = []
+        for process in self._processes:
+            process.join()
+        self._processes = []
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Исполнитель полосы разделённого флота")
+    parser.add_argument("address", help="HOST:PORT координатора")
+    parser.add_argument("--authkey", required=True, help="общий ключ координатора и исполнителей")
+    args = parser.parse_args(argv)
+    host, port = args.address.rsplit(":", 1)
+    run_worker((host, int(port)), args.authkey.encode())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
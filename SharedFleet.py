@@ -0,0 +1,211 @@
+"""
+Флот в блоке multiprocessing.shared_memory: один процесс-симулятор пишет, любые процессы читают без копирования.
+
+Раскладка блока (little-endian):
+    0   4 байта   сигнатура b"BSHM"
+    4   uint32    версия формата
+    8   uint64    ёмкость - число строк в каждой колонке
+    16  uint64    число лодок
+    24  uint64    счётчик seqlock: нечётный, пока симулятор меняет состояние
+    32  uint64    число выполненных шагов
+    40  24 байта  резерв
+    64  колонки BoatFleet в порядке _COLUMNS, каждая на всю ёмкость, значения в типе колонки
+
+Читатель получает согласованный снимок так: запоминает чётный счётчик, копирует колонки и проверяет,
+что счётчик не изменился; иначе повторяет попытку. Писатель увеличивает счётчик до и после изменения.
+"""
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from BoatFleet import BoatFleet, _COLUMNS
+
+_HEADER = struct.Struct("<4sIQQQQ")
+_HEADER_SIZE = 64
+_MAGIC = b"BSHM"
+_VERSION = 1
+# Номера 8-байтовых слов заголовка
+_CAPACITY, _SIZE, _SEQUENCE, _TICKS = 1, 2, 3, 4
+
+DEFAULT_SNAPSHOT_FIELDS = ("x", "y", "speed", "direction")
+
+# Блоки, созданные SharedFleet в этом процессе: их учётом в трекере ресурсов ведает сам SharedFleet
+_OWNED = set()
+
+
+def _layout(capacity: int) -> Dict[str, int]:
+    """Смещение каждой колонки от начала блока"""
+    offsets = {}
+    offset = _HEADER_SIZE
+    for name, dtype, _ in _COLUMNS:
+        offsets[name] = offset
+        offset += -(-capacity * np.dtype(dtype).itemsize // 8) * 8
+    offsets[""] = offset  # Конец последней колонки - размер блока
+    return offsets
+
+
+def _map_columns(buffer, capacity: int) -> Dict[str, np.ndarray]:
+    offsets = _layout(capacity)
+    return {name: np.ndarray(capacity, dtype=np.dtype(dtype).newbyteorder("<"), buffer=buffer, offset=offsets[name])
+            for name, dtype, _ in _COLUMNS}
+
+
+class SharedFleet(BoatFleet):
+    """
+    BoatFleet с колонками в блоке общей памяти фиксированной ёмкости. Создаётся процессом-симулятором.
+    step, set_controls и add сами отмечают изменение счётчиком seqlock; прочие изменения
+    (например, через лодки-представления boat(i)) нужно выполнять внутри with fleet.writing().
+    Блок удаляется при выходе из with или вызовом unlink.
+    """
+
+    def __init__(self, capacity: int = 16, name: Optional[str] = None):
+        capacity = max(1, capacity)
+        self._memory = shared_memory.SharedMemory(name=name, create=True, size=_layout(capacity)[""])
+        self._memory.buf[:_HEADER.size] = _HEADER.pack(_MAGIC, _VERSION, capacity, 0, 0, 0)
+        _OWNED.add(self._memory._name)
+        self._count = 0  # Копия числа лодок из заголовка, чтобы не читать его из общей памяти
+        self._header = np.ndarray(_HEADER_SIZE // 8, dtype="<u8", buffer=self._memory.buf)
+        self._columns = _map_columns(self._memory.buf, capacity)
+        self._columns["is_afloat"][:] = True
+        self._depth = 0
+
+    def __enter__(self) -> "SharedFleet":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        self.unlink()
+
+    @property
+    def name(self) -> str:
+        """Имя блока общей памяти для SharedFleetReader"""
+        return self._memory.name
+
+    @property
+    def _size(self) -> int:
+        return self._count
+
+    @_size.setter
+    def _size(self, size: int) -> None:
+        self._count = size
+        self._header[_SIZE] = size
+
+    @property
+    def ticks(self) -> int:
+        return int(self._header[_TICKS])
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Отмечает изменение состояния: читатели не получат снимок, пока блок with не завершится"""
+        self._depth += 1
+        if self._depth == 1:
+            self._header[_SEQUENCE] += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._header[_SEQUENCE] += 1
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._columns["speed"])
+        if size > capacity:
+            raise ValueError(f"Флот в общей памяти вмещает не больше {capacity} лодок")
+
+    def add(self, boat) -> int:
+        with self.writing():
+            return super().add(boat)
+
+    def _append(self, rows) -> None:
+        with self.writing():
+            super()._append(rows)
+
+    def _delete(self, indices):
+        with self.writing():
+            return super()._delete(indices)
+
+    def set_controls(self, ids, acceleration=None, rotation=None) -> None:
+        with self.writing():
+            super().set_controls(ids, acceleration, rotation)
+
+    def step(self, time_delta: float, mask=None) -> None:
+        with self.writing():
+            super().step(time_delta, mask)
+            self._header[_TICKS] += 1
+
+    def close(self) -> None:
+        """Отключается от блока. Массивы колонок, полученные раньше, становятся недействительными"""
+        self._columns = {}
+        self._header = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Удаляет блок; читатели, уже подключённые к нему, продолжают работать до close"""
+        _OWNED.discard(self._memory._name)
+        self._memory.unlink()
+
+
+class SharedFleetReader:
+    """Подключение к флоту в общей памяти по имени блока, только для чтения"""
+
+    def __init__(self, name: str):
+        if sys.version_info >= (3, 13):
+            self._memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            # Иначе трекер ресурсов удалит чужой блок при завершении процесса-читателя
+            if self._memory._name not in _OWNED:
+                resource_tracker.unregister(self._memory._name, "shared_memory")
+        magic, version, capacity, _, _, _ = _HEADER.unpack_from(self._memory.buf)
+        if magic != _MAGIC or version != _VERSION:
+            self._memory.close()
+            raise ValueError(f"Блок {name!r} не содержит флот поддерживаемой версии")
+        self._header = np.ndarray(_HEADER_SIZE // 8, dtype="<u8", buffer=self._memory.buf)
+        self._columns = _map_columns(self._memory.buf, capacity)
+        for column in self._columns.values():
+            column.flags.writeable = False
+
+    def __enter__(self) -> "SharedFleetReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._header[_SIZE])
+
+    @property
+    def ticks(self) -> int:
+        return int(self._header[_TICKS])
+
+    def view(self, field: str) -> np.ndarray:
+        """Колонка без копирования. Значения могут меняться прямо во время чтения"""
+        return self._columns[field][:len(self)]
+
+    def snapshot(self, fields: Sequence[str] = DEFAULT_SNAPSHOT_FIELDS,
+                 timeout: float = 1.0) -> Dict[str, np.ndarray]:
+        """Согласованные копии колонок fields на один и тот же шаг. Ключ "ticks" - номер этого шага"""
+        header = self._header
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence = int(header[_SEQUENCE])
+            if sequence % 2 == 0:
+                size = int(header[_SIZE])
+                ticks = int(header[_TICKS])
+                copies = {field: self._columns[field][:size].copy() for field in fields}
+                if int(header[_SEQUENCE]) == sequence:
+                    copies["ticks"] = np.array(ticks)
+                    return copies
+            if time.monotonic() > deadline:
+                raise TimeoutError("Симулятор не дал прочитать согласованный снимок")
+            time.sleep(0)
+
+    def close(self) -> None:
+        self._columns = {}
+        self._header = None
+        self._memory.close()
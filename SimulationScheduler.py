@@ -0,0 +1,89 @@
+from typing import Dict
+
+from Boat import Boat
+
+
+class SimulationScheduler:
+    """
+    Часы симуляции с фиксированным шагом.
+    Реальное время накапливается в advance и расходуется целыми шагами time_step.
+    Лодки, которых move не изменит (стоят без тяги и поворота или затонули), засыпают
+    и не обрабатываются, пока их не разбудит изменение управления.
+    """
+
+    def __init__(self, time_step: float, max_steps_per_advance: int = 8):
+        if time_step <= 0:
+            raise ValueError(f"Недопустимый шаг симуляции: {time_step!r}")
+        self._time_step = time_step
+        self._max_steps = max_steps_per_advance
+        self._accumulator = 0.0
+        self._ticks = 0
+        # Словари вместо множеств, чтобы лодки обрабатывались в порядке добавления
+        self._active: Dict[Boat, None] = {}
+        self._parked: Dict[Boat, None] = {}
+
+    @property
+    def time(self) -> float:
+        """Симулированное время, с"""
+        return self._ticks * self._time_step
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def parked_count(self) -> int:
+        return len(self._parked)
+
+    def add(self, boat: Boat) -> None:
+        """Передаёт лодку под управление планировщика"""
+        boat._scheduler = self
+        self._active[boat] = None
+
+    def remove(self, boat: Boat) -> None:
+        """Убирает лодку из симуляции"""
+        if boat._scheduler is self:
+            boat._scheduler = None
+        self._active.pop(boat, None)
+        self._parked.pop(boat, None)
+
+    def is_parked(self, boat: Boat) -> bool:
+        return boat in self._parked
+
+    def wake(self, boat: Boat) -> None:
+        """Возвращает спящую лодку в обработку. Вызывается сеттерами управления лодки"""
+        if self._parked.pop(boat, 0) is None:
+            self._active[boat] = None
+
+    def advance(self, elapsed: float) -> int:
+        """
+        Учитывает прошедшее реальное время и выполняет накопившиеся шаги, но не больше max_steps_per_advance.
+        Возвращает число выполненных шагов. Непотраченный остаток переносится на следующий вызов.
+        """
+        self._accumulator += elapsed
+        steps = 0
+        while self._accumulator >= self._time_step and steps < self._max_steps:
+            self.tick()
+            self._accumulator -= self._time_step
+            steps += 1
+        if steps == self._max_steps:
+            # Отставание сверх допустимого не догоняем, иначе симуляция уйдёт в спираль замедления
+            self._accumulator = min(self._accumulator, self._time_step)
+        return steps
+
+    def tick(self) -> None:
+        """Выполняет один шаг для всех неспящих лодок"""
+        time_step = self._time_step
+        resting = []
+        for boat in self._active:
+            boat.move(time_step)
+            if boat.is_at_rest():
+                resting.append(boat)
+        for boat in resting:
+            del self._active[boat]
+            self._parked[boat] = None
+        self._ticks += 1
@@ -0,0 +1,216 @@
+"""
+Сервер симуляции реального времени на asyncio.
+Лодки флота продвигаются с заданной частотой, управление принимается пачками по TCP или Unix-сокету,
+подписчики получают изменения состояния после каждого шага.
+
+Протокол - кадры вида: длина полезной нагрузки (uint32), тип кадра (uint8), полезная нагрузка.
+Все числа little-endian.
+    CONTROL   (клиент -> сервер): uint32 N, затем N записей CONTROL_DTYPE
+    SUBSCRIBE (клиент -> сервер): без нагрузки
+    STATE     (сервер -> клиент): uint64 номер шага, uint32 N, затем N записей STATE_DTYPE -
+                                  только лодки, состояние которых изменилось с прошлого кадра
+"""
+import asyncio
+import struct
+import time
+from concurrent.futures import Future
+from typing import NamedTuple, Optional, Set
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from Checkpoint import CheckpointWriter, load_checkpoint
+
+CONTROL = 1
+SUBSCRIBE = 2
+STATE = 3
+
+CONTROL_DTYPE = np.dtype([("id", "<u4"), ("acceleration", "<f4"), ("rotation", "<f4")])
+STATE_DTYPE = np.dtype([("id", "<u4"), ("x", "<f4"), ("y", "<f4"), ("speed", "<f4"), ("direction", "<f4")])
+
+_FRAME_HEADER = struct.Struct("<IB")
+_COUNT = struct.Struct("<I")
+_STATE_HEADER = struct.Struct("<QI")
+
+
+class TickMetrics(NamedTuple):
+    """Статистика шагов сервера"""
+
+    ticks: int
+    overruns: int  # Шаги, не уложившиеся в период, из-за которых сервер отстал от реального времени
+    last_duration: float  # с
+    max_duration: float  # с
+
+
+class SimulationServer:
+    """Хранит флот лодок и продвигает его в реальном времени с частотой tick_rate"""
+
+    def __init__(self, fleet: BoatFleet, tick_rate: float = 60.0):
+        self._fleet = fleet
+        self._period = 1.0 / tick_rate
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._subscribers: Set[asyncio.StreamWriter] = set()
+        self._published = None
+        self._ticks = 0
+        self._overruns = 0
+        self._last_duration = 0.0
+        self._max_duration = 0.0
+
+    @classmethod
+    def restore(cls, path: str) -> "SimulationServer":
+        """Создаёт сервер из контрольной точки; симуляция продолжится с сохранённого шага"""
+        checkpoint = load_checkpoint(path)
+        server = cls(checkpoint.fleet, 1.0 / checkpoint.time_step)
+        server._ticks = checkpoint.ticks
+        return server
+
+    def checkpoint(self, writer: CheckpointWriter) -> Future:
+        """Сохраняет флот и номер шага в фоне, см. CheckpointWriter"""
+        return writer.write(self._fleet, self._ticks, self._period)
+
+    @property
+    def metrics(self) -> TickMetrics:
+        return TickMetrics(self._ticks, self._overruns, self._last_duration, self._max_duration)
+
+    @property
+    def sockets(self):
+        """Сокеты, на которых сервер принимает подключения"""
+        return self._server.sockets
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> None:
+        """Начинает принимать подключения (на Unix-сокете, если указан path) и продвигать флот"""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve_client, path)
+        else:
+            self._server = await asyncio.start_server(self._serve_client, host, port)
+        self._ticker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает симуляцию и закрывает все подключения"""
+        self._ticker.cancel()
+        try:
+            await self._ticker
+        except asyncio.CancelledError:
+            pass
+        self._server.close()
+        for writer in list(self._subscribers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            started = time.perf_counter()
+            self.tick()
+            duration = time.perf_counter() - started
+            self._last_duration = duration
+            self._max_duration = max(self._max_duration, duration)
+
+            deadline += self._period
+            delay = deadline - loop.time()
+            if delay < 0:
+                # Пропущенные шаги не догоняем: отсчёт периода начинается заново
+                self._overruns += 1
+                deadline = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def tick(self) -> None:
+        """Продвигает флот на один период и рассылает изменения подписчикам"""
+        self._fleet.step(self._period)
+        self._ticks += 1
+        if self._subscribers:
+            frame = self._state_frame()
+            for writer in list(self._subscribers):
+                if writer.is_closing():
+                    self._subscribers.discard(writer)
+                else:
+                    writer.write(frame)
+
+    def _state_frame(self) -> bytes:
+        fleet = self._fleet
+        current = np.empty(len(fleet), dtype=STATE_DTYPE)
+        current["id"] = np.arange(len(fleet))
+        current["x"] = fleet.x
+        current["y"] = fleet.y
+        current["speed"] = fleet.speed
+        current["direction"] = fleet.direction
+        if self._published is None or len(self._published) != len(current):
+            changed = current
+        else:
+            changed = current[current != self._published]
+        self._published = current
+        payload = _STATE_HEADER.pack(self._ticks, len(changed)) + changed.tobytes()
+        return _FRAME_HEADER.pack(len(payload), STATE) + payload
+
+    def apply_controls(self, controls: np.ndarray) -> None:
+        """Применяет пачку записей CONTROL_DTYPE"""
+        # Записи для несуществующих лодок пропускаем
+        controls = controls[controls["id"] < len(self._fleet)]
+        self._fleet.set_controls(controls["id"], controls["acceleration"].astype(np.float64),
+                                 controls["rotation"].astype(np.float64))
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                frame_type, payload = await read_frame(reader)
+                if frame_type == CONTROL:
+                    (count,) = _COUNT.unpack_from(payload)
+                    self.apply_controls(np.frombuffer(payload, CONTROL_DTYPE, count, _COUNT.size))
+                elif frame_type == SUBSCRIBE:
+                    self._published = None  # Новый подписчик получает полное состояние
+                    self._subscribers.add(writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._subscribers.discard(writer)
+            writer.close()
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """Читает один кадр протокола и возвращает (тип кадра, полезная нагрузка)"""
+    length, frame_type = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    return frame_type, await reader.readexactly(length)
+
+
+class SimulationClient:
+    """Клиент сервера симуляции"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0,
+                      path: Optional[str] = None) -> "SimulationClient":
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def send_controls(self, ids, acceleration, rotation) -> None:
+        """Отправляет управление для лодок ids одним кадром"""
+        controls = np.empty(len(ids), dtype=CONTROL_DTYPE)
+        controls["id"] = ids
+        controls["acceleration"] = acceleration
+        controls["rotation"] = rotation
+        payload = _COUNT.pack(len(controls)) + controls.tobytes()
+        self._writer.write(_FRAME_HEADER.pack(len(payload), CONTROL) + payload)
+        await self._writer.drain()
+
+    async def subscribe(self) -> None:
+        self._writer.write(_FRAME_HEADER.pack(0, SUBSCRIBE))
+        await self._writer.drain()
+
+    async def read_state(self):
+        """Ждёт кадр STATE и возвращает (номер шага, массив записей STATE_DTYPE)"""
+        while True:
+            frame_type, payload = await read_frame(self._reader)
+            if frame_type == STATE:
+                tick, count = _STATE_HEADER.unpack_from(payload)
+                return tick, np.frombuffer(payload, STATE_DTYPE, count, _STATE_HEADER.size)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
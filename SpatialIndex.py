@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import math
+from typing import Dict, Hashable, List, Set, Tuple
+
+from Boat import Boat
+
+Cell = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Равномерная сетка для поиска соседей на плоскости.
+    Каждый объект хранится в ячейке, содержащей его позицию, поэтому запросы смотрят только ближайшие ячейки.
+    Лодки, подключённые через attach, обновляют своё положение в сетке при каждом перемещении.
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError(f"Недопустимый размер ячейки: {cell_size!r}")
+        self._cell_size = cell_size
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._positions: Dict[Hashable, Tuple[float, float]] = {}
+        self._cell_of: Dict[Hashable, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def _cell(self, position: Tuple[float, float]) -> Cell:
+        return math.floor(position[0] / self._cell_size), math.floor(position[1] / self._cell_size)
+
+    def attach(self, boat: Boat) -> None:
+        """Добавляет лодку в индекс и поддерживает её положение при движении"""
+        self.update(boat, boat.position)
+        boat._spatial_index = self
+
+    def detach(self, boat: Boat) -> None:
+        """Удаляет лодку из индекса"""
+        if boat._spatial_index is self:
+            boat._spatial_index = None
+        self.remove(boat)
+
+    def update(self, item: Hashable, position: Tuple[float, float]) -> None:
+        """Добавляет объект или переносит его в новую позицию"""
+        cell = self._cell(position)
+        old_cell = self._cell_of.get(item)
+        if old_cell != cell:
+            if old_cell is not None:
+                self._discard(item, old_cell)
+            self._cells.setdefault(cell, set()).add(item)
+            self._cell_of[item] = cell
+        self._positions[item] = position
+
+    insert = update
+
+    def remove(self, item: Hashable) -> None:
+        """Удаляет объект из индекса, если он там есть"""
+        cell = self._cell_of.pop(item, None)
+        if cell is not None:
+            del self._positions[item]
+            self._discard(item, cell)
+
+    def _discard(self, item: Hashable, cell: Cell) -> None:
+        items = self._cells[cell]
+        items.discard(item)
+        if not items:
+            del self._cells[cell]
+
+    def position(self, item: Hashable) -> Tuple[float, float]:
+        """Позиция объекта, известная индексу"""
+        return self._positions[item]
+
+    def query_radius(self, position: Tuple[float, float], radius: float) -> List[Hashable]:
+        """Объекты на расстоянии не больше radius от position"""
+        x, y = position
+        radius_squared = radius * radius
+        low_x, low_y = self._cell((x - radius, y - radius))
+        high_x, high_y = self._cell((x + radius, y + radius))
+        found = []
+        positions = self._positions
+        for cell_x in range(low_x, high_x + 1):
+            for cell_y in range(low_y, high_y + 1):
+                for item in self._cells.get((cell_x, cell_y), ()):
+                    item_x, item_y = positions[item]
+                    if (item_x - x) ** 2 + (item_y - y) ** 2 <= radius_squared:
+                        found.append(item)
+        return found
+
+    def nearest(self, position: Tuple[float, float], k: int = 1) -> List[Hashable]:
+        """k ближайших к position объектов, от ближнего к дальнему"""
+        k = min(k, len(self._positions))
+        if k <= 0:
+            return []
+        x, y = position
+        center_x, center_y = self._cell(position)
+        positions = self._positions
+        best: List[Tuple[float, int, Hashable]] = []  # Куча с обратным знаком расстояния
+        counter = itertools.count()
+        ring = 0
+        while True:
+            for cell in _ring_cells(center_x, center_y, ring):
+                for item in self._cells.get(cell, ()):
+                    item_x, item_y = positions[item]
+                    entry = (-((item_x - x) ** 2 + (item_y - y) ** 2), next(counter), item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry[0] > best[0][0]:
+                        heapq.heapreplace(best, entry)
+            # Все непросмотренные ячейки дальше ring * cell_size от точки
+            reach = ring * self._cell_size
+            if len(best) == k and -best[0][0] <= reach * reach:
+                break
+            ring += 1
+        return [item for _, _, item in sorted(best, key=lambda entry: (-entry[0], entry[1]))]
+
+    def pairs_within(self, radius: float) -> List[Tuple[Hashable, Hashable]]:
+        """Все пары объектов на расстоянии не больше radius друг от друга, каждая пара один раз"""
+        reach = math.ceil(radius / self._cell_size)
+        offsets = [(dx, dy) for dx in range(0, reach + 1) for dy in range(-reach, reach + 1)
+                   if dx > 0 or dy > 0]
+        radius_squared = radius * radius
+        positions = self._positions
+        pairs = []
+        for (cell_x, cell_y), items in self._cells.items():
+            items = list(items)
+            for first, second in itertools.combinations(items, 2):
+                if _distance_squared(positions[first], positions[second]) <= radius_squared:
+                    pairs.append((first, second))
+            for dx, dy in offsets:
+                neighbours = self._cells.get((cell_x + dx, cell_y + dy))
+                if not neighbours:
+                    continue
+                for first in items:
+                    first_position = positions[first]
+                    for second in neighbours:
+                        if _distance_squared(first_position, positions[second]) <= radius_squared:
+                            pairs.append((first, second))
+        return pairs
+
+
+def _distance_squared(first: Tuple[float, float], second: Tuple[float, float]) -> float:
+    return (first[0] - second[0]) ** 2 + (first[1] - second[1]) ** 2
+
+
+def _ring_cells(center_x: int, center_y: int, ring: int):
+    """Ячейки на границе квадрата со стороной 2 * ring + 1 вокруг центральной"""
+    if ring == 0:
+        yield center_x, center_y
+        return
+    for dx in range(-ring, ring + 1):
+        yield center_x + dx, center_y - ring
+        yield center_x + dx, center_y + ring
+    for dy in range(-ring + 1, ring):
+        yield center_x - ring, center_y + dy
+        yield center_x + ring, center_y + dy
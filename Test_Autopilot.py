@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+import pytest
+from Autopilot import Autopilot, Route
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+
+
+def make_boat():
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def distance_to_route(route, point):
+    x, y = point
+    return min(math.dist(point, start + np.clip(np.dot((x, y) - start, unit), 0, length) * unit)
+               for start, unit, length in zip(route.starts, route.units, route.lengths))
+
+
+def run(autopilot, fleet, steps, time_delta=0.5):
+    arrived = []
+    for _ in range(steps):
+        arrived.extend(autopilot.update().tolist())
+        fleet.step(time_delta)
+    return arrived
+
+
+def test_route_geometry():
+    """Длины, смещения и курсы отрезков считаются при создании маршрута"""
+    route = Route([(0, 0), (0, 100), (100, 100)])
+
+    assert route.length == 200
+    assert route.offsets.tolist() == [0, 100]
+    assert route.headings.tolist() == [0, 90]
+    with pytest.raises(ValueError):
+        Route([(0, 0)])
+
+
+def test_boat_follows_route_to_the_end():
+    """Лодка проходит маршрут с поворотом, не отходя от него далеко, и отпускается в конце"""
+    route = Route([(0, 0), (0, 200), (200, 200), (200, 0)])
+    fleet = BoatFleet.from_boats([make_boat()])
+    autopilot = Autopilot(fleet, lookahead=20.0)
+    autopilot.assign([0], route)
+    worst = 0.0
+    for _ in range(600):
+        if len(autopilot.update()):
+            break
+        fleet.step(0.5)
+        worst = max(worst, distance_to_route(route, (fleet.x[0], fleet.y[0])))
+
+    assert len(autopilot) == 0
+    assert math.dist((fleet.x[0], fleet.y[0]), (200, 0)) < 10
+    assert fleet.acceleration[0] == 0
+    assert worst < 15
+
+
+def test_many_boats_and_routes():
+    """Лодки на разных маршрутах ведутся одним вызовом, длинный маршрут не мешает"""
+    circle = Route([(300 * math.sin(angle), 300 * math.cos(angle) - 300)
+                    for angle in np.linspace(0, 2 * math.pi, 2000)])
+    line = Route([(0, 0), (-400, 0)])
+    fleet = BoatFleet.from_boats(make_boat() for _ in range(4))
+    autopilot = Autopilot(fleet)
+    autopilot.assign([0, 1], circle)
+    autopilot.assign([2, 3], line)
+    run(autopilot, fleet, 200)
+
+    for index in (0, 1):
+        assert distance_to_route(circle, (fleet.x[index], fleet.y[index])) < 10
+    assert fleet.x[2] < -100 and abs(fleet.y[2]) < 10
+
+
+def test_list_of_boats_matches_fleet():
+    """Для списка лодок автопилот вычисляет то же управление, что и для флота"""
+    route = Route([(0, 0), (50, 50), (50, 150)])
+    boats = [make_boat(), make_boat()]
+    fleet = BoatFleet.from_boats(boats)
+    for target in (boats, fleet):
+        autopilot = Autopilot(target)
+        autopilot.assign([0, 1], route)
+        autopilot.update()
+    autopilot.release([1])
+
+    assert autopilot.ids.tolist() == [0]
+    assert [fleet.boat(index).get_state() for index in range(2)] == [boat.get_state() for boat in boats]
+
+
+def test_fast_boat_on_dense_route_keeps_up():
+    """На маршруте из коротких отрезков лодка проходит за шаг больше window отрезков и не теряет проекцию"""
+    route = Route([(2000 * math.sin(angle), 2000 * math.cos(angle) - 2000)
+                   for angle in np.linspace(0, math.pi / 2, 6000)])  # Отрезки по 0.5 м
+    fleet = BoatFleet.from_boats([make_boat()])
+    fleet.direction[0] = 90.0
+    autopilot = Autopilot(fleet, window=4)
+    autopilot.assign([0], route)
+    for _ in range(200):
+        nearest = route.nearest_segments(fleet.x[:1], fleet.y[:1])[0]
+        autopilot.update()
+        assert autopilot._segments[0] == nearest
+        fleet.step(0.5)
+
+    assert fleet.speed[0] > 9.5
@@ -0,0 +1,162 @@
+import pytest
+from BoatFleet import BoatFleet, FleetBoat
+from RowingBoat import RowingBoat
+
+
+def make_boat(weight=300, number_of_rowers=4, max_speed=10.0):
+    return RowingBoat(
+        max_weight=500,
+        weight=weight,
+        number_of_rowers=number_of_rowers,
+        max_rowing_frequency=2.0,
+        max_speed=max_speed,
+        max_rotation=90.0,
+        rower_force=150.0
+    )
+
+
+@pytest.fixture
+def boats():
+    """Фикстура с лодками в разных состояниях"""
+    forward = make_boat()
+    forward.acceleration = 1.0
+    turning = make_boat()
+    turning.acceleration = 0.7
+    turning.rotation = 0.3
+    in_place = make_boat()
+    in_place.rotation = -1.0
+    reverse = make_boat()
+    reverse.acceleration = -0.5
+    overloaded = make_boat(weight=550)
+    overloaded.acceleration = 1.0
+    no_rowers = make_boat(number_of_rowers=0)
+    no_rowers.acceleration = 1.0
+    no_speed = make_boat(max_speed=0)
+    no_speed.acceleration = 1.0
+    return [forward, turning, in_place, reverse, overloaded, no_rowers, no_speed]
+
+
+def test_step_matches_move(boats):
+    """Шаг флота совпадает с move каждой лодки"""
+    fleet = BoatFleet.from_boats(boats)
+    for _ in range(50):
+        fleet.step(0.5)
+        for boat in boats:
+            boat.move(0.5)
+
+    for index, boat in enumerate(boats):
+        assert fleet.speed[index] == pytest.approx(boat.speed)
+        assert fleet.direction[index] == pytest.approx(boat.direction)
+        assert fleet.x[index] == pytest.approx(boat.position[0])
+        assert fleet.y[index] == pytest.approx(boat.position[1])
+        assert fleet.is_afloat[index] == boat._is_afloat
+
+
+def test_step_with_mask_moves_only_marked_boats(boats):
+    """Шаг с маской продвигает только отмеченные лодки и так же, как их move"""
+    fleet = BoatFleet.from_boats(boats)
+    mask = [index % 2 == 0 for index in range(len(boats))]
+    for _ in range(20):
+        fleet.step(0.5, mask)
+    for index, boat in enumerate(boats):
+        if mask[index]:
+            boat.simulate(20, 0.5)
+        assert fleet.x[index] == pytest.approx(boat.position[0])
+        assert fleet.y[index] == pytest.approx(boat.position[1])
+        assert fleet.speed[index] == pytest.approx(boat.speed)
+        assert fleet.is_afloat[index] == boat._is_afloat
+
+
+def test_direction_wraps_at_360(boats):
+    """Направление флота остаётся в диапазоне [0, 360)"""
+    fleet = BoatFleet.from_boats(boats)
+    for _ in range(20):
+        fleet.step(1.0)
+
+    assert fleet.direction.min() >= 0
+    assert fleet.direction.max() < 360
+
+
+def test_proxy_reads_and_writes_fleet_row(boats):
+    """Лодка-представление читает и меняет строку флота"""
+    fleet = BoatFleet.from_boats(boats)
+    proxy = fleet.boat(2)
+    assert isinstance(proxy, RowingBoat)
+
+    proxy.acceleration = 1.0
+    proxy.rotation = 0.0
+    fleet.step(1.0)
+
+    assert fleet.acceleration[2] == 1.0
+    assert proxy.speed == fleet.speed[2] > 0
+    assert proxy.position == (fleet.x[2], fleet.y[2])
+
+
+def test_proxy_move_updates_only_its_row(boats):
+    """move у лодки-представления двигает только её строку"""
+    fleet = BoatFleet.from_boats(boats)
+    fleet.boat(0).move(1.0)
+
+    assert fleet.speed[0] > 0
+    assert fleet.speed[1] == 0
+
+
+def test_fleet_grows():
+    """Флот расширяется при добавлении лодок сверх ёмкости"""
+    fleet = BoatFleet(capacity=1)
+    for _ in range(10):
+        fleet.add(make_boat())
+
+    assert len(fleet) == 10
+    assert isinstance(fleet.boat(-1), FleetBoat)
+    with pytest.raises(IndexError):
+        fleet.boat(10)
+
+
+def test_set_controls_matches_setters(boats):
+    """Пакетное управление даёт то же состояние, что и сеттеры каждой лодки"""
+    fleet = BoatFleet.from_boats(boats)
+    accelerations = [1.5, 0.7, 0.0, -0.5, 0.2, 1.0, -2.0]
+    rotations = [0.3, -0.8, -1.0, 0.0, 0.5, 2.0, -0.25]
+    fleet.set_controls(range(len(boats)), accelerations, rotations)
+    for boat, acceleration, rotation in zip(boats, accelerations, rotations):
+        boat.acceleration = acceleration
+        boat.rotation = rotation
+
+    for index, boat in enumerate(boats):
+        assert fleet.boat(index).get_state() == boat.get_state()
+
+
+def test_set_controls_partial(boats):
+    """Можно задать только один параметр, одним значением для выбранных лодок"""
+    fleet = BoatFleet.from_boats(boats)
+    fleet.set_controls([1, -1], rotation=-0.25)
+    boats[1].rotation = -0.25
+    boats[-1].rotation = -0.25
+
+    assert fleet.boat(1).get_state() == boats[1].get_state()
+    assert fleet.boat(-1).get_state() == boats[-1].get_state()
+    assert fleet.boat(0).get_state() == boats[0].get_state()
+    with pytest.raises(IndexError):
+        fleet.set_controls([len(boats)], acceleration=1.0)
+
+
+def test_proxy_derived_values_follow_fleet(boats):
+    """Производные величины лодки-представления обновляются после шага флота"""
+    fleet = BoatFleet.from_boats(boats)
+    proxy = fleet.boat(1)
+    velocity = proxy.velocity
+    fleet.step(1.0)
+    boats[1].move(1.0)
+
+    assert proxy.velocity != velocity
+    assert proxy.velocity == boats[1].velocity
+    assert proxy.distance_from_origin == boats[1].distance_from_origin
+
+
+def test_from_arrays_matches_boats():
+    """Флот из колонок параметров совпадает с флотом из новых лодок"""
+    parameters = [(500, 300, 4, 2.0, 10.0, 90.0, 150.0), (800.5, 120, 3, 1.5, 6, 45.0, 110.0)]
+    fleet = BoatFleet.from_arrays(*zip(*parameters))
+
+    assert [fleet.boat(index).get_state() for index in range(2)] == [RowingBoat(*row).get_state() for row in parameters]
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+from BoatFleet import BoatFleet
+from Checkpoint import CheckpointWriter, load_checkpoint, save_checkpoint
+from RowingBoat import RowingBoat
+from SimulationServer import SimulationServer
+
+
+def make_fleet(size):
+    fleet = BoatFleet.from_boats(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(size))
+    fleet.set_controls(range(size), np.linspace(-1, 1, size), np.linspace(1, -1, size))
+    fleet.step(1.0)
+    return fleet
+
+
+def test_restore_is_bit_identical(tmp_path):
+    """Восстановленный флот продолжает движение точно так же, как исходный"""
+    path = str(tmp_path / "regatta.ckpt")
+    fleet = make_fleet(50)
+    save_checkpoint(path, fleet, ticks=120, time_step=0.5)
+    checkpoint = load_checkpoint(path)
+    for _ in range(100):
+        fleet.step(0.5)
+        checkpoint.fleet.step(0.5)
+
+    assert checkpoint.ticks == 120 and checkpoint.time_step == 0.5
+    for name in ("speed", "direction", "x", "y", "left_rowing_rate", "is_afloat"):
+        assert np.array_equal(getattr(fleet, name), getattr(checkpoint.fleet, name))
+    assert os.listdir(tmp_path) == ["regatta.ckpt"]
+
+
+def test_boats_round_trip(tmp_path):
+    """Можно сохранить и восстановить обычные лодки"""
+    path = str(tmp_path / "boats.ckpt")
+    boats = [RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0), RowingBoat(500, 600, 2, 1.0, 8.0, 45.0, 100.0)]
+    boats[0].acceleration = 0.5
+    boats[0].move(3.0)
+    save_checkpoint(path, boats)
+
+    assert [boat.get_state() for boat in load_checkpoint(path).boats()] == [boat.get_state() for boat in boats]
+
+
+def test_background_writer(tmp_path):
+    """Фоновая запись не мешает флоту двигаться и сохраняет состояние на момент вызова"""
+    path = str(tmp_path / "regatta.ckpt")
+    fleet = make_fleet(10)
+    expected = fleet.x.copy()
+    with CheckpointWriter(path) as writer:
+        future = writer.write(fleet, ticks=7)
+        fleet.step(1.0)
+        future.result()
+
+    assert np.array_equal(load_checkpoint(path).fleet.x, expected)
+
+
+def test_invalid_files(tmp_path):
+    """Чужие и обрезанные файлы не принимаются за контрольные точки"""
+    path = tmp_path / "regatta.ckpt"
+    save_checkpoint(str(path), make_fleet(10))
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
+    path.write_bytes(b"BTRJ" + data[4:])
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
+
+
+def test_server_restore(tmp_path):
+    """Сервер продолжает с сохранённого шага"""
+    path = str(tmp_path / "server.ckpt")
+    server = SimulationServer(make_fleet(5), tick_rate=20.0)
+    for _ in range(3):
+        server.tick()
+    with CheckpointWriter(path) as writer:
+        server.checkpoint(writer).result()
+    restored = SimulationServer.restore(path)
+    server.tick()
+    restored.tick()
+
+    assert restored.metrics.ticks == 4
+    assert np.array_equal(restored._fleet.x, server._fleet.x)
@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pytest
+from Ensemble import (Disturbances, QuantileSketch, RunningStatistics, Scenario, _normal, run_ensemble,
+                      simulate_members)
+
+SCENARIO = Scenario(waypoints=[(0.0, 0.0), (0.0, 150.0), (100.0, 250.0)], horizon=300.0)
+DISTURBANCES = Disturbances(force_spread=0.1, gust_sigma=0.2, current=(0.3, 0.0), current_spread=0.1)
+
+
+def test_random_numbers_depend_only_on_member_step_and_stream():
+    """Числа участника не зависят от того, с кем он в пачке"""
+    everyone = _normal(7, np.arange(10_000), 3, 1)
+    assert np.array_equal(_normal(7, np.array([5, 6, 7]), 3, 1), everyone[5:8])
+    assert not np.array_equal(_normal(7, np.arange(10_000), 4, 1), everyone)
+    assert not np.array_equal(_normal(8, np.arange(10_000), 3, 1), everyone)
+    assert abs(everyone.mean()) < 0.05
+    assert everyone.std() == pytest.approx(1.0, abs=0.05)
+
+
+def test_members_do_not_depend_on_batching():
+    """Время прибытия участника одинаково при любом разбиении на пачки"""
+    together = simulate_members(SCENARIO, DISTURBANCES, 1, np.arange(10))
+    apart = np.concatenate([simulate_members(SCENARIO, DISTURBANCES, 1, np.arange(0, 3)),
+                            simulate_members(SCENARIO, DISTURBANCES, 1, np.arange(3, 10))])
+    assert np.array_equal(together, apart)
+    assert np.isfinite(together).all()
+
+
+def test_without_disturbances_all_members_arrive_together():
+    """Без возмущений все участники одинаковы"""
+    summary = run_ensemble(SCENARIO, Disturbances(), 300)
+    assert summary.arrived == 300
+    assert summary.arrival_time.min == summary.arrival_time.max
+    assert summary.arrival_time.std == 0
+
+
+def test_summary_does_not_depend_on_chunks_or_workers():
+    """Итог ансамбля совпадает до бита при разных пачках и числе процессов"""
+    summaries = [run_ensemble(SCENARIO, DISTURBANCES, 1000, seed=3, chunk_size=chunk_size, workers=workers)
+                 for chunk_size, workers in ((256, 1), (1000, 1), (256, 2))]
+    for summary in summaries[1:]:
+        assert summary.arrived == summaries[0].arrived
+        statistics, expected = summary.arrival_time, summaries[0].arrival_time
+        assert (statistics.count, statistics.mean, statistics.variance) == \
+            (expected.count, expected.mean, expected.variance)
+        assert [statistics.quantile(q) for q in (0.1, 0.5, 0.9)] == [expected.quantile(q) for q in (0.1, 0.5, 0.9)]
+    assert summaries[0].arrival_time.std > 0
+
+
+def test_sketch_quantiles_are_relatively_accurate():
+    """Квантили скетча отличаются от точных не больше чем на заданную относительную точность"""
+    values = np.random.default_rng(0).lognormal(3.0, 1.0, 20_000)
+    sketch = QuantileSketch(0.01)
+    sketch.add(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.0101)
+
+
+def test_sketch_with_negative_values_and_zeros():
+    sketch = QuantileSketch(0.01)
+    sketch.add([-10.0, 0.0, 0.0, 5.0])
+    assert sketch.quantile(0) == pytest.approx(-10.0, rel=0.01)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1) == pytest.approx(5.0, rel=0.01)
+    with pytest.raises(ValueError):
+        sketch.add([math.inf])
+    assert math.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_statistics_merge_matches_single_pass():
+    """Слияние частичных статистик совпадает со статистикой по всем значениям"""
+    values = np.random.default_rng(1).normal(100.0, 15.0, 5_000)
+    whole = RunningStatistics()
+    whole.add(values)
+    merged = RunningStatistics()
+    for part in np.array_split(values, 7):
+        partial = RunningStatistics()
+        partial.add(part)
+        merged.merge(partial)
+
+    assert merged.count == whole.count == 5_000
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance == pytest.approx(values.var(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+    assert merged.quantile(0.5) == whole.quantile(0.5)
+    with pytest.raises(ValueError):
+        merged.merge(RunningStatistics(0.05))
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from BoatFleet import BoatFleet
+from Environment import Environment, VectorField, uniform_field
+from Integrators import RK4Integrator
+from RowingBoat import RowingBoat
+
+
+def make_boat():
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def linear_grid(nx=100, ny=80, cell_size=10.0):
+    """Сетка линейного поля u = 2x + 3y, v = x - y: билинейная интерполяция воспроизводит его точно"""
+    x = np.arange(nx) * cell_size
+    y = np.arange(ny) * cell_size
+    grid_x, grid_y = np.meshgrid(x, y)
+    return np.stack([2 * grid_x + 3 * grid_y, grid_x - grid_y], axis=-1)
+
+
+def test_bilinear_interpolation_and_edges():
+    """Внутри сетки поле интерполируется билинейно, за краем продолжается значениями края"""
+    field = VectorField(linear_grid(), cell_size=10.0)
+    x = np.array([0.0, 15.0, 333.3, 989.9, 2000.0, -50.0])
+    y = np.array([0.0, 27.5, 701.1, 12.0, 100.0, 790.0])
+    u, v = field.sample(x, y)
+    clamped_x, clamped_y = np.clip(x, 0, 990), np.clip(y, 0, 790)
+    assert u == pytest.approx(2 * clamped_x + 3 * clamped_y)
+    assert v == pytest.approx(clamped_x - clamped_y)
+    for point in range(len(x)):
+        assert field.sample_point(x[point], y[point]) == pytest.approx((u[point], v[point]))
+
+
+def test_time_varying_field():
+    """Между моментами поле интерполируется линейно по времени, вне их берётся крайний слой"""
+    layers = np.stack([np.full((3, 3, 2), 1.0), np.full((3, 3, 2), 3.0)])
+    field = VectorField(layers, cell_size=1.0, times=[10.0, 20.0])
+    assert field.sample_point(1.0, 1.0, 15.0) == pytest.approx((2.0, 2.0))
+    assert field.sample_point(1.0, 1.0, 0.0) == (1.0, 1.0)
+    assert field.sample([1.0], [1.0], 99.0)[0][0] == 3.0
+    with pytest.raises(ValueError):
+        VectorField(layers, cell_size=1.0, times=[20.0, 10.0])
+
+
+def test_memory_mapped_field_fills_only_touched_tiles(tmp_path):
+    """Поле из файла совпадает с полем в памяти, а коэффициенты считаются только для тронутых плиток"""
+    grid = linear_grid(nx=300, ny=300)
+    path = str(tmp_path / "current.npy")
+    np.save(path, grid)
+    mapped = VectorField.load(path, cell_size=10.0)
+    points = np.random.default_rng(0).uniform(0, 300, (2, 1000))
+    assert np.array_equal(mapped.sample(*points)[0], VectorField(grid, cell_size=10.0).sample(*points)[0])
+    assert mapped._caches[0]._filled.sum() == 1
+
+
+def test_boat_drifts_with_current_and_wind():
+    """Стоящую лодку сносит течением и долей ветра"""
+    boat = make_boat()
+    boat.environment = Environment(current=uniform_field(0.5, -0.25), wind=uniform_field(10.0, 0.0), windage=0.05)
+    assert not boat.is_at_rest()
+    boat.simulate(10, 1.0)
+    assert boat.position == pytest.approx((10 * (0.5 + 0.5), -2.5))
+    assert boat.speed == 0
+
+
+def test_fleet_drift_matches_boats():
+    """Флот в поле течения движется так же, как отдельные лодки"""
+    environment = Environment(current=VectorField(linear_grid() / 500, cell_size=10.0))
+    boats = [make_boat() for _ in range(3)]
+    for index, boat in enumerate(boats):
+        boat.position = (100.0 * index, 50.0)
+        boat.acceleration = 0.5
+        boat.rotation = 0.2 * index
+    fleet = BoatFleet.from_boats(boats)
+    fleet.environment = environment
+    for boat in boats:
+        boat.environment = environment
+    for _ in range(30):
+        fleet.step(0.5)
+        for boat in boats:
+            boat.move(0.5)
+        environment.advance(0.5)
+
+    for index, boat in enumerate(boats):
+        assert (fleet.x[index], fleet.y[index]) == pytest.approx(boat.position)
+
+
+def test_drift_with_integrator():
+    """Снос действует и при интеграторе повышенного порядка"""
+    drifting, still = make_boat(), make_boat()
+    for boat in (drifting, still):
+        boat.integrator = RK4Integrator()
+        boat.acceleration = 1.0
+    drifting.environment = Environment(current=uniform_field(0.0, 1.0))
+    for _ in range(10):
+        drifting.move(1.0)
+        still.move(1.0)
+    assert drifting.position[1] == pytest.approx(still.position[1] + 10.0)
+
+
+def test_simulate_advances_time_varying_field():
+    """simulate продвигает время окружения: лодка попадает и в следующие слои поля"""
+    layers = np.stack([np.full((2, 2, 2), (1.0, 0.0)), np.full((2, 2, 2), (0.0, 1.0))])
+    environment = Environment(current=VectorField(layers, cell_size=1.0, times=[0.0, 10.0]))
+    boat = make_boat()
+    boat.environment = environment
+    boat.simulate(20, 1.0)
+
+    assert environment.time == 20.0
+    # Течение по x затухает и сменяется течением по y за 10 с, дальше остаётся последним слоем
+    assert boat.position == pytest.approx((5.5, 4.5 + 10.0))
@@ -0,0 +1,44 @@
+import compileall
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Допустимое время импорта RowingBoat вместе со всеми зависимостями, мкс (сейчас около 6 мс)
+IMPORT_BUDGET_US = 20_000
+# Подсистемы, которые не должны загружаться при создании отдельных лодок
+HEAVY_MODULES = ("numpy", "typing", "asyncio", "concurrent.futures", "multiprocessing")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(statement):
+    """Время импорта каждого модуля по python -X importtime: {модуль: накопленное время, мкс}"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def rowing_boat_imports():
+    # Замеряем импорт из готового байт-кода, как у установленного пакета
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)
+    return [import_times("from RowingBoat import RowingBoat") for _ in range(3)]
+
+
+def test_rowing_boat_import_is_light(rowing_boat_imports):
+    """Импорт RowingBoat не тянет за собой NumPy и другие тяжёлые модули"""
+    for heavy in HEAVY_MODULES:
+        assert heavy not in rowing_boat_imports[0]
+
+
+def test_rowing_boat_import_budget(rowing_boat_imports):
+    """Импорт RowingBoat укладывается в бюджет (лучшее из трёх измерений)"""
+    assert min(times["RowingBoat"] for times in rowing_boat_imports) < IMPORT_BUDGET_US
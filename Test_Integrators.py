@@ -0,0 +1,79 @@
+import math
+
+import pytest
+from Integrators import RK45Integrator, RK4Integrator
+from RowingBoat import RowingBoat
+
+
+def make_turning_boat(integrator=None):
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    boat.acceleration = 0.8
+    boat.rotation = 0.1
+    boat.integrator = integrator
+    return boat
+
+
+@pytest.fixture(scope="module")
+def reference():
+    """Эталон: RK4 с очень мелким шагом"""
+    boat = make_turning_boat(RK4Integrator())
+    boat.simulate(6000, 0.01)
+    return boat
+
+
+def _error(boat, reference):
+    return math.dist(boat.position, reference.position)
+
+
+def test_rk4_large_steps_beat_euler(reference):
+    """RK4 с шагом 5 с точнее схемы Эйлера с тем же шагом"""
+    euler = make_turning_boat()
+    rk4 = make_turning_boat(RK4Integrator())
+    euler.simulate(12, 5.0)
+    rk4.simulate(12, 5.0)
+
+    assert _error(rk4, reference) < _error(euler, reference) / 10
+    assert rk4.speed <= rk4._max_speed
+
+
+def test_rk45_meets_tolerance(reference):
+    """Адаптивный метод укладывается в заданную точность при шаге 10 с"""
+    integrator = RK45Integrator(tolerance=1e-7)
+    boat = make_turning_boat(integrator)
+    boat.simulate(6, 10.0)
+
+    assert _error(boat, reference) < 1e-4
+    assert boat.direction == pytest.approx(reference.direction)
+    assert integrator.substeps > 6
+
+
+def test_default_integrator_is_euler():
+    """Без интегратора move работает по схеме Эйлера, и его можно отключить"""
+    boat = make_turning_boat(RK4Integrator())
+    boat.integrator = None
+    euler = make_turning_boat()
+    boat.move(1.0)
+    euler.move(1.0)
+
+    assert boat.get_state() == euler.get_state()
+
+
+def test_rk45_step_limit():
+    """Недостижимая точность приводит к ошибке, а не к бесконечному циклу"""
+    boat = make_turning_boat(RK45Integrator(tolerance=1e-30, max_substeps=50))
+    with pytest.raises(RuntimeError):
+        boat.move(10.0)
+
+
+@pytest.mark.parametrize("integrator", [RK4Integrator(), RK45Integrator()])
+def test_zero_max_speed_boat_stays_put(integrator):
+    """Лодка с max_speed = 0 не сдвигается и при интеграторе, как и по схеме Эйлера"""
+    euler = RowingBoat(500, 300, 4, 2.0, 0.0, 90.0, 150.0)
+    boat = RowingBoat(500, 300, 4, 2.0, 0.0, 90.0, 150.0)
+    boat.integrator = integrator
+    for each in (euler, boat):
+        each.acceleration = 1.0
+        each.simulate(10, 1.0)
+
+    assert boat.position == euler.position == (0.0, 0.0)
+    assert boat.speed == euler.speed == 0.0
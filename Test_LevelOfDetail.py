@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from BoatFleet import BoatFleet
+from LevelOfDetail import COARSE, FULL, LevelOfDetail
+from RowingBoat import RowingBoat
+
+
+def make_fleet(positions, acceleration=1.0, rotation=0.0):
+    fleet = BoatFleet.from_boats(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in positions)
+    fleet.x[:] = [x for x, _ in positions]
+    fleet.y[:] = [y for _, y in positions]
+    fleet.set_controls(range(len(positions)), acceleration, rotation)
+    return fleet
+
+
+def test_boats_near_observer_move_like_full_fleet():
+    """Лодки у наблюдателя движутся точно как во флоте без уровней детализации"""
+    positions = [(0.0, 0.0), (10.0, 0.0), (5_000.0, 0.0), (-5_000.0, 0.0)]
+    fleet = make_fleet(positions, rotation=0.2)
+    reference = make_fleet(positions, rotation=0.2)
+    lod = LevelOfDetail(fleet, radius=100.0, stride=5)
+    lod.add_observer((0.0, 0.0))
+    for _ in range(20):
+        lod.step(0.1)
+        reference.step(0.1)
+
+    assert list(lod.tiers) == [FULL, FULL, COARSE, COARSE]
+    for name in ("x", "y", "speed", "direction"):
+        assert np.array_equal(getattr(fleet, name)[:2], getattr(reference, name)[:2])
+
+
+def test_coarse_boats_update_every_stride_ticks():
+    """Дальняя лодка обновляется раз в stride шагов, и её время не теряется"""
+    fleet = make_fleet([(1_000.0, 0.0)])
+    lod = LevelOfDetail(fleet, radius=10.0, stride=4)
+    lod.add_observer((0.0, 0.0))
+    updates = 0
+    for _ in range(12):
+        y = fleet.y[0]
+        lod.step(0.5)
+        updates += fleet.y[0] != y
+        assert lod.lag[0] < 4 * 0.5
+
+    assert updates == 3
+    lod.sync()
+    assert lod.lag[0] == 0
+    # Установившаяся скорость: тяга равна сопротивлению, для полной тяги это max_speed
+    assert fleet.speed[0] == pytest.approx(10.0)
+    assert fleet.y[0] == pytest.approx(10.0 * 12 * 0.5)
+
+
+def test_coarse_model_approximates_full_model():
+    """Грубая модель на долгом пути с поворотом близка к полной"""
+    positions = [(1_000.0, 0.0)]
+    fleet = make_fleet(positions, acceleration=0.8, rotation=0.1)
+    reference = make_fleet(positions, acceleration=0.8, rotation=0.1)
+    lod = LevelOfDetail(fleet, radius=10.0, stride=10)
+    lod.add_observer((0.0, 0.0))
+    for _ in range(600):
+        lod.step(0.1)
+        reference.step(0.1)
+    lod.sync()
+
+    assert fleet.direction[0] == pytest.approx(reference.direction[0])
+    distance = np.hypot(fleet.x[0] - reference.x[0], fleet.y[0] - reference.y[0])
+    assert distance < 0.1 * 60 * reference.speed[0]
+
+
+def test_upgrade_catches_up_without_jumps():
+    """При подходе наблюдателя лодка досчитывает отставание и дальше идёт в полном режиме"""
+    fleet = make_fleet([(300.0, 0.0)])
+    lod = LevelOfDetail(fleet, radius=100.0, stride=10, hysteresis=0.5)
+    observer = lod.add_observer((0.0, 0.0))
+    fleet.speed[0] = 10.0  # Уже на установившейся скорости, так что грубая модель точна
+    for _ in range(3):
+        lod.step(0.1)
+    assert lod.tiers[0] == COARSE and lod.lag[0] > 0
+
+    lod.move_observer(observer, (300.0, 0.0))
+    lod.step(0.1)
+    assert lod.tiers[0] == FULL and lod.lag[0] == 0
+    assert fleet.y[0] == pytest.approx(10.0 * 4 * 0.1)
+
+    # Гистерезис: чуть дальше radius лодка остаётся в полном режиме
+    lod.move_observer(observer, (300.0, fleet.y[0] + 120.0))
+    lod.step(0.1)
+    assert lod.tiers[0] == FULL
+
+
+def test_priority_overrides_distance():
+    """Закреплённый уровень важнее расстояния до наблюдателей"""
+    fleet = make_fleet([(0.0, 0.0), (5_000.0, 0.0), (0.0, 5.0)])
+    lod = LevelOfDetail(fleet, radius=100.0)
+    lod.add_observer((0.0, 0.0))
+    lod.set_priority([1], FULL)
+    lod.set_priority([2], COARSE)
+    lod.step(0.1)
+    assert list(lod.tiers) == [FULL, FULL, COARSE]
+
+    fleet.add(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0))
+    assert len(lod.tiers) == 4
+    with pytest.raises(ValueError):
+        lod.set_priority([0], 7)
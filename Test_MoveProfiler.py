@@ -0,0 +1,43 @@
+from Boat import Boat
+from MoveProfiler import MoveProfiler, run_scenario
+from RowingBoat import RowingBoat
+
+
+def test_phases_and_step_counts():
+    """Профилировщик считает фазы move и шаги каждой лодки"""
+    first = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    second = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    with MoveProfiler() as profiler:
+        first.rotation = 0.5
+        for _ in range(3):
+            first.move(1.0)
+        second.move(1.0)
+
+    phases = profiler.phases
+    assert phases["RowingBoat.move"].calls == 4
+    assert phases["Boat._update_position"].calls == 4
+    assert phases["RowingBoat.rotation.setter"].calls == 1
+    assert phases["RowingBoat._update_rowing_rates"].calls == 1
+    assert profiler.boat_steps == {first: 3, second: 1}
+    move = phases["RowingBoat.move"]
+    assert move.total_time >= move.self_time >= 0
+
+
+def test_methods_restored_after_profiling():
+    """После выхода из профилировщика методы лодок возвращаются к исходным"""
+    originals = (Boat.move, Boat._update_speed, RowingBoat.move, RowingBoat.__dict__["rotation"])
+    with MoveProfiler():
+        assert Boat.move is not originals[0]
+
+    assert (Boat.move, Boat._update_speed, RowingBoat.move, RowingBoat.__dict__["rotation"]) == originals
+
+
+def test_collapsed_stacks():
+    """Свёрнутые стеки пригодны для flamegraph.pl"""
+    profiler = run_scenario(boats=3, steps=10, time_delta=0.1)
+
+    lines = profiler.collapsed().splitlines()
+    paths = {line.rsplit(" ", 1)[0] for line in lines}
+    assert "RowingBoat.move;Boat.move;Boat._update_speed" in paths
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert "RowingBoat.move" in profiler.report()
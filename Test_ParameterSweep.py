@@ -0,0 +1,62 @@
+import math
+
+from ParameterSweep import evaluate, grid, latin_hypercube, main, random_samples, run_sweep
+
+
+def test_grid_covers_all_combinations():
+    """Сетка перебирает все сочетания значений"""
+    configs = list(grid(number_of_rowers=[2, 4, 6], rower_force=[100.0, 150.0]))
+
+    assert len(configs) == 6
+    assert {"number_of_rowers": 6, "rower_force": 100.0} in configs
+
+
+def test_latin_hypercube_strata():
+    """В каждую полосу латинского гиперкуба попадает ровно одна конфигурация"""
+    configs = list(latin_hypercube(10, seed=1, weight=(100.0, 200.0), rower_force=(0.0, 10.0)))
+
+    assert sorted(int((config["weight"] - 100.0) // 10) for config in configs) == list(range(10))
+    assert sorted(int(config["rower_force"]) for config in configs) == list(range(10))
+
+
+def test_samplers_are_reproducible():
+    """Выборки с одинаковым seed совпадают"""
+    assert list(random_samples(5, seed=3, weight=(100.0, 400.0))) == \
+        list(random_samples(5, seed=3, weight=(100.0, 400.0)))
+
+
+def test_evaluate_metrics():
+    """Метрики стандартной лодки"""
+    result = evaluate({}, horizon=100.0)
+
+    assert 0 < result.time_to_max_speed < 100.0
+    assert result.distance > 0
+    assert 0 < result.turning_radius < math.inf
+    assert result.error is None
+
+
+def test_evaluate_invalid_config():
+    """Некорректная конфигурация не прерывает перебор, а возвращает ошибку"""
+    result = evaluate({"weight": -1.0})
+
+    assert result.error is not None
+    assert result.time_to_max_speed == math.inf
+
+
+def test_run_sweep_matches_serial():
+    """Параллельный перебор даёт те же результаты, что и последовательный"""
+    configs = list(grid(number_of_rowers=[0, 2, 4], rower_force=[50.0, 150.0], weight=[200.0, -1.0]))
+
+    results = list(run_sweep(configs, horizon=50.0, workers=2, chunk_size=3))
+
+    key = lambda result: sorted(result.config.items())
+    assert sorted(results, key=key) == sorted((evaluate(config, horizon=50.0) for config in configs), key=key)
+
+
+def test_cli(capsys):
+    """Перебор запускается из командной строки и выводит CSV"""
+    main(["--grid", "number_of_rowers=2,4", "--horizon", "20", "--workers", "1"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "number_of_rowers,time_to_max_speed,distance,turning_radius,error"
+    assert len(lines) == 3
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+from BoatFleet import BoatFleet
+from Replay import ControlLog, ControlLogWriter, ControlRecord, find_divergence, replay
+from RowingBoat import RowingBoat
+from TrajectoryRecorder import TrajectoryRecorder, read_trajectory
+
+TICKS = 200
+TIME_STEP = 0.25
+
+
+def make_boats():
+    return [RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(3)]
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Сценарий со случайным управлением: журнал и эталонные траектории каждой лодки"""
+    rng = random.Random(3)
+    boats = make_boats()
+    log_path = str(tmp_path / "controls.bin")
+    paths = [str(tmp_path / f"boat{index}.bin") for index in range(len(boats))]
+    recorders = [TrajectoryRecorder(path) for path in paths]
+    with ControlLogWriter(log_path, TIME_STEP) as log:
+        for boat, recorder in zip(boats, recorders):
+            recorder.attach(boat)
+        for tick in range(TICKS):
+            for index, boat in enumerate(boats):
+                if rng.random() < 0.1:
+                    acceleration, rotation = rng.uniform(-1, 1), rng.uniform(-1, 1)
+                    log.write(tick, index, acceleration, rotation)
+                    boat.acceleration = acceleration
+                    boat.rotation = rotation
+                boat.move(TIME_STEP)
+    for recorder in recorders:
+        recorder.close()
+    return ControlLog(log_path, chunk_size=8), [read_trajectory(path) for path in paths]
+
+
+def test_replay_matches_reference(recorded):
+    """Повтор на лодках и на флоте совпадает с записанными траекториями"""
+    log, references = recorded
+
+    assert find_divergence(make_boats(), log, log.time_step, references, tolerance=0.0) is None
+    assert find_divergence(BoatFleet.from_boats(make_boats()), log, log.time_step, references, tolerance=0.0) is None
+
+
+def test_divergence_stops_early(recorded):
+    """Изменённая модель расходится с эталоном, повтор останавливается на первом расхождении"""
+    log, references = recorded
+    boats = make_boats()
+    boats[1] = RowingBoat(500, 320, 4, 2.0, 10.0, 90.0, 150.0)
+    divergence = find_divergence(boats, log, log.time_step, references, tolerance=1e-3)
+
+    assert divergence is not None
+    assert divergence.boat == 1
+    assert divergence.tick < TICKS
+    assert abs(divergence.expected - divergence.actual) > 1e-3
+    assert boats[0].position == tuple(references[0][["x", "y"]][divergence.tick])
+
+
+def test_replay_runs_until_log_ends():
+    """Без числа шагов повтор заканчивается шагом последней записи; журнал должен быть упорядочен"""
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    ticks = list(replay(boat, [ControlRecord(0, 0, 1.0, 0.0), ControlRecord(4, 0, 0.0, 0.5)], 1.0))
+
+    assert ticks == [0, 1, 2, 3, 4]
+    assert boat.rotation == 0.5
+    with pytest.raises(ValueError):
+        list(replay(boat, [ControlRecord(2, 0, 1.0, 0.0), ControlRecord(1, 0, 1.0, 0.0)], 1.0))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from ShardedFleet import ShardedFleet
+
+
+@pytest.fixture
+def fleet():
+    """Флот лодок, разбросанных по квадрату 200x200 м, часть из них пересекает границы полос"""
+    rng = np.random.default_rng(1)
+    fleet = BoatFleet.from_boats(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(300))
+    fleet.x[:] = rng.uniform(-100, 100, 300)
+    fleet.y[:] = rng.uniform(-100, 100, 300)
+    fleet.set_controls(range(300), rng.uniform(-1, 1, 300), rng.uniform(-1, 1, 300))
+    fleet.direction[:] = rng.uniform(0, 360, 300)
+    return fleet
+
+
+def _assert_same(first, second):
+    for name in ("speed", "direction", "x", "y", "left_rowing_rate", "right_rowing_rate"):
+        assert np.array_equal(getattr(first, name), getattr(second, name))
+
+
+def test_sharded_steps_match_single_fleet(fleet):
+    """Разделённый флот движется бит в бит как единый, лодки переходят между полосами"""
+    with ShardedFleet(fleet, workers=3) as sharded:
+        initial_sizes = sharded.shard_sizes()
+        for step in range(40):
+            if step == 20:
+                fleet.set_controls([5, 7], [1.0, -1.0], 0.5)
+                sharded.set_controls([5, 7], [1.0, -1.0], 0.5)
+            fleet.step(0.5)
+            sharded.step(0.5)
+        result = sharded.gather()
+        sizes = sharded.shard_sizes()
+
+    _assert_same(result, fleet)
+    assert sum(sizes) == len(fleet) == 300
+    assert sizes != initial_sizes
+
+
+def test_query_radius_sees_neighbour_shards(fleet):
+    """Поиск соседей у границы полосы находит лодки соседней полосы"""
+    with ShardedFleet(fleet, workers=2, bounds=[0.0], ghost_width=30.0) as sharded:
+        for _ in range(3):
+            fleet.step(1.0)
+            sharded.step(1.0)
+        for center in ((0.0, 0.0), (-5.0, 50.0), (29.0, -80.0)):
+            distances = np.hypot(fleet.x - center[0], fleet.y - center[1])
+            assert np.array_equal(sharded.query_radius(center, 30.0), np.flatnonzero(distances <= 30.0))
+        with pytest.raises(ValueError):
+            sharded.query_radius((0.0, 0.0), 31.0)
+        with pytest.raises(IndexError):
+            sharded.set_controls([300], 1.0)
@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from SharedFleet import SharedFleet, SharedFleetReader
+
+
+def make_boats(size):
+    return [RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(size)]
+
+
+def test_moves_like_fleet():
+    """Флот в общей памяти движется так же, как обычный"""
+    boats = make_boats(20)
+    fleet = BoatFleet.from_boats(boats)
+    with SharedFleet.from_boats(boats) as shared:
+        for target in (fleet, shared):
+            target.set_controls(range(20), np.linspace(-1, 1, 20), np.linspace(1, -1, 20))
+            for _ in range(50):
+                target.step(0.5)
+        assert shared.ticks == 50
+        for name in ("speed", "direction", "x", "y"):
+            assert np.array_equal(getattr(fleet, name), getattr(shared, name))
+
+
+def test_reader_sees_writer_state():
+    """Читатель видит состояние флота без копирования, включая изменения через лодку-представление"""
+    with SharedFleet.from_boats(make_boats(3)) as fleet, SharedFleetReader(fleet.name) as reader:
+        fleet.set_controls([1], 1.0, 0.0)
+        fleet.step(1.0)
+        assert len(reader) == 3 and reader.ticks == 1
+        assert np.array_equal(reader.view("y"), fleet.y)
+        with fleet.writing():
+            fleet.boat(2).position = (7.0, 8.0)
+        snapshot = reader.snapshot()
+        assert snapshot["x"][2] == 7.0 and snapshot["y"][2] == 8.0
+        assert int(snapshot["ticks"]) == 1
+        with pytest.raises(ValueError):
+            reader.view("x")[0] = 1.0
+
+
+def test_capacity_is_fixed():
+    """Ёмкость блока не растёт"""
+    with SharedFleet(2) as fleet:
+        fleet.add(make_boats(1)[0])
+        fleet.add(make_boats(1)[0])
+        with pytest.raises(ValueError):
+            fleet.add(make_boats(1)[0])
+        assert len(fleet) == 2
+
+
+def test_reader_rejects_foreign_block():
+    """Блок без заголовка флота не принимается"""
+    memory = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        with pytest.raises(ValueError):
+            SharedFleetReader(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _simulate(name, rounds, ready, done):
+    """Процесс-симулятор: многократно меняет x и y всех лодок одним изменением"""
+    with SharedFleet(10_000, name) as fleet:
+        fleet._append(BoatFleet.from_boats(make_boats(10_000))._take(slice(None)))
+        ready.set()
+        for value in range(1, rounds + 1):
+            with fleet.writing():
+                fleet.x[:] = value
+                fleet.y[:] = value
+        done.wait()
+
+
+def test_snapshot_is_consistent_across_processes():
+    """Снимок не смешивает состояние разных изменений, даже когда пишет другой процесс"""
+    context = multiprocessing.get_context("fork")
+    name = f"boats-test-{os.getpid()}"
+    ready, done = context.Event(), context.Event()
+    simulator = context.Process(target=_simulate, args=(name, 2_000, ready, done))
+    simulator.start()
+    try:
+        assert ready.wait(10)
+        with SharedFleetReader(name) as reader:
+            while True:
+                snapshot = reader.snapshot(("x", "y"))
+                assert np.all(snapshot["x"] == snapshot["x"][0])
+                assert np.array_equal(snapshot["x"], snapshot["y"])
+                if snapshot["x"][0] == 2_000:
+                    break
+    finally:
+        done.set()
+        simulator.join()
+    assert simulator.exitcode == 0
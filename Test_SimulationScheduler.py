@@ -0,0 +1,93 @@
+import pytest
+from RowingBoat import RowingBoat
+from SimulationScheduler import SimulationScheduler
+
+
+def make_boat():
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def test_idle_boats_are_parked():
+    """Неподвижные и затонувшие лодки засыпают, движущиеся - нет"""
+    scheduler = SimulationScheduler(time_step=1.0)
+    idle = make_boat()
+    moving = make_boat()
+    moving.acceleration = 1.0
+    sunk = RowingBoat(500, 550, 4, 2.0, 10.0, 90.0, 150.0)
+    for boat in (idle, moving, sunk):
+        scheduler.add(boat)
+
+    scheduler.tick()
+
+    assert scheduler.is_parked(idle)
+    assert scheduler.is_parked(sunk)
+    assert not scheduler.is_parked(moving)
+    assert scheduler.active_count == 1
+
+
+def test_setter_wakes_parked_boat():
+    """Изменение управления будит спящую лодку"""
+    scheduler = SimulationScheduler(time_step=1.0)
+    boat = make_boat()
+    scheduler.add(boat)
+    scheduler.tick()
+    assert scheduler.is_parked(boat)
+
+    boat.rotation = 0.5
+    assert not scheduler.is_parked(boat)
+    scheduler.tick()
+    assert boat.direction > 0
+
+
+def test_coasting_boat_parks_when_stopped():
+    """Лодка засыпает только после полной остановки"""
+    scheduler = SimulationScheduler(time_step=1.0)
+    boat = make_boat()
+    boat.speed = 0.0
+    boat.rowing_rate = (0.5, 0.5)
+    scheduler.add(boat)
+    scheduler.tick()
+    boat.acceleration = 0.0
+
+    scheduler.tick()
+    assert not scheduler.is_parked(boat)
+    boat.speed = 0.0
+    scheduler.tick()
+    assert scheduler.is_parked(boat)
+
+
+def test_scheduler_matches_plain_loop():
+    """Результат не отличается от вызова move у каждой лодки на каждом шаге"""
+    scheduler = SimulationScheduler(time_step=0.5)
+    boats = [make_boat() for _ in range(3)]
+    reference = [make_boat() for _ in range(3)]
+    for boat in boats:
+        scheduler.add(boat)
+
+    for tick in range(40):
+        if tick == 10:
+            for boat in (boats[1], reference[1]):
+                boat.acceleration = 0.7
+                boat.rotation = -0.2
+        if tick == 25:
+            for boat in (boats[2], reference[2]):
+                boat.rotation = 1.0
+        scheduler.tick()
+        for boat in reference:
+            boat.move(0.5)
+
+    for boat, expected in zip(boats, reference):
+        assert boat.get_state() == expected.get_state()
+    assert scheduler.time == 20.0
+
+
+def test_advance_accumulates_time():
+    """Шаги выполняются по накопленному времени, остаток переносится"""
+    scheduler = SimulationScheduler(time_step=0.1, max_steps_per_advance=5)
+
+    assert scheduler.advance(0.25) == 2
+    assert scheduler.advance(0.06) == 1
+    assert scheduler.ticks == 3
+    assert scheduler.advance(10.0) == 5
+    assert scheduler.advance(0.0) == 1
+    assert scheduler.time == pytest.approx(0.9)
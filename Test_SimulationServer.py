@@ -0,0 +1,67 @@
+import asyncio
+
+import numpy as np
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from SimulationServer import SimulationClient, SimulationServer
+
+
+def make_fleet(size):
+    return BoatFleet.from_boats(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(size))
+
+
+async def _read_until(client, predicate, limit=200):
+    for _ in range(limit):
+        tick, states = await client.read_state()
+        if predicate(states):
+            return tick, states
+    raise AssertionError("Сервер не прислал ожидаемое состояние")
+
+
+def test_controls_and_state_deltas():
+    """Управление по сокету разгоняет лодку, подписчик получает только изменившиеся лодки"""
+    async def scenario():
+        fleet = make_fleet(3)
+        server = SimulationServer(fleet, tick_rate=200.0)
+        await server.start()
+        host, port = server.sockets[0].getsockname()[:2]
+        client = await SimulationClient.connect(host, port)
+        await client.subscribe()
+
+        _, initial = await client.read_state()
+        assert len(initial) == 3
+
+        await client.send_controls([1], [1.0], [0.0])
+        _, states = await _read_until(client, lambda states: len(states) == 1)
+        assert states["id"][0] == 1
+        assert states["speed"][0] > 0
+
+        await client.close()
+        await server.stop()
+        return server.metrics, fleet
+
+    metrics, fleet = asyncio.run(scenario())
+
+    assert metrics.ticks > 0
+    assert fleet.speed[1] > 0
+    assert fleet.speed[0] == fleet.speed[2] == 0
+
+
+def test_unix_socket(tmp_path):
+    """Сервер работает и через Unix-сокет"""
+    async def scenario():
+        fleet = make_fleet(2)
+        server = SimulationServer(fleet, tick_rate=200.0)
+        path = str(tmp_path / "simulation.sock")
+        await server.start(path=path)
+        client = await SimulationClient.connect(path=path)
+        await client.subscribe()
+        await client.send_controls(np.array([0, 1]), [0.5, -0.5], [0.2, 0.0])
+        await _read_until(client, lambda states: len(states) == 2 and (states["speed"] != 0).all())
+        await client.close()
+        await server.stop()
+        return fleet
+
+    fleet = asyncio.run(scenario())
+
+    assert fleet.speed[0] > 0 > fleet.speed[1]
@@ -0,0 +1,75 @@
+import math
+import random
+
+import pytest
+from RowingBoat import RowingBoat
+from SpatialIndex import SpatialIndex
+
+
+@pytest.fixture
+def points():
+    """Фикстура со случайными точками"""
+    rng = random.Random(7)
+    return {index: (rng.uniform(-100, 100), rng.uniform(-100, 100)) for index in range(500)}
+
+
+@pytest.fixture
+def index(points):
+    spatial_index = SpatialIndex(cell_size=10.0)
+    for item, position in points.items():
+        spatial_index.insert(item, position)
+    return spatial_index
+
+
+def test_query_radius_matches_brute_force(index, points):
+    """Поиск в радиусе совпадает с полным перебором"""
+    for center in [(0.0, 0.0), (95.0, -40.0), (-13.3, 27.1)]:
+        expected = {item for item, position in points.items() if math.dist(position, center) <= 25.0}
+        assert set(index.query_radius(center, 25.0)) == expected
+
+
+def test_nearest_matches_brute_force(index, points):
+    """k ближайших совпадают с полным перебором"""
+    for center in [(0.0, 0.0), (300.0, 300.0)]:
+        expected = sorted(points, key=lambda item: math.dist(points[item], center))[:7]
+        assert index.nearest(center, 7) == expected
+
+
+@pytest.mark.parametrize("radius", [3.0, 10.0, 27.0])
+def test_pairs_within_matches_brute_force(index, points, radius):
+    """Пары соседей совпадают с полным перебором, каждая пара встречается один раз"""
+    expected = {frozenset((first, second)) for first in points for second in points
+                if first < second and math.dist(points[first], points[second]) <= radius}
+
+    pairs = index.pairs_within(radius)
+
+    assert len(pairs) == len(expected)
+    assert {frozenset(pair) for pair in pairs} == expected
+
+
+def test_update_and_remove(index):
+    """Перемещение и удаление объектов"""
+    index.update(0, (500.0, 500.0))
+    assert index.query_radius((500.0, 500.0), 1.0) == [0]
+
+    index.remove(0)
+    assert 0 not in index
+    assert index.query_radius((500.0, 500.0), 1.0) == []
+
+
+def test_boat_keeps_index_up_to_date():
+    """Подключённая лодка обновляет своё положение в индексе при движении"""
+    index = SpatialIndex(cell_size=5.0)
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    index.attach(boat)
+    boat.acceleration = 1.0
+    boat.simulate(10, 1.0)
+
+    assert index.position(boat) == boat.position
+    assert index.query_radius(boat.position, 0.1) == [boat]
+
+    boat.position = (-50.0, -50.0)
+    assert index.nearest((-49.0, -49.0)) == [boat]
+
+    index.detach(boat)
+    assert len(index) == 0
@@ -0,0 +1,105 @@
+import itertools
+
+import numpy as np
+import pytest
+from RowingBoat import RowingBoat
+from TrajectoryCompression import (Keyframe, TrajectoryDecoder, boat_samples, compress, record_samples)
+from TrajectoryRecorder import TrajectoryRecorder, read_trajectory
+
+
+def make_boat():
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def changing_controls(boat, n_steps, time_delta, seed=0):
+    """Отсчёты лодки, управление которой меняется каждые 200 шагов"""
+    rng = np.random.default_rng(seed)
+    for chunk in range(0, n_steps, 200):
+        boat.acceleration = rng.uniform(-0.5, 1.0)
+        boat.rotation = rng.choice([0.0, rng.uniform(-0.3, 0.3)])
+        samples = boat_samples(boat, min(200, n_steps - chunk), time_delta)
+        if chunk:
+            next(samples)  # Начальное состояние пачки уже отдано концом предыдущей
+        for time, position, speed, direction in samples:
+            yield time + chunk * time_delta, position, speed, direction
+
+
+def test_position_error_is_bounded():
+    """Каждый отсчёт восстанавливается с ошибкой положения не больше допуска"""
+    samples = list(changing_controls(make_boat(), 5_000, 0.1))
+    keyframes = list(compress(samples, tolerance=0.5))
+    decoder = TrajectoryDecoder(keyframes)
+    times = np.array([sample[0] for sample in samples])
+    actual = np.array([sample[1] for sample in samples])
+    decoded = decoder.sample(times)
+
+    assert np.hypot(*(decoded[:, :2] - actual).T).max() <= 0.5 + 1e-9
+    assert len(keyframes) < len(samples) / 10
+    assert (decoder.start, decoder.end) == (times[0], times[-1])
+    for index in (0, 1234, len(samples) - 1):
+        assert decoder.at(times[index]) == pytest.approx(tuple(decoded[index]))
+
+
+def test_steady_motion_needs_few_keyframes():
+    """Прямой ход и поворот с постоянными скоростью и скоростью поворота почти не требуют кадров"""
+    boat = make_boat()
+    boat.acceleration = 1.0
+    boat.speed = 10.0  # Уже на предельной скорости
+    assert len(list(compress(boat_samples(boat, 10_000, 0.1), tolerance=0.01))) == 2
+
+    boat.rotation = 0.1
+    boat.simulate(1_000, 0.1)  # Скорость выходит на установившееся при повороте значение
+    keyframes = list(compress(boat_samples(boat, 10_000, 0.1), tolerance=0.01))
+    assert len(keyframes) <= 3
+    assert keyframes[-1].turn_rate == pytest.approx(boat._get_turn_rate())
+
+
+def test_speed_and_direction_tolerances():
+    """Допуски скорости и направления ограничивают и их ошибку"""
+    samples = list(changing_controls(make_boat(), 2_000, 0.1, seed=1))
+    decoder = TrajectoryDecoder(compress(samples, tolerance=1.0, speed_tolerance=0.05, direction_tolerance=0.5))
+    decoded = decoder.sample([sample[0] for sample in samples])
+    speed_error = np.abs(decoded[:, 2] - [sample[2] for sample in samples])
+    direction_error = np.abs((decoded[:, 3] - [sample[3] for sample in samples] + 180) % 360 - 180)
+    assert speed_error.max() <= 0.05 + 1e-9
+    assert direction_error.max() <= 0.5 + 1e-9
+
+
+def test_compression_is_lazy():
+    """Сжатие работает на бесконечном потоке отсчётов"""
+    # Равноускоренный ход шагами move по 0.1 с: второй кадр с оценённым ускорением дальше прогнозирует точно
+    endless = ((step * 0.1, (0.0, 0.005 * step * (step + 1)), step * 0.1, 0.0) for step in itertools.count())
+    keyframes = list(itertools.islice(compress(endless, tolerance=0.01), 2))
+    assert [key.time for key in keyframes] == pytest.approx([0.0, 0.2])
+    assert keyframes[-1].acceleration == pytest.approx(1.0)
+    assert keyframes[-1].step == pytest.approx(0.1)
+
+
+def test_recorded_trajectory(tmp_path):
+    """Сжимается и траектория, записанная TrajectoryRecorder"""
+    path = str(tmp_path / "trajectory.bin")
+    boat = make_boat()
+    with TrajectoryRecorder(path) as recorder:
+        recorder.attach(boat)
+        boat.acceleration = 0.8
+        boat.rotation = 0.2
+        boat.simulate(3_000, 0.1)
+    records = read_trajectory(path)
+    decoder = TrajectoryDecoder(compress(record_samples(records), tolerance=0.2))
+    decoded = decoder.sample(records["time"])
+    assert np.hypot(decoded[:, 0] - records["x"], decoded[:, 1] - records["y"]).max() <= 0.2 + 1e-9
+    assert len(decoder) < len(records) / 20
+
+
+def test_decoder_range_and_validation():
+    decoder = TrajectoryDecoder([Keyframe(0.0, 0.0, 0.0, 1.0, 90.0), Keyframe(10.0, 10.0, 0.0, 1.0, 90.0)])
+    assert decoder.at(5.0) == pytest.approx((5.0, 0.0, 1.0, 90.0))
+    with pytest.raises(ValueError):
+        decoder.at(10.5)
+    with pytest.raises(ValueError):
+        decoder.sample([-1.0])
+    with pytest.raises(ValueError):
+        TrajectoryDecoder([])
+    with pytest.raises(ValueError):
+        list(compress([], tolerance=-1.0))
+    assert decoder.sample([]).shape == (0, 4)
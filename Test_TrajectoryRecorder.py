@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from RowingBoat import RowingBoat
+from TrajectoryRecorder import TrajectoryRecorder, read_trajectory
+
+
+@pytest.fixture
+def standard_boat():
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def test_recording_matches_moves(tmp_path, standard_boat):
+    """Каждый вызов move попадает в запись, включая неполные пачки"""
+    path = tmp_path / "trajectory.bin"
+    expected = []
+    with TrajectoryRecorder(str(path), chunk_size=16) as recorder:
+        recorder.attach(standard_boat)
+        standard_boat.acceleration = 1.0
+        standard_boat.rotation = 0.2
+        for _ in range(50):
+            standard_boat.move(0.5)
+            expected.append((*standard_boat.position, standard_boat.speed, standard_boat.direction))
+
+    trajectory = read_trajectory(str(path))
+
+    assert isinstance(trajectory, np.memmap)
+    assert len(trajectory) == 50
+    assert trajectory["time"][-1] == pytest.approx(25.0)
+    assert np.array_equal(np.column_stack([trajectory["x"], trajectory["y"], trajectory["speed"],
+                                           trajectory["direction"]]), np.array(expected))
+    assert trajectory["right_rowing_rate"][0] == 1.0
+
+
+def test_simulate_is_recorded(tmp_path, standard_boat):
+    """simulate тоже записывает каждый шаг"""
+    path = tmp_path / "trajectory.bin"
+    with TrajectoryRecorder(str(path)) as recorder:
+        recorder.attach(standard_boat)
+        standard_boat.acceleration = 1.0
+        final = standard_boat.simulate(30, 1.0)
+
+    trajectory = read_trajectory(str(path))
+    assert len(trajectory) == 30
+    assert (trajectory["x"][-1], trajectory["y"][-1]) == final[:2]
+
+
+def test_flushed_records_readable_before_close(tmp_path, standard_boat):
+    """Сброшенные на диск записи доступны для чтения во время записи"""
+    path = tmp_path / "trajectory.bin"
+    recorder = TrajectoryRecorder(str(path), chunk_size=10)
+    recorder.attach(standard_boat)
+    for _ in range(25):
+        standard_boat.move(1.0)
+
+    assert len(read_trajectory(str(path))) == 20
+    recorder.detach(standard_boat)
+    recorder.close()
+    assert len(read_trajectory(str(path))) == 25
+
+
+def test_one_boat_per_recorder(tmp_path, standard_boat):
+    """Вторую лодку к записи не подключить, а закрытая запись отключает свою лодку"""
+    other = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    with TrajectoryRecorder(str(tmp_path / "trajectory.bin"), chunk_size=4) as recorder:
+        recorder.attach(standard_boat)
+        recorder.attach(standard_boat)
+        with pytest.raises(ValueError):
+            recorder.attach(other)
+        assert other._recorder is None
+        standard_boat.move(1.0)
+
+    for _ in range(10):
+        standard_boat.move(1.0)
+    assert standard_boat._recorder is None
+    assert len(read_trajectory(str(tmp_path / "trajectory.bin"))) == 1
+
+
+def test_not_a_trajectory(tmp_path):
+    """Чужой файл не читается как траектория"""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        read_trajectory(str(path))
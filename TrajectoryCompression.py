@@ -0,0 +1,182 @@
+"""
+Потоковое сжатие траекторий ключевыми кадрами с прогнозом по кинематике лодки (dead reckoning).
+
+Ключевой кадр хранит состояние лодки, скорости его изменения - ускорение (м/с^2) и скорость поворота (град/с) -
+и шаг step, с которым лодку двигали. Между кадрами прогноз повторяет схему Boat.move с постоянными
+ускорением и скоростью поворота: на каждом шаге скорость и курс меняются, затем лодка проходит отрезок по новому
+курсу. Сумма этих отрезков берётся в замкнутом виде, так что прогноз на любое время стоит O(1), а на моменты
+шагов совпадает с move с точностью округления; при step = 0 схема переходит в непрерывное движение по дуге.
+Сжатие сравнивает каждый отсчёт с прогнозом от последнего кадра и ставит новый кадр, как только отклонение
+положения превышает tolerance, поэтому ни один отсчёт исходной траектории не восстанавливается с ошибкой
+положения больше tolerance. Скорости изменения и шаг нового кадра оцениваются по нему и предыдущему отсчёту,
+так что сжатию нужен только один отсчёт памяти.
+"""
+import bisect
+import math
+from typing import Iterable, Iterator, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from RowingBoat import RowingBoat
+
+Sample = Tuple[float, Tuple[float, float], float, float]  # t, (x, y), скорость, направление
+
+# При меньшем повороте за интервал прогноза поперечный сдвиг от ускорения считается по ряду Тейлора
+_SMALL_TURN = 1e-3  # рад
+
+
+class Keyframe(NamedTuple):
+    time: float
+    x: float
+    y: float
+    speed: float
+    direction: float
+    acceleration: float = 0.0  # м/с^2
+    turn_rate: float = 0.0  # град/с
+    step: float = 0.0  # Шаг move, с; 0 - непрерывное движение
+
+
+def _predict(key: Keyframe, elapsed: float) -> Tuple[float, float, float, float]:
+    """Состояние (x, y, скорость, направление) через elapsed секунд после кадра key"""
+    speed, acceleration, step = key.speed, key.acceleration, key.step
+    omega = math.radians(key.turn_rate)
+    half_step = omega * step / 2  # Половина поворота за шаг
+    half_turn = omega * elapsed / 2  # Половина поворота за весь интервал
+    # Отрезки шагов складываются в хорду по курсу середины, укороченную множителем sinc
+    ratio = half_step / math.sin(half_step) if half_step else 1.0
+    chord = elapsed * ratio * (math.sin(half_turn) / half_turn if half_turn else 1.0)
+    along = chord * (speed + acceleration * (elapsed + step) / 2)
+    # Отрезки последних шагов длиннее при ускорении и повёрнуты дальше: хорда смещается вбок
+    if max(abs(half_turn), abs(half_step)) < _SMALL_TURN:
+        across = -acceleration * omega * (elapsed ** 3 - elapsed * step ** 2) / 12
+    else:
+        across = (2 * acceleration * ratio / omega ** 2
+                  * (half_turn * math.cos(half_turn) - ratio * math.sin(half_turn) * math.cos(half_step)))
+    heading = math.radians(key.direction) + half_turn + half_step
+    sin, cos = math.sin(heading), math.cos(heading)
+    return (key.x + along * sin - across * cos, key.y + along * cos + across * sin,
+            speed + acceleration * elapsed, (key.direction + key.turn_rate * elapsed) % 360.0)
+
+
+def _angle_difference(first: float, second: float) -> float:
+    """first - second в градусах, приведённая к [-180, 180)"""
+    return (first - second + 180.0) % 360.0 - 180.0
+
+
+def compress(samples: Iterable[Sample],
+             tolerance: float,
+             speed_tolerance: float = math.inf,
+             direction_tolerance: float = math.inf) -> Iterator[Keyframe]:
+    """
+    Сжимает поток отсчётов (t, (x, y), скорость, направление) с возрастающим t в поток ключевых кадров.
+    Кадр отдаётся, как только он определён, поэтому поток отсчётов может быть бесконечным.
+    Первый и последний отсчёты всегда становятся кадрами. speed_tolerance (м/с) и direction_tolerance (град)
+    дополнительно ограничивают ошибку скорости и направления.
+    """
+    if tolerance < 0 or speed_tolerance < 0 or direction_tolerance < 0:
+        raise ValueError("Допуски сжатия не могут быть отрицательными")
+    key = previous = earlier = None
+    for time, (x, y), speed, direction in samples:
+        if key is None:
+            key = Keyframe(time, x, y, speed, direction)
+            yield key
+        else:
+            predicted_x, predicted_y, predicted_speed, predicted_direction = _predict(key, time - key.time)
+            if (math.hypot(predicted_x - x, predicted_y - y) > tolerance
+                    or abs(predicted_speed - speed) > speed_tolerance
+                    or abs(_angle_difference(predicted_direction, direction)) > direction_tolerance):
+                key = _keyframe(previous, time, x, y, speed, direction)
+                yield key
+        earlier, previous = previous, (time, x, y, speed, direction)
+    if previous is not None and previous[0] != key.time:
+        yield _keyframe(earlier, *previous)
+
+
+def _keyframe(previous: tuple, time: float, x: float, y: float, speed: float, direction: float) -> Keyframe:
+    """Кадр в отсчёте со скоростями изменения и шагом, оценёнными по предыдущему отсчёту"""
+    previous_time, _, _, previous_speed, previous_direction = previous
+    interval = time - previous_time
+    if interval <= 0:
+        return Keyframe(time, x, y, speed, direction)
+    return Keyframe(time, x, y, speed, direction, (speed - previous_speed) / interval,
+                    _angle_difference(direction, previous_direction) / interval, interval)
+
+
+class TrajectoryDecoder:
+    """Восстанавливает состояние лодки в любой момент между первым и последним ключевым кадром"""
+
+    def __init__(self, keyframes: Iterable[Keyframe]):
+        self._keyframes = list(keyframes)
+        if not self._keyframes:
+            raise ValueError("Нет ключевых кадров")
+        self._times = [key.time for key in self._keyframes]
+        if any(b <= a for a, b in zip(self._times, self._times[1:])):
+            raise ValueError("Время ключевых кадров должно возрастать")
+        self._columns = np.array(self._keyframes, dtype=np.float64).T  # По строке на поле Keyframe
+
+    def __len__(self) -> int:
+        return len(self._keyframes)
+
+    @property
+    def start(self) -> float:
+        return self._times[0]
+
+    @property
+    def end(self) -> float:
+        return self._times[-1]
+
+    def _check(self, low: float, high: float) -> None:
+        if low < self.start or high > self.end:
+            raise ValueError(f"Траектория известна только с {self.start} по {self.end} с")
+
+    def at(self, time: float) -> Tuple[float, float, float, float]:
+        """(x, y, скорость, направление) в момент time"""
+        self._check(time, time)
+        key = self._keyframes[max(bisect.bisect_right(self._times, time) - 1, 0)]
+        return _predict(key, time - key.time)
+
+    def sample(self, times: Sequence[float]) -> np.ndarray:
+        """То же, что at, сразу для многих моментов: массив (len(times), 4)"""
+        times = np.asarray(times, dtype=np.float64)
+        if not len(times):
+            return np.empty((0, 4))
+        self._check(times.min(), times.max())
+        index = np.maximum(np.searchsorted(self._times, times, side="right") - 1, 0)
+        _, x, y, speed, direction, acceleration, turn_rate, step = self._columns[:, index]
+        elapsed = times - self._columns[0, index]
+        omega = np.radians(turn_rate)
+        half_step = omega * step / 2
+        half_turn = omega * elapsed / 2
+        # Те же формулы, что в _predict; np.sinc(t) = sin(pi * t) / (pi * t)
+        ratio = 1.0 / np.sinc(half_step / np.pi)
+        chord = elapsed * ratio * np.sinc(half_turn / np.pi)
+        along = chord * (speed + acceleration * (elapsed + step) / 2)
+        small = np.maximum(np.abs(half_turn), np.abs(half_step)) < _SMALL_TURN
+        safe_omega = np.where(small, 1.0, omega)
+        across = np.where(small, -acceleration * omega * (elapsed ** 3 - elapsed * step ** 2) / 12,
+                          2 * acceleration * ratio / safe_omega ** 2
+                          * (half_turn * np.cos(half_turn) - ratio * np.sin(half_turn) * np.cos(half_step)))
+        heading = np.radians(direction) + half_turn + half_step
+        sin, cos = np.sin(heading), np.cos(heading)
+        return np.column_stack([x + along * sin - across * cos, y + along * cos + across * sin,
+                                speed + acceleration * elapsed,
+                                np.remainder(direction + turn_rate * elapsed, 360.0)])
+
+
+def boat_samples(boat: RowingBoat, n_steps: int, time_delta: float) -> Iterator[Sample]:
+    """Отсчёты лодки: начальное состояние и состояние после каждого из n_steps вызовов move"""
+    time = 0.0
+    yield time, boat.position, boat.speed, boat.direction
+    for step in range(1, n_steps + 1):
+        boat.move(time_delta)
+        time = step * time_delta
+        yield time, boat.position, boat.speed, boat.direction
+
+
+def record_samples(records: np.ndarray) -> Iterator[Sample]:
+    """Отсчёты из траектории TrajectoryRecorder (см. read_trajectory), читаемой пачками"""
+    for start in range(0, len(records), 4096):
+        chunk = records[start:start + 4096]
+        for time, x, y, speed, direction in zip(chunk["time"].tolist(), chunk["x"].tolist(), chunk["y"].tolist(),
+                                                chunk["speed"].tolist(), chunk["direction"].tolist()):
+            yield time, (x, y), speed, direction
@@ -0,0 +1,118 @@
+import os
+import struct
+from array import array
+
+import numpy as np
+
+from RowingBoat import RowingBoat
+
+# Запись траектории: время с начала записи и состояние лодки после шага
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("speed", "<f8"),
+    ("direction", "<f8"),
+    ("left_rowing_rate", "<f8"),
+    ("right_rowing_rate", "<f8"),
+])
+
+# Заголовок файла: сигнатура, версия формата, число записей
+_HEADER = struct.Struct("<4sIQ")
+_MAGIC = b"BTRJ"
+_VERSION = 1
+
+
+class TrajectoryRecorder:
+    """
+    Пишет траекторию одной лодки в двоичный файл записями фиксированной длины.
+    Записи копятся в буфере и сбрасываются на диск пачками по chunk_size.
+    Место в файле выделяется заранее и удваивается по мере заполнения.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 4096):
+        self._chunk_size = chunk_size
+        self._buffer = array("d")
+        self._buffer_limit = chunk_size * len(RECORD_DTYPE.names)
+        self._time = 0.0
+        self._boat = None  # Записываемая лодка
+        self._count = 0  # Записей на диске
+        self._capacity = 0  # Записей, под которые выделено место в файле
+        self._file = open(path, "w+b")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0))
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count + len(self._buffer) // len(RECORD_DTYPE.names)
+
+    def attach(self, boat: RowingBoat) -> None:
+        """
+        Начинает записывать каждый вызов move у лодки. В записях нет номера лодки, а время общее,
+        поэтому к одному файлу можно подключить только одну лодку.
+        """
+        if self._boat is not None and self._boat is not boat:
+            raise ValueError("К записи уже подключена другая лодка")
+        if self._file.closed:
+            raise ValueError("Запись траектории закрыта")
+        self._boat = boat
+        boat._recorder = self
+
+    def detach(self, boat: RowingBoat) -> None:
+        """Прекращает запись лодки"""
+        if boat._recorder is self:
+            boat._recorder = None
+        if self._boat is boat:
+            self._boat = None
+
+    def record(self, boat: RowingBoat, time_delta: float) -> None:
+        """Добавляет состояние лодки после шага time_delta"""
+        self._time += time_delta
+        x, y = boat._position
+        self._buffer.extend((self._time, x, y, boat._speed, boat._direction,
+                             boat._left_rowing_rate, boat._right_rowing_rate))
+        if len(self._buffer) >= self._buffer_limit:
+            self.flush()
+
+    def flush(self) -> None:
+        """Сбрасывает накопленные записи на диск и обновляет заголовок"""
+        count = len(self._buffer) // len(RECORD_DTYPE.names)
+        if not count:
+            return
+        if self._count + count > self._capacity:
+            self._capacity = max(self._count + count, 2 * self._capacity, self._chunk_size)
+            self._file.truncate(_HEADER.size + self._capacity * RECORD_DTYPE.itemsize)
+        self._file.seek(_HEADER.size + self._count * RECORD_DTYPE.itemsize)
+        self._file.write(self._buffer.tobytes())
+        del self._buffer[:]
+        self._count += count
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self._count))
+        self._file.flush()
+
+    def close(self) -> None:
+        """Сбрасывает остаток буфера, отключает лодку и закрывает файл"""
+        if self._file.closed:
+            return
+        if self._boat is not None:
+            self.detach(self._boat)
+        self.flush()
+        self._file.truncate(_HEADER.size + self._count * RECORD_DTYPE.itemsize)
+        self._file.close()
+
+
+def read_trajectory(path: str) -> np.ndarray:
+    """Отображает записанную траекторию в память без копирования. Поля - как в RECORD_DTYPE"""
+    with open(path, "rb") as file:
+        magic, version, count = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Файл {path} не является траекторией поддерживаемой версии")
+    if os.path.getsize(path) < _HEADER.size + count * RECORD_DTYPE.itemsize:
+        raise ValueError(f"Файл траектории {path} обрезан")
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER.size, shape=(count,))
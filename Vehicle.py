@@ -1,10 +1,17 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Tuple
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Tuple
 
 
 class Vehicle(ABC):
     """Абстрактный базовый класс для транспортных средств"""
 
+    __slots__ = ()
+
     @abstractmethod
     def move(self, time_delta: float) -> None:
         """Обновить положение транспортного средства"""
@@ -0,0 +1,60 @@
+"""
+Время сохранения и восстановления контрольной точки флота в 1 000 000 лодок.
+Запуск из корня репозитория: python -m benchmarks.bench_checkpoint [каталог]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from Checkpoint import CheckpointWriter, load_checkpoint, save_checkpoint
+from RowingBoat import RowingBoat
+
+SIZE = 1_000_000
+
+
+def _fleet() -> BoatFleet:
+    fleet = BoatFleet(SIZE)
+    prototype = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    fleet.add(prototype)
+    for column in fleet._columns.values():
+        column[:] = column[0]
+    fleet._size = SIZE
+    fleet.set_controls(np.arange(SIZE), np.random.default_rng(0).uniform(-1, 1, SIZE), 0.1)
+    fleet.step(1.0)
+    return fleet
+
+
+def main(directory: str) -> None:
+    fleet = _fleet()
+    path = os.path.join(directory, "bench.ckpt")
+
+    start = time.perf_counter()
+    save_checkpoint(path, fleet)
+    saved = time.perf_counter() - start
+    size = os.path.getsize(path)
+
+    with CheckpointWriter(path) as writer:
+        start = time.perf_counter()
+        future = writer.write(fleet)
+        stall = time.perf_counter() - start
+        future.result()
+        background = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_checkpoint(path)
+    loaded = time.perf_counter() - start
+    os.remove(path)
+
+    print(f"лодок: {SIZE}, файл: {size / 2 ** 20:.1f} МиБ")
+    print(f"сохранение:          {saved * 1e3:8.1f} мс")
+    print(f"фоновое, пауза цикла:{stall * 1e3:8.1f} мс (всего {background * 1e3:.1f} мс)")
+    print(f"восстановление:      {loaded * 1e3:8.1f} мс")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as default:
+        main(sys.argv[1] if len(sys.argv) > 1 else default)
@@ -0,0 +1,55 @@
+"""
+Сжатие траекторий: степень сжатия, пропускная способность сжатия и восстановления и наибольшая ошибка
+положения на длинных прогонах move - с редкой и с частой сменой управления.
+Запуск из корня репозитория: python -m benchmarks.bench_compression [число шагов]
+"""
+import sys
+import time
+
+import numpy as np
+
+from RowingBoat import RowingBoat
+from TrajectoryCompression import TrajectoryDecoder, compress
+
+TIME_DELTA = 0.1  # с
+TOLERANCES = (0.01, 0.1, 1.0)  # м
+
+
+def _samples(n_steps: int, period: int) -> list:
+    """Отсчёты лодки, управление которой меняется каждые period шагов"""
+    rng = np.random.default_rng(0)
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    samples = [(0.0, boat.position, boat.speed, boat.direction)]
+    for start in range(0, n_steps, period):
+        boat.acceleration = rng.uniform(-0.5, 1.0)
+        boat.rotation = rng.choice([0.0, rng.uniform(-0.3, 0.3)])
+        for step in range(start + 1, min(start + period, n_steps) + 1):
+            boat.move(TIME_DELTA)
+            samples.append((step * TIME_DELTA, boat.position, boat.speed, boat.direction))
+    return samples
+
+
+def main(n_steps: int) -> None:
+    print(f"шагов: {n_steps}, шаг {TIME_DELTA} с")
+    for period in (2_000, 100):
+        samples = _samples(n_steps, period)
+        times = np.array([sample[0] for sample in samples])
+        actual = np.array([sample[1] for sample in samples])
+        print(f"смена управления каждые {period} шагов:")
+        for tolerance in TOLERANCES:
+            start = time.perf_counter()
+            keyframes = list(compress(samples, tolerance))
+            compressing = time.perf_counter() - start
+            decoder = TrajectoryDecoder(keyframes)
+            start = time.perf_counter()
+            decoded = decoder.sample(times)
+            decoding = time.perf_counter() - start
+            error = np.hypot(*(decoded[:, :2] - actual).T).max()
+            ratio = len(samples) / len(keyframes)
+            print(f"  допуск {tolerance:5.2f} м: кадров {len(keyframes):6d}, степень {ratio:7.1f}x, "
+                  f"ошибка {error:.4f} м, сжатие {len(samples) / compressing / 1e6:5.2f} млн отсчётов/с, "
+                  f"восстановление {len(samples) / decoding / 1e6:6.2f} млн отсчётов/с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+"""
+Ансамбль Монте-Карло: пропускная способность пакетного прогона в сравнении с отдельным циклом
+RowingBoat + Autopilot на каждого участника.
+Запуск из корня репозитория: python -m benchmarks.bench_ensemble [число участников]
+"""
+import sys
+import time
+
+from Autopilot import Autopilot, Route
+from Ensemble import Disturbances, Scenario, run_ensemble
+from ParameterSweep import DEFAULTS
+from RowingBoat import RowingBoat
+
+SCENARIO = Scenario(waypoints=[(0.0, 0.0), (0.0, 500.0), (300.0, 900.0)], horizon=1800.0)
+DISTURBANCES = Disturbances(force_spread=0.1, gust_sigma=0.2, current=(0.3, 0.0), current_spread=0.1)
+SINGLE_RUNS = 20
+
+
+def _single_run() -> None:
+    """Один участник без возмущений - нижняя граница цены прежнего цикла на участника"""
+    boat = RowingBoat(**DEFAULTS)
+    route = Route(SCENARIO.waypoints)
+    boat.direction = float(route.headings[0])
+    autopilot = Autopilot([boat], SCENARIO.lookahead, SCENARIO.cruise, SCENARIO.arrival_radius)
+    autopilot.assign([0], route)
+    for _ in range(round(SCENARIO.horizon / SCENARIO.time_delta)):
+        if len(autopilot.update()):
+            break
+        boat.move(SCENARIO.time_delta)
+
+
+def main(members: int) -> None:
+    start = time.perf_counter()
+    for _ in range(SINGLE_RUNS):
+        _single_run()
+    single = (time.perf_counter() - start) / SINGLE_RUNS
+
+    start = time.perf_counter()
+    summary = run_ensemble(SCENARIO, DISTURBANCES, members, seed=0)
+    batched = (time.perf_counter() - start) / members
+
+    statistics = summary.arrival_time
+    print(f"участников: {members}, дошли: {summary.arrived}")
+    print(f"время прибытия: среднее {statistics.mean:.1f} с, ско {statistics.std:.1f} с, "
+          f"медиана {statistics.quantile(0.5):.1f} с, 90% {statistics.quantile(0.9):.1f} с")
+    print(f"цикл на участника:  {single * 1e3:8.3f} мс/участник")
+    print(f"пакетный ансамбль:  {batched * 1e3:8.3f} мс/участник  ({single / batched:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,64 @@
+"""
+Поле течения: время выборки для 100 000 лодок за шаг из сетки 2000 x 2000, открытой из файла .npy.
+Запуск из корня репозитория: python -m benchmarks.bench_environment [число лодок]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from Environment import Environment, VectorField
+from RowingBoat import RowingBoat
+
+SIDE = 2000  # Узлов сетки по каждой оси
+CELL = 10.0  # м
+STEPS = 50
+
+
+def main(size: int) -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "current.npy")
+        np.save(path, rng.normal(0.0, 0.5, (SIDE, SIDE, 2)))
+        field = VectorField.load(path, cell_size=CELL)
+        # Лодки в квадрате 5 x 5 км посреди сетки 20 x 20 км
+        x = rng.uniform(7_500.0, 12_500.0, size)
+        y = rng.uniform(7_500.0, 12_500.0, size)
+
+        start = time.perf_counter()
+        field.sample(x, y)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            field.sample(x, y)
+        sample = (time.perf_counter() - start) / STEPS
+
+        fleet = BoatFleet(size)
+        fleet.add(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0))
+        fleet._append(fleet._take(np.zeros(size - 1, dtype=np.intp)))
+        fleet.x[:], fleet.y[:] = x, y
+        fleet.set_controls(np.arange(size), 1.0, 0.1)
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            fleet.step(1.0)
+        still = (time.perf_counter() - start) / STEPS
+        fleet.environment = Environment(current=field)
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            fleet.step(1.0)
+        drifting = (time.perf_counter() - start) / STEPS
+
+        filled = field._caches[0]._filled
+        print(f"лодок: {size}, сетка {SIDE} x {SIDE}, заполнено плиток: {filled.sum()} из {filled.size}")
+        print(f"первая выборка (с заполнением плиток): {first * 1e3:8.2f} мс")
+        print(f"выборка поля:                          {sample * 1e3:8.2f} мс")
+        print(f"шаг флота в стоячей воде:              {still * 1e3:8.2f} мс")
+        print(f"шаг флота в поле течения:              {drifting * 1e3:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,32 @@
+"""
+Время импорта модулей модели по python -X importtime (лучшее из нескольких запусков).
+Запуск из корня репозитория: python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+MODULES = ("RowingBoat", "Integrators", "SimulationScheduler", "SpatialIndex", "BoatFleet",
+           "TrajectoryRecorder", "Replay", "Checkpoint", "SimulationServer", "ShardedFleet")
+RUNS = 5
+
+
+def import_time(module: str) -> int:
+    """Накопленное время импорта модуля в отдельном процессе, мкс"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise RuntimeError(f"В выводе -X importtime нет модуля {module}")
+
+
+def main() -> None:
+    print(f"{'модуль':<22} {'импорт, мс':>11}")
+    for module in MODULES:
+        best = min(import_time(module) for _ in range(RUNS))
+        print(f"{module:<22} {best / 1e3:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
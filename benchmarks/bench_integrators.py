@@ -0,0 +1,64 @@
+"""
+Сколько шагов нужно каждой схеме интегрирования, чтобы пройти поворот с заданной точностью.
+Запуск из корня репозитория: python -m benchmarks.bench_integrators
+"""
+import math
+import time
+
+from Integrators import RK45Integrator, RK4Integrator
+from RowingBoat import RowingBoat
+
+DURATION = 120.0  # с
+TOLERANCES = (1.0, 1e-2, 1e-4)  # м, отклонение конечной точки от эталона
+MAX_STEPS = 1_000_000
+
+
+def _boat(integrator=None) -> RowingBoat:
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    boat.acceleration = 0.8
+    boat.rotation = 0.1
+    boat.integrator = integrator
+    return boat
+
+
+def _run(integrator, steps):
+    boat = _boat(integrator)
+    start = time.perf_counter()
+    boat.simulate(steps, DURATION / steps)
+    return boat.position, time.perf_counter() - start
+
+
+def _steps_to_tolerance(make_integrator, reference, tolerance):
+    """Наименьшее число шагов из ряда 1, 2, 4, ..., при котором ошибка не больше tolerance"""
+    steps = 1
+    while steps <= MAX_STEPS:
+        position, elapsed = _run(make_integrator(), steps)
+        if math.dist(position, reference) <= tolerance:
+            return steps, elapsed
+        steps *= 2
+    return None, None
+
+
+def _adaptive(reference, tolerance):
+    """RK45 делает один внешний шаг, подшаги выбирает сам; точность подшага ужесточена с запасом"""
+    integrator = RK45Integrator(tolerance=tolerance * 1e-3)
+    position, elapsed = _run(integrator, 1)
+    return integrator.substeps, elapsed, math.dist(position, reference)
+
+
+def main() -> None:
+    reference, _ = _run(RK4Integrator(), 120_000)
+    print(f"{'точность, м':>12} {'схема':>8} {'шагов':>8} {'время':>10}")
+    for tolerance in TOLERANCES:
+        for name, make_integrator in (("эйлер", lambda: None), ("rk4", RK4Integrator)):
+            steps, elapsed = _steps_to_tolerance(make_integrator, reference, tolerance)
+            if steps is None:
+                print(f"{tolerance:>12g} {name:>8} {'>' + str(MAX_STEPS):>8} {'-':>10}")
+            else:
+                print(f"{tolerance:>12g} {name:>8} {steps:>8} {elapsed * 1e3:8.2f}мс")
+        substeps, elapsed, error = _adaptive(reference, tolerance)
+        print(f"{tolerance:>12g} {'rk45':>8} {substeps:>8} {elapsed * 1e3:8.2f}мс  (ошибка {error:.2g} м)")
+
+
+if __name__ == "__main__":
+    main()
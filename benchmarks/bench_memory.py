@@ -0,0 +1,60 @@
+"""
+Сравнение памяти на одну лодку: прежняя раскладка с __dict__, __slots__, снимки BoatState.
+Запуск из корня репозитория: python -m benchmarks.bench_memory
+"""
+import tracemalloc
+
+from BoatState import RECORD_SIZE, pack_states
+from RowingBoat import RowingBoat
+
+COUNT = 100_000
+
+# Атрибуты RowingBoat в порядке полей BoatState (без координат и флага плавучести)
+_FIELDS = ("max_weight", "_weight", "_max_speed", "_max_rotation", "_max_force", "_rowers_count",
+           "_max_rowing_frequency", "_acceleration", "_rotation", "_rowing_frequency",
+           "_left_rowing_rate", "_right_rowing_rate", "_speed", "_direction")
+
+
+class _DictLayout:
+    """Лодка с атрибутами в __dict__, как до перехода на __slots__"""
+
+
+def _make_boat() -> RowingBoat:
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+def _make_dict_boat() -> _DictLayout:
+    boat = _DictLayout()
+    for name, value in zip(_FIELDS, _make_boat().get_state()):
+        setattr(boat, name, value)
+    boat._position = (0.0, 0.0)
+    boat._is_afloat = True
+    return boat
+
+
+def measure(factory) -> float:
+    """Возвращает среднее число байт на объект, созданный factory"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / COUNT
+
+
+def main() -> None:
+    boat = _make_boat()
+    results = {
+        "RowingBoat с __dict__": measure(_make_dict_boat),
+        "RowingBoat с __slots__": measure(_make_boat),
+        "BoatState": measure(boat.get_state),
+        "упакованный BoatState": len(pack_states([boat.get_state()] * COUNT)) / COUNT,
+    }
+    for name, size in results.items():
+        print(f"{name:<25} {size:8.1f} байт")
+    assert results["упакованный BoatState"] == RECORD_SIZE
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Набор замеров производительности модели лодки.
+
+Запуск отдельным скриптом из корня репозитория:
+    python -m benchmarks.bench_model --output results.json
+    python -m benchmarks.bench_model --baseline results.json --threshold 0.1
+Во втором случае скрипт завершится с кодом 1, если какой-то замер стал медленнее базового больше чем на threshold.
+
+Запуск через pytest (базовые результаты - через переменную окружения BENCHMARK_BASELINE):
+    pytest benchmarks/bench_model.py
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import pytest
+
+from Autopilot import Autopilot, Route
+from BoatFleet import BoatFleet
+from LevelOfDetail import LevelOfDetail
+from RowingBoat import RowingBoat
+
+# Зарегистрированные замеры: имя -> (подготовка, число вызовов в одном повторе)
+_BENCHMARKS: Dict[str, tuple] = {}
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline: float  # с на вызов
+    current: float  # с на вызов
+
+    @property
+    def slowdown(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def benchmark(name: str, number: int):
+    """
+    Регистрирует замер. Декорируемая функция готовит данные и возвращает замеряемую функцию без аргументов,
+    так что подготовка в замер не попадает.
+    """
+    def register(setup: Callable[[], Callable[[], object]]):
+        _BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+def _standard_boat() -> RowingBoat:
+    return RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+
+
+@benchmark("move", number=100_000)
+def _move():
+    boat = _standard_boat()
+    boat.acceleration = 1.0
+    boat.rotation = 0.1
+    return lambda: boat.move(0.1)
+
+
+@benchmark("construction", number=50_000)
+def _construction():
+    return _standard_boat
+
+
+@benchmark("from_arrays_1000_boats", number=50)
+def _from_arrays():
+    columns = [[value] * 1000 for value in (500, 300, 4, 2.0, 10.0, 90.0, 150.0)]
+    return lambda: RowingBoat.from_arrays(*columns)
+
+
+@benchmark("speed_getter", number=500_000)
+def _speed_getter():
+    boat = _standard_boat()
+    return lambda: boat.speed
+
+
+@benchmark("velocity_getter", number=500_000)
+def _velocity_getter():
+    boat = _standard_boat()
+    boat.acceleration = 1.0
+    boat.rotation = 0.1
+    boat.move(0.1)
+    return lambda: boat.velocity
+
+
+@benchmark("rotation_setter", number=200_000)
+def _rotation_setter():
+    boat = _standard_boat()
+    boat.acceleration = 1.0
+
+    def set_rotation():
+        boat.rotation = 0.3
+    return set_rotation
+
+
+@benchmark("acceleration_setter", number=200_000)
+def _acceleration_setter():
+    boat = _standard_boat()
+
+    def set_acceleration():
+        boat.acceleration = 0.7
+    return set_acceleration
+
+
+@benchmark("simulate_10000_steps", number=20)
+def _simulate():
+    boat = _standard_boat()
+    boat.acceleration = 1.0
+    boat.rotation = 0.1
+    return lambda: boat.simulate(10_000, 0.1)
+
+
+@benchmark("fleet_step_10000_boats", number=200)
+def _fleet_step():
+    boats = [_standard_boat() for _ in range(10_000)]
+    for index, boat in enumerate(boats):
+        boat.acceleration = (index % 21 - 10) / 10
+        boat.rotation = (index % 7 - 3) / 3
+    fleet = BoatFleet.from_boats(boats)
+    return lambda: fleet.step(0.1)
+
+
+@benchmark("fleet_set_controls_10000_boats", number=200)
+def _fleet_set_controls():
+    fleet = BoatFleet.from_boats(_standard_boat() for _ in range(10_000))
+    ids = list(range(10_000))
+    accelerations = [(index % 21 - 10) / 10 for index in ids]
+    rotations = [(index % 7 - 3) / 3 for index in ids]
+    return lambda: fleet.set_controls(ids, accelerations, rotations)
+
+
+@benchmark("autopilot_update_10000_boats", number=100)
+def _autopilot_update():
+    fleet = BoatFleet.from_boats(_standard_boat() for _ in range(10_000))
+    route = Route([(100.0 * (index % 2), 100.0 * index) for index in range(1000)])
+    autopilot = Autopilot(fleet)
+    autopilot.assign(range(10_000), route)
+    return autopilot.update
+
+
+@benchmark("lod_step_10000_boats", number=200)
+def _lod_step():
+    fleet = BoatFleet.from_boats(_standard_boat() for _ in range(10_000))
+    fleet.x[:] = [100.0 * index for index in range(10_000)]  # Рядом с наблюдателем - одна лодка из ста
+    fleet.set_controls(range(10_000), 1.0, 0.1)
+    lod = LevelOfDetail(fleet, radius=5_000.0, stride=10)
+    lod.add_observer((0.0, 0.0))
+    return lambda: lod.step(0.1)
+
+
+def run(names: Optional[Sequence[str]] = None, repeat: int = 5) -> Dict[str, float]:
+    """Выполняет замеры и возвращает лучшее время одного вызова в секундах"""
+    results = {}
+    for name in names or _BENCHMARKS:
+        setup, number = _BENCHMARKS[name]
+        function = setup()
+        results[name] = min(timeit.repeat(function, number=number, repeat=repeat)) / number
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Regression]:
+    """Замеры, ставшие медленнее базовых больше чем на долю threshold"""
+    return [Regression(name, baseline[name], current) for name, current in results.items()
+            if name in baseline and current > baseline[name] * (1 + threshold)]
+
+
+def save(results: Dict[str, float], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, float]:
+    with open(path) as file:
+        return json.load(file)
+
+
+@pytest.mark.parametrize("name", list(_BENCHMARKS))
+def test_benchmark(name):
+    """Замер не медленнее базового, если базовые результаты заданы"""
+    result = run([name], repeat=3)
+    baseline_path = os.environ.get("BENCHMARK_BASELINE")
+    if baseline_path:
+        threshold = float(os.environ.get("BENCHMARK_THRESHOLD", "0.1"))
+        assert compare(result, load(baseline_path), threshold) == []
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности модели лодки")
+    parser.add_argument("names", nargs="*", help="замеры для запуска, по умолчанию все")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON с базовыми результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустимое замедление, доля")
+    args = parser.parse_args(argv)
+
+    results = run(args.names, args.repeat)
+    baseline = load(args.baseline) if args.baseline else {}
+    for name, seconds in results.items():
+        line = f"{name:<25} {seconds * 1e6:12.3f} мкс/вызов"
+        if name in baseline:
+            line += f"  {(seconds / baseline[name] - 1) * 100:+7.1f} %"
+        print(line)
+    if args.output:
+        save(results, args.output)
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression.name}: медленнее на {regression.slowdown * 100:.1f} %")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
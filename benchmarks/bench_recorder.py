@@ -0,0 +1,38 @@
+"""
+Замедление move при записи траектории.
+Запуск из корня репозитория: python -m benchmarks.bench_recorder
+"""
+import os
+import tempfile
+import timeit
+
+from RowingBoat import RowingBoat
+from TrajectoryRecorder import TrajectoryRecorder
+
+STEPS = 200_000
+
+
+def _moving_boat() -> RowingBoat:
+    boat = RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0)
+    boat.acceleration = 1.0
+    boat.rotation = 0.1
+    return boat
+
+
+def main() -> None:
+    boat = _moving_boat()
+    plain = min(timeit.repeat(lambda: boat.move(0.1), number=STEPS, repeat=5))
+
+    with tempfile.TemporaryDirectory() as directory:
+        with TrajectoryRecorder(os.path.join(directory, "trajectory.bin")) as recorder:
+            boat = _moving_boat()
+            recorder.attach(boat)
+            recorded = min(timeit.repeat(lambda: boat.move(0.1), number=STEPS, repeat=5))
+
+    print(f"move без записи: {plain / STEPS * 1e9:8.1f} нс/шаг")
+    print(f"move с записью:  {recorded / STEPS * 1e9:8.1f} нс/шаг")
+    print(f"замедление:      {(recorded / plain - 1) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Нагрузка сервера симуляции: 10 000 движущихся лодок на 60 Гц с одним подписчиком.
+Запуск из корня репозитория: python -m benchmarks.bench_server
+"""
+import asyncio
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from SimulationServer import SimulationClient, SimulationServer
+
+BOATS = 10_000
+TICK_RATE = 60.0
+DURATION = 5.0
+
+
+async def _consume(client: SimulationClient) -> None:
+    while True:
+        await client.read_state()
+
+
+async def main() -> None:
+    fleet = BoatFleet.from_boats(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0) for _ in range(BOATS))
+    server = SimulationServer(fleet, tick_rate=TICK_RATE)
+    await server.start()
+    host, port = server.sockets[0].getsockname()[:2]
+    client = await SimulationClient.connect(host, port)
+    await client.subscribe()
+    consumer = asyncio.create_task(_consume(client))
+
+    ids = np.arange(BOATS)
+    rng = np.random.default_rng(0)
+    await client.send_controls(ids, rng.uniform(-1, 1, BOATS), rng.uniform(-1, 1, BOATS))
+    await asyncio.sleep(DURATION)
+
+    consumer.cancel()
+    await client.close()
+    await server.stop()
+    metrics = server.metrics
+    print(f"шагов: {metrics.ticks} за {DURATION} с (ожидалось {int(DURATION * TICK_RATE)})")
+    print(f"отставаний: {metrics.overruns}")
+    print(f"длительность шага: последний {metrics.last_duration * 1e3:.2f} мс, "
+          f"максимальный {metrics.max_duration * 1e3:.2f} мс, период {1e3 / TICK_RATE:.2f} мс")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""
+Масштабирование разделённого флота: время шага при 1, 2, 4 и 8 исполнителях.
+Запуск из корня репозитория: python -m benchmarks.bench_sharded [число лодок]
+Ускорение ограничено числом ядер машины: на одном ядре исполнители только делят его между собой.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from ShardedFleet import ShardedFleet
+
+WORKERS = (1, 2, 4, 8)
+STEPS = 20
+SIDE = 10_000.0  # м
+
+
+def _fleet(size: int) -> BoatFleet:
+    rng = np.random.default_rng(0)
+    fleet = BoatFleet(size)
+    fleet.add(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0))
+    fleet._append(fleet._take(np.zeros(size - 1, dtype=np.intp)))
+    fleet.x[:] = rng.uniform(0, SIDE, size)
+    fleet.y[:] = rng.uniform(0, SIDE, size)
+    fleet.direction[:] = rng.uniform(0, 360, size)
+    fleet.set_controls(np.arange(size), rng.uniform(-1, 1, size), rng.uniform(-1, 1, size))
+    return fleet
+
+
+def main(size: int) -> None:
+    fleet = _fleet(size)
+    print(f"лодок: {size}, ядер: {os.cpu_count()}")
+    print(f"{'исполнителей':>12} {'шаг':>10} {'ускорение':>10}")
+    baseline = None
+    for workers in WORKERS:
+        with ShardedFleet(fleet, workers=workers) as sharded:
+            sharded.step(1.0)
+            start = time.perf_counter()
+            for _ in range(STEPS):
+                sharded.step(1.0)
+            elapsed = (time.perf_counter() - start) / STEPS
+            sizes = sharded.shard_sizes()
+        baseline = baseline or elapsed
+        print(f"{workers:>12} {elapsed * 1e3:8.2f}мс {baseline / elapsed:9.2f}x  полосы: {sizes}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400_000)
@@ -0,0 +1,48 @@
+"""
+Флот в общей памяти: цена шага с отметкой seqlock и цена снимка у читателя
+в сравнении с сериализацией состояния на каждом шаге.
+Запуск из корня репозитория: python -m benchmarks.bench_shared [число лодок]
+"""
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from BoatFleet import BoatFleet
+from RowingBoat import RowingBoat
+from SharedFleet import DEFAULT_SNAPSHOT_FIELDS, SharedFleet, SharedFleetReader
+
+REPEATS = 50
+
+
+def _fill(fleet: BoatFleet, size: int) -> None:
+    rng = np.random.default_rng(0)
+    fleet.add(RowingBoat(500, 300, 4, 2.0, 10.0, 90.0, 150.0))
+    fleet._append(fleet._take(np.zeros(size - 1, dtype=np.intp)))
+    fleet.set_controls(np.arange(size), rng.uniform(-1, 1, size), rng.uniform(-1, 1, size))
+
+
+def _measure(action) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        action()
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main(size: int) -> None:
+    fleet = BoatFleet(size)
+    _fill(fleet, size)
+    with SharedFleet(size) as shared, SharedFleetReader(shared.name) as reader:
+        _fill(shared, size)
+        print(f"лодок: {size}")
+        print(f"шаг BoatFleet:            {_measure(lambda: fleet.step(1.0)) * 1e3:8.2f} мс")
+        print(f"шаг SharedFleet:          {_measure(lambda: shared.step(1.0)) * 1e3:8.2f} мс")
+        print(f"снимок читателя:          {_measure(lambda: reader.snapshot()) * 1e3:8.2f} мс")
+        print(f"просмотр без копирования: {_measure(lambda: reader.view('x').sum()) * 1e3:8.2f} мс")
+        columns = {name: getattr(fleet, name) for name in DEFAULT_SNAPSHOT_FIELDS}
+        print(f"pickle тех же колонок:    {_measure(lambda: pickle.loads(pickle.dumps(columns))) * 1e3:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,64 @@
+"""
+Сравнение SpatialIndex с полным перебором на 1 000, 10 000 и 100 000 лодок.
+Запуск из корня репозитория: python -m benchmarks.bench_spatial
+"""
+import random
+import time
+
+from SpatialIndex import SpatialIndex
+
+SIZES = (1_000, 10_000, 100_000)
+DENSITY = 1e-3  # Лодок на квадратный метр
+RADIUS = 10.0
+QUERIES = 100
+MAX_BRUTE_FORCE_PAIRS = 10_000  # Перебор всех пар дальше этого размера занимает часы
+
+
+def _brute_force_query(points, center, radius):
+    x, y = center
+    return [item for item, (item_x, item_y) in points.items() if (item_x - x) ** 2 + (item_y - y) ** 2 <= radius ** 2]
+
+
+def _brute_force_pairs(points, radius):
+    items = list(points.items())
+    pairs = []
+    for index, (first, (x1, y1)) in enumerate(items):
+        for second, (x2, y2) in items[index + 1:]:
+            if (x1 - x2) ** 2 + (y1 - y2) ** 2 <= radius ** 2:
+                pairs.append((first, second))
+    return pairs
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'лодок':>8} {'построение':>11} {'радиус idx':>11} {'радиус bf':>11} "
+          f"{'k-ближ idx':>11} {'пары idx':>11} {'пары bf':>11}")
+    for size in SIZES:
+        side = (size / DENSITY) ** 0.5
+        points = {item: (rng.uniform(0, side), rng.uniform(0, side)) for item in range(size)}
+        centers = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(QUERIES)]
+
+        index = SpatialIndex(cell_size=RADIUS)
+        build, _ = _timed(lambda: [index.insert(item, position) for item, position in points.items()])
+        query, _ = _timed(lambda: [index.query_radius(center, RADIUS) for center in centers])
+        query_bf, _ = _timed(lambda: [_brute_force_query(points, center, RADIUS) for center in centers])
+        nearest, _ = _timed(lambda: [index.nearest(center, 5) for center in centers])
+        pairs, found = _timed(index.pairs_within, RADIUS)
+        if size <= MAX_BRUTE_FORCE_PAIRS:
+            pairs_bf, expected = _timed(_brute_force_pairs, points, RADIUS)
+            assert len(found) == len(expected)
+            pairs_bf_text = f"{pairs_bf:10.3f}с"
+        else:
+            pairs_bf_text = f"{'-':>11}"
+        print(f"{size:>8} {build:10.3f}с {query:10.3f}с {query_bf:10.3f}с "
+              f"{nearest:10.3f}с {pairs:10.3f}с {pairs_bf_text}")
+
+
+if __name__ == "__main__":
+    main()